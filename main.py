@@ -2,7 +2,6 @@ from manim import (
     BLUE,
     DL,
     DOWN,
-    DR,
     GREY,
     LEFT,
     ORANGE,
@@ -18,15 +17,13 @@ from manim import (
     Mobject,
     BulletedList,
     Circle,
-    Dot,
     FadeIn,
     FadeOut,
+    Group,
     LaggedStartMap,
-    Line,
     MarkupText,
     Arrow,
     MathTex,
-    MoveAlongPath,
     Polygon,
     RoundedRectangle,
     ReplacementTransform,
@@ -39,32 +36,97 @@ from manim import (
     Write,
     DoubleArrow,
     config,
-    linear,
+    DEFAULT_DOT_RADIUS,
 )
 from numpy.typing import NDArray
 import numpy as np
-from manim_slides import Slide  # type: ignore
 from mayutils.objects.datetime import DateTime
 
 from qlora_presentation.assets import ASSET_DIR
+from qlora_presentation.core.config import EXPERIMENT_STORE
+from qlora_presentation.models.memory import (
+    ARCHITECTURES,
+    FINE_TUNING_METHODS,
+    memory_footprint,
+)
+from qlora_presentation.models.quantisation import bfloat16, dequantise, quantise
+from qlora_presentation.models.training.experiments import (
+    ResultStore,
+    load_results,
+    quantisation_experiments,
+    rank_experiments,
+)
+from qlora_presentation.utilities.units import format_bytes
+from qlora_presentation.visualisation.deck import Deck, SlideSpec
+from qlora_presentation.visualisation.heatmap import Heatmap, HeatmapTransition
+from qlora_presentation.visualisation.memory import memory_boxes
+from qlora_presentation.visualisation.network import (
+    EdgeBatch,
+    NetworkDiagram,
+    vertical_positions,
+)
+from qlora_presentation.visualisation.particles import ParticleFlow
+from qlora_presentation.visualisation.slides import DeckSlide
 from qlora_presentation.visualisation.styles import FontSize, FontWeight, Style
+from qlora_presentation.visualisation.tables import quantisation_table, rank_table
+from qlora_presentation.visualisation.text import cached_text
 
 config.frame_width = 14.2
 config.frame_height = 8
-config.pixel_width = 2560
-config.pixel_height = 1440
-config.frame_rate = 120.0
 
 
 STYLE = Style()
 
 FONT = "Mona Sans"
 TITLE_WRITE_TIME = 1
+# Memory boxes narrower than this are widened so that they stay visible.
+MIN_BOX_WIDTH = 0.1
+# Rows and columns of the weight matrix drawn by the quantisation error slide.
+HEATMAP_SIZE = 512
+
+
+DECK = Deck(
+    slides=(
+        SlideSpec(section="title", build="title_page"),
+        SlideSpec(title="Overview", build="overview"),
+        SlideSpec(
+            section="naive_fine_tuning",
+            title="Naive Fine-Tuning",
+            build="naive_fine_tuning",
+            exit="fade_out",
+        ),
+        SlideSpec(section="lora", title="LoRA (Low-Rank Adaptation)", build="lora"),
+        SlideSpec(title="LoRA: Advantages & Disadvantages", build="lora_trade_offs"),
+        SlideSpec(
+            section="lora_performance",
+            title="LoRA: Performance",
+            build="lora_performance",
+        ),
+        SlideSpec(section="qlora", title="QLoRA (Quantised LoRA)", build="qlora"),
+        SlideSpec(title="QLoRA: Advantages & Disadvantages", build="qlora_trade_offs"),
+        SlideSpec(
+            title="QLoRA: Quantisation Error",
+            build="quantisation_error",
+            exit="fade_out",
+        ),
+        SlideSpec(
+            section="qlora_performance",
+            title="QLoRA: Performance",
+            build="qlora_performance",
+        ),
+        SlideSpec(section="discussion", title="Discussion Points", build="discussion"),
+        SlideSpec(title="Questions?", centred=True),
+    )
+)
 
-tex_template = TexTemplate(preamble=r"\usepackage{booktabs}")
 
+class Main(DeckSlide):
+    style = STYLE
+    deck = DECK
+    sections = DECK.sections
+    # The model whose memory footprint the QLoRA comparison is drawn for.
+    architecture = "7B"
 
-class Main(Slide):
     def __init__(
         self,
         *args,
@@ -136,31 +198,6 @@ class Main(Slide):
         )
         MathTex.set_default(color=WHITE)
 
-    def new_slide(
-        self,
-        **kwargs,
-    ) -> ReplacementTransform:
-        self.next_slide(**kwargs)
-        old_slide_number = self._slide_number
-        self.page += 1
-
-        new_slide_number = (
-            Text(
-                text=str(self.page),
-                font_size=FontSize.CONTENT,
-                weight=str(FontWeight.SEMIBOLD),
-                color=STYLE.foreground.secondary,
-            )
-            .scale(scale_factor=0.8)
-            .move_to(point_or_mobject=old_slide_number)
-        )
-
-        self._slide_number = new_slide_number
-
-        return ReplacementTransform(
-            mobject=old_slide_number, target_mobject=self._slide_number
-        )
-
     def get_equidist_xs(
         self,
         obj: Mobject,
@@ -208,195 +245,41 @@ class Main(Slide):
     def back_propagation(
         self,
     ) -> VGroup:
-        node_color = STYLE.foreground.primary
-        back_arrow_color = GREY
-
-        # --- Node counts ---
-        n_input = 3
-        n_hidden = 5
-        n_output = 3
-
-        # --- Vertical spacing calculation ---
-        def vertical_positions(n, height=2):
-            if n == 1:
-                return [0]
-            return [height / 2 - i * (height / (n - 1)) for i in range(n)]
-
-        # --- Nodes ---
-        input_nodes = VGroup(
-            *[
-                Circle(radius=0.3, color=node_color, fill_opacity=0.3).shift(
-                    LEFT * 3 + UP * y
-                )
-                for y in vertical_positions(n_input)
-            ]
-        )
-        hidden_nodes = VGroup(
-            *[
-                Circle(radius=0.3, color=node_color, fill_opacity=0.3).shift(
-                    RIGHT * 0 + UP * y
-                )
-                for y in vertical_positions(n_hidden, height=3)
-            ]
-        )
-        output_nodes = VGroup(
-            *[
-                Circle(radius=0.3, color=node_color, fill_opacity=0.3).shift(
-                    RIGHT * 3 + UP * y
-                )
-                for y in vertical_positions(n_output)
-            ]
-        )
-
-        # --- Connections ---
-        forward_arrows_1 = VGroup()
-        for i_node in input_nodes:
-            for h_node in hidden_nodes:
-                forward_arrows_1.add(
-                    Line(i_node.get_right(), h_node.get_left(), color=WHITE)
-                )
-        forward_arrows_2 = VGroup()
-        for h_node in hidden_nodes:
-            for o_node in output_nodes:
-                forward_arrows_2.add(
-                    Line(h_node.get_right(), o_node.get_left(), color=WHITE)
-                )
-
-        back_arrows_1 = VGroup()
-        for o_node in output_nodes:
-            for h_node in hidden_nodes:
-                back_arrows_1.add(
-                    Line(o_node.get_left(), h_node.get_right(), color=back_arrow_color)
-                )
-        back_arrows_2 = VGroup()
-        for h_node in hidden_nodes:
-            for i_node in input_nodes:
-                back_arrows_2.add(
-                    Line(h_node.get_left(), i_node.get_right(), color=back_arrow_color)
-                )
-
-        # --- Dots for animation ---
-        dots_forward_1 = VGroup(
-            *[
-                Dot(point=line.get_start(), color=WHITE).scale(0.5)
-                for line in forward_arrows_1
-            ]
-        )
-        dots_forward_2 = VGroup(
-            *[
-                Dot(point=line.get_start(), color=WHITE).scale(0.5)
-                for line in forward_arrows_2
-            ]
-        )
-        dots_backward_1 = VGroup(
-            *[
-                Dot(point=line.get_start(), color=STYLE.foreground.primary).scale(0.5)
-                for line in back_arrows_1
-            ]
-        )
-        dots_backward_2 = VGroup(
-            *[
-                Dot(point=line.get_start(), color=STYLE.foreground.primary).scale(0.5)
-                for line in back_arrows_2
-            ]
-        )
-
+        network = NetworkDiagram(
+            layer_sizes=(3, 5, 3),
+            layer_heights=(2, 3, 2),
+            node_color=STYLE.foreground.primary,
+            edge_color=WHITE,
+            backward_edge_color=GREY,
+        )
+        input_nodes, hidden_nodes, output_nodes = network.nodes
+        forward_edges_1, forward_edges_2 = network.forward_edges
+        backward_edges_1, backward_edges_2 = network.backward_edges[::-1]
+
+        extra_centres = LEFT * 6 + vertical_positions(n=2, height=1)[:, None] * UP
         extra_nodes = VGroup(
             *[
-                Circle(radius=0.3, color=RED, fill_opacity=0.3).shift(
-                    RIGHT * -6 + UP * y
+                Circle(radius=0.3, color=RED, fill_opacity=0.3).move_to(
+                    point_or_mobject=centre
                 )
-                for y in vertical_positions(n_output - 1, height=1)
-            ]
-        )
-
-        extra_arrows = VGroup()
-        for i_node in input_nodes:
-            for e_node in extra_nodes:
-                extra_arrows.add(
-                    Line(i_node.get_left(), e_node.get_right(), color=WHITE)
-                )
-
-        middle_hidden = hidden_nodes[n_hidden // 2]
-
-        middle_forward_arrows_1 = VGroup(
-            *[
-                line
-                for line in forward_arrows_1
-                if line.get_end()[1] == middle_hidden.get_y()
+                for centre in extra_centres
             ]
         )
-        middle_forward_arrows_2 = VGroup(
-            *[
-                line
-                for line in forward_arrows_2
-                if line.get_start()[1] == middle_hidden.get_y()
-            ]
-        )
-        middle_backward_arrows_1 = VGroup(
-            *[
-                line
-                for line in back_arrows_1
-                if line.get_end()[1] == middle_hidden.get_y()
-            ]
-        )
-        middle_backward_arrows_2 = VGroup(
-            *[
-                line
-                for line in back_arrows_2
-                if line.get_start()[1] == middle_hidden.get_y()
-            ]
-        )
-
-        highlight_color = YELLOW
-        # Dots along the middle node path (yellow for both directions)
-        middle_forward_dots_1 = VGroup(
-            *[
-                Dot(point=line.get_start(), color=highlight_color).scale(0.5)
-                for line in middle_forward_arrows_1
-            ]
-        )
-        middle_forward_dots_2 = VGroup(
-            *[
-                Dot(point=line.get_start(), color=highlight_color).scale(0.5)
-                for line in middle_forward_arrows_2
-            ]
-        )
-        middle_backward_dots_1 = VGroup(
-            *[
-                Dot(point=line.get_start(), color=highlight_color).scale(0.5)
-                for line in middle_backward_arrows_1
-            ]
-        )
-        middle_backward_dots_2 = VGroup(
-            *[
-                Dot(point=line.get_start(), color=highlight_color).scale(0.5)
-                for line in middle_backward_arrows_2
-            ]
+        extra_arrows = EdgeBatch.between(
+            sources=network.node_centres(layer=0) + network.node_radius * LEFT,
+            targets=extra_centres + 0.3 * RIGHT,
+            stroke_color=WHITE,
         )
 
         # --- Group everything ---
+        scale = 0.6
         network_group = VGroup(
-            input_nodes,
-            hidden_nodes,
-            output_nodes,
-            forward_arrows_1,
-            forward_arrows_2,
-            back_arrows_1,
-            back_arrows_2,
-            dots_forward_1,
-            dots_forward_2,
-            dots_backward_1,
-            dots_backward_2,
+            network,
             extra_nodes,
             extra_arrows,
-            middle_forward_dots_1,
-            middle_forward_dots_2,
-            middle_backward_dots_1,
-            middle_backward_dots_2,
         )
         network_group.scale(
-            scale_factor=0.6,
+            scale_factor=scale,
         ).move_to(
             point_or_mobject=ORIGIN,
         ).shift(
@@ -407,60 +290,63 @@ class Main(Slide):
             LaggedStartMap(FadeIn, input_nodes, lag_ratio=0.05),
             LaggedStartMap(FadeIn, hidden_nodes, lag_ratio=0.05),
             LaggedStartMap(FadeIn, output_nodes, lag_ratio=0.05),
-            LaggedStartMap(FadeIn, forward_arrows_1, lag_ratio=0.05),
-            LaggedStartMap(FadeIn, forward_arrows_2, lag_ratio=0.05),
-            LaggedStartMap(FadeIn, back_arrows_1, lag_ratio=0.05),
-            LaggedStartMap(FadeIn, back_arrows_2, lag_ratio=0.05),
+            FadeIn(forward_edges_1),
+            FadeIn(forward_edges_2),
+            FadeIn(backward_edges_1),
+            FadeIn(backward_edges_2),
         )
 
         self.next_slide(loop=True)
 
-        forward_animations_1 = [
-            MoveAlongPath(dot, line, rate_func=linear)
-            for dot, line in zip(dots_forward_1, forward_arrows_1)
-        ]
-        forward_animations_2 = [
-            MoveAlongPath(dot, line, rate_func=linear)
-            for dot, line in zip(dots_forward_2, forward_arrows_2)
-        ]
-        backward_animations_1 = [
-            MoveAlongPath(dot, line, rate_func=linear)
-            for dot, line in zip(dots_backward_1, back_arrows_1)
-        ]
-        backward_animations_2 = [
-            MoveAlongPath(dot, line, rate_func=linear)
-            for dot, line in zip(dots_backward_2, back_arrows_2)
+        # Signals stay where they arrive, so they join the group faded out later
+        signal_radius = 0.5 * scale * DEFAULT_DOT_RADIUS
+        passes = [
+            ParticleFlow.along(
+                edges=edges,
+                colors=color,
+                radius=signal_radius,
+                run_time=1,
+            )
+            for edges, color in (
+                (forward_edges_1, WHITE),
+                (forward_edges_2, WHITE),
+                (backward_edges_1, STYLE.foreground.primary),
+                (backward_edges_2, STYLE.foreground.primary),
+            )
         ]
-
-        self.play(*forward_animations_1, run_time=1)
-        self.play(*forward_animations_2, run_time=1)
-        self.play(*backward_animations_1, run_time=1)
-        self.play(*backward_animations_2, run_time=1)
+        for signal in passes:
+            self.play(signal)
+            network_group.add(signal.mobject)
 
         self.next_slide()
 
-        forward_animations_1 = [
-            MoveAlongPath(dot, line, rate_func=linear)
-            for dot, line in zip(middle_forward_dots_1, middle_forward_arrows_1)
-        ]
-        forward_animations_2 = [
-            MoveAlongPath(dot, line, rate_func=linear)
-            for dot, line in zip(middle_forward_dots_2, middle_forward_arrows_2)
-        ]
-        backward_animations_1 = [
-            MoveAlongPath(dot, line, rate_func=linear)
-            for dot, line in zip(middle_backward_dots_1, middle_backward_arrows_1)
-        ]
-        backward_animations_2 = [
-            MoveAlongPath(dot, line, rate_func=linear)
-            for dot, line in zip(middle_backward_dots_2, middle_backward_arrows_2)
-        ]
-
         # --- Play middle-node propagation ---
-        self.play(*forward_animations_1, run_time=1)
-        self.play(*forward_animations_2, run_time=1)
-        self.play(*backward_animations_1, run_time=1)
-        self.play(*backward_animations_2, run_time=1)
+        middle = network.layer_sizes[1] // 2
+        highlight_color = YELLOW
+        passes = [
+            ParticleFlow.along(
+                edges=edges,
+                indices=indices,
+                colors=highlight_color,
+                radius=signal_radius,
+                run_time=1,
+            )
+            for edges, indices in (
+                (forward_edges_1, network.incoming(layer=1, node=middle)),
+                (forward_edges_2, network.outgoing(layer=1, node=middle)),
+                (
+                    backward_edges_1,
+                    network.incoming(layer=1, node=middle, backward=True),
+                ),
+                (
+                    backward_edges_2,
+                    network.outgoing(layer=1, node=middle, backward=True),
+                ),
+            )
+        ]
+        for signal in passes:
+            self.play(signal)
+            network_group.add(signal.mobject)
 
         self.play(
             FadeIn(extra_nodes),
@@ -469,11 +355,9 @@ class Main(Slide):
 
         return network_group
 
-    def construct(
+    def title_page(
         self,
     ) -> None:
-        tex_template = TexTemplate()
-        tex_template.add_to_preamble(txt=r"\usepackage{booktabs}")
         background = Circle(
             color=STYLE.background.primary,
             radius=10,
@@ -489,7 +373,7 @@ class Main(Slide):
             .to_corner(corner=UL)
         )
         title = (
-            Text(
+            cached_text(
                 text="Fine-Tuning Large Language Models\nLoRA and QLoRA",
                 color=STYLE.foreground.primary,
                 font_size=FontSize.TITLE,
@@ -500,7 +384,7 @@ class Main(Slide):
         )
 
         subtitle = (
-            Text(
+            cached_text(
                 text="Lendable Journal Club",
                 color=STYLE.foreground.secondary,
                 font_size=FontSize.SUBTITLE,
@@ -511,7 +395,7 @@ class Main(Slide):
             .align_to(mobject_or_point=title, direction=LEFT)
         )
         date = (
-            Text(
+            cached_text(
                 text=DateTime.today().to_date_string(),
                 color=STYLE.foreground.secondary,
                 font_size=FontSize.SUBTITLE,
@@ -521,7 +405,7 @@ class Main(Slide):
             .to_corner(corner=DL)
         )
         author = (
-            Text(
+            cached_text(
                 text="Mayuran Visakan",
                 color=STYLE.foreground.primary,
                 font_size=FontSize.SUBTITLE,
@@ -531,27 +415,6 @@ class Main(Slide):
             .next_to(mobject_or_point=date, direction=UP)
             .align_to(mobject_or_point=date, direction=LEFT)
         )
-        self.page = 1
-        self._slide_number = (
-            Text(
-                text=str(self.page),
-                font_size=FontSize.CONTENT,
-                weight="SEMIBOLD",
-                color=STYLE.foreground.secondary,
-            )
-            .scale(scale_factor=0.8)
-            .to_corner(corner=DR)
-        )
-        slide_title = (
-            Text(
-                text="Overview",
-                color=STYLE.foreground.primary,
-                font_size=FontSize.SUBTITLE,
-                weight="SEMIBOLD",
-            )
-            .to_corner(corner=UL)
-            .set_stroke(color=STYLE.foreground.primary)
-        )
         self.play(
             Write(vmobject=title),
             FadeIn(logo_white),
@@ -567,6 +430,7 @@ class Main(Slide):
             FadeIn(author),
         )
         self.next_slide()
+
         self.play(
             FadeOut(title),
             FadeOut(subtitle),
@@ -579,7 +443,7 @@ class Main(Slide):
         )
 
         separator = (
-            Text(
+            cached_text(
                 text="|",
                 color=STYLE.foreground.secondary,
                 font_size=FontSize.CONTENT,
@@ -590,25 +454,24 @@ class Main(Slide):
             .shift(0.1 * LEFT)
         )
 
-        self.play(
-            FadeIn(separator),
-            FadeIn(slide_title),
-            FadeIn(self._slide_number),
-        )
+        self.play(FadeIn(separator))
 
+    def overview(
+        self,
+    ) -> VGroup:
         overview_scale = 1.0
         overview = VGroup(
-            Text(
+            cached_text(
                 text="- Fine-Tuning",
                 weight=str(FontWeight.SEMIBOLD),
                 font_size=FontSize.SUBTITLE,
             ).scale(scale_factor=overview_scale),
-            Text(
+            cached_text(
                 text="- LoRA (Low Rank Adaptation)",
                 weight=str(FontWeight.SEMIBOLD),
                 font_size=FontSize.SUBTITLE,
             ).scale(scale_factor=overview_scale),
-            Text(
+            cached_text(
                 text="- QLoRA (Quantised LoRA)",
                 weight=str(FontWeight.SEMIBOLD),
                 font_size=FontSize.SUBTITLE,
@@ -623,29 +486,17 @@ class Main(Slide):
             Write(vmobject=overview, run_time=1),
         )
 
-        slide_transform = self.new_slide()
-        old_slide_title = slide_title
-        slide_title = (
-            Text(
-                text="Naive Fine-Tuning",
-                color=STYLE.foreground.primary,
-                font_size=FontSize.SUBTITLE,
-                weight=str(FontWeight.SEMIBOLD),
-            )
-            .to_corner(corner=UL)
-            .set_stroke(color=STYLE.foreground.primary)
-        )
-        self.play(
-            Unwrite(overview, run_time=1),
-            ReplacementTransform(old_slide_title, slide_title),
-            slide_transform,
-        )
+        return overview
+
+    def naive_fine_tuning(
+        self,
+    ) -> VGroup:
         introduction = VGroup(
-            Text(
+            cached_text(
                 text="Fine-tuning an LLM is the process of adapting a pre-trained model\nto perform better at a specific task.",
                 weight=str(FontWeight.SEMIBOLD),
             ),
-            Text(
+            cached_text(
                 text="Naive fine-tuning involves taking a pre-trained model and continuing\nto train the model updating all of its weights.",
                 weight=str(FontWeight.SEMIBOLD),
             ),
@@ -659,30 +510,15 @@ class Main(Slide):
             Write(introduction, run_time=1.5),  # type: ignore
         )
 
-        total = self.back_propagation()
-
-        transform = self.new_slide()
+        network = self.back_propagation()
 
-        old_slide_title = slide_title
-        slide_title = (
-            Text(
-                text="LoRA (Low-Rank Adaptation)",
-                color=STYLE.foreground.primary,
-                font_size=FontSize.SUBTITLE,
-                weight=str(FontWeight.SEMIBOLD),
-            )
-            .to_corner(corner=UL)
-            .set_stroke(color=STYLE.foreground.primary)
-        )
+        return VGroup(introduction, network)
 
+    def lora(
+        self,
+    ) -> VGroup:
         equation = MathTex(r"\vec{h}=W\vec{x} + \vec{b}")
-        self.play(
-            FadeOut(total),
-            Unwrite(introduction, run_time=1.2),
-            transform,
-            ReplacementTransform(old_slide_title, slide_title),
-            Write(equation),
-        )
+        self.play(Write(equation))
         self.next_slide()
         old_equation = equation
         equation = MathTex(r"\vec{h}=(W_0 + \Delta W)\vec{x} + \vec{b}")
@@ -831,25 +667,12 @@ class Main(Slide):
         new_w = VGroup(new_w, tex_label_new_w)
         new_w.move_to(w)
         self.play(FadeOut(a), FadeOut(b), ReplacementTransform(w, new_w))
-        transform = self.new_slide()
-        self.play(
-            FadeOut(x),
-            FadeOut(new_w),
-            FadeOut(h),
-        )
 
-        old_slide_title = slide_title
-        slide_title = (
-            Text(
-                text="LoRA: Advantages & Disadvantages",
-                color=STYLE.foreground.primary,
-                font_size=FontSize.SUBTITLE,
-                weight=str(FontWeight.SEMIBOLD),
-            )
-            .to_corner(corner=UL)
-            .set_stroke(color=STYLE.foreground.primary)
-        )
+        return VGroup(x, new_w, h, equation)
 
+    def lora_trade_offs(
+        self,
+    ) -> VGroup:
         left_points = BulletedList(
             "True Generalisation of Fine-Tuning",
             "No inference latency",
@@ -865,12 +688,6 @@ class Main(Slide):
         columns = VGroup(left_points, right_points).arrange(RIGHT, buff=2)
         columns.move_to(ORIGIN)
 
-        self.play(
-            transform,
-            Unwrite(equation),
-            Unwrite(additional_equation_3),
-            ReplacementTransform(old_slide_title, slide_title),
-        )
         self.play(
             Write(left_points),
         )
@@ -879,50 +696,25 @@ class Main(Slide):
             Write(right_points),
         )
 
-        transform = self.new_slide()
+        return columns
 
-        old_slide_title = slide_title
-        slide_title = (
-            Text(
-                text="LoRA: Performance",
-                color=STYLE.foreground.primary,
-                font_size=FontSize.SUBTITLE,
-                weight=str(FontWeight.SEMIBOLD),
+    def lora_performance(
+        self,
+    ) -> VGroup:
+        table_tex = rank_table(
+            results=load_results(
+                configs=rank_experiments(),
+                store=ResultStore(path=EXPERIMENT_STORE),
             )
-            .to_corner(corner=UL)
-            .set_stroke(color=STYLE.foreground.primary)
         )
 
-        self.play(
-            transform,
-            ReplacementTransform(old_slide_title, slide_title),
-            Unwrite(columns),
-        )
-
-        table_tex = r"""
-        \begin{tabular}{l r ccc}
-        \toprule
-        \textbf{Model \& Method} & \# Trainable & WikiSQL & MNLI-m & SAMSum  \\
-        \midrule
-        GPT-3 (FT)                  & 175,255.8M & \textbf{73.8} & 89.5 & 52.0/28.0/44.5 \\
-        GPT-3 (BitFit)              & 14.2M      & 71.3 & 91.0 & 51.3/27.4/43.5 \\
-        GPT-3 (PreEmbed)            & 3.2M       & 63.1 & 88.6 & 48.3/24.2/40.5 \\
-        GPT-3 (PreLayer)            & 20.2M      & 70.1 & 89.5 & 50.8/27.3/43.5 \\
-        GPT-3 (Adapter\textsuperscript{H}) & 7.1M  & 71.9 & 89.8 & 53.0/28.9/44.8 \\
-        GPT-3 (Adapter\textsuperscript{H}) & 40.1M & 73.2 & \textbf{91.5} & 53.2/29.0/45.1 \\
-        GPT-3 (LoRA)                & 4.7M       & 73.4 & \textbf{91.7} & \textbf{53.8/29.8/45.9} \\
-        GPT-3 (LoRA)                & 37.7M      & \textbf{74.0} & \textbf{91.6} & 53.4/29.2/45.1 \\
-        \bottomrule
-        \end{tabular}
-        """
-
-        table = Tex(table_tex, tex_template=tex_template).scale(0.6)
+        table = Tex(table_tex, tex_template=self.tex_template).scale(0.6)
         table.move_to(UP * 0.5)  # shift up to leave space for caption
 
         caption_text = (
-            r"Performance of different adaptation methods on GPT-3 175B. "
-            r"Logical form validation accuracy on WikiSQL, validation accuracy on MultiNLI-matched, "
-            r"and Rouge-1/2/L on SAMSum. LoRA performs better than prior approaches, including full fine-tuning."
+            r"Full fine-tuning and LoRA of a pretrained $128\times128$ layer on CPU, "
+            r"held-out $R^2$ on a regression task and accuracy on an 8-class "
+            r"classification task, both a rank 4 change to the pretrained layer."
         )
         caption = (
             Tex(caption_text, font_size=24)
@@ -934,24 +726,26 @@ class Main(Slide):
         self.play(Write(table))
         self.play(Write(caption, shift=DOWN))
 
-        transform = self.new_slide()
+        return VGroup(table, caption)
 
-        old_slide_title = slide_title
-        slide_title = (
-            Text(
-                text="QLoRA (Quantised LoRA)",
-                color=STYLE.foreground.primary,
-                font_size=FontSize.SUBTITLE,
-                weight=str(FontWeight.SEMIBOLD),
-            )
-            .to_corner(corner=UL)
-            .set_stroke(color=STYLE.foreground.primary)
+    def qlora(
+        self,
+    ) -> VGroup:
+        architecture = ARCHITECTURES[self.architecture]
+        boxes = memory_boxes(architecture=architecture)
+        lora_footprint = memory_footprint(
+            architecture=architecture,
+            method=FINE_TUNING_METHODS["lora"],
+        )
+        qlora_footprint = memory_footprint(
+            architecture=architecture,
+            method=FINE_TUNING_METHODS["qlora"],
         )
 
         nft_base = (
             RoundedRectangle(
-                width=2.5,
-                height=0.5,
+                width=boxes["full"]["weights"].width,
+                height=boxes["full"]["weights"].height,
                 color=GREY,
                 fill_color=GREY,
                 fill_opacity=0.2,
@@ -960,20 +754,24 @@ class Main(Slide):
             .center()
             .shift(LEFT * 4 + DOWN * 2)
         )
-        nft_base_label = Text("Transformer (16 bit)", font_size=FontSize.INFO)
+        nft_base_label = cached_text(
+            boxes["full"]["weights"].label, font_size=FontSize.INFO
+        )
         nft_base_label.next_to(nft_base, DOWN, buff=0.2)
         arrows = self.add_up_arrows(nft_base, color=GREEN)
         nft_base = VGroup(nft_base, nft_base_label, arrows)
 
         nft_optimiser = RoundedRectangle(
-            width=2.5,
-            height=1,
+            width=boxes["full"]["optimiser"].width,
+            height=boxes["full"]["optimiser"].height,
             color=RED,
             fill_color=RED,
             fill_opacity=0.2,
             corner_radius=0.1,
         ).next_to(nft_base, UP, buff=2.5)
-        nft_optimiser_label = Text("Optimiser (32 bit)", font_size=FontSize.INFO)
+        nft_optimiser_label = cached_text(
+            boxes["full"]["optimiser"].label, font_size=FontSize.INFO
+        )
         nft_optimiser_label.next_to(nft_optimiser, UP, buff=0.2)
         xs = self.get_equidist_xs(nft_optimiser, n=3)
         arrows = VGroup(
@@ -1019,8 +817,8 @@ class Main(Slide):
 
         lora_base = (
             RoundedRectangle(
-                width=2.5,
-                height=0.5,
+                width=boxes["lora"]["weights"].width,
+                height=boxes["lora"]["weights"].height,
                 color=GREY,
                 fill_color=GREY,
                 fill_opacity=0.2,
@@ -1030,7 +828,9 @@ class Main(Slide):
             .shift(LEFT * 0 + DOWN * 2)
         )
         xs = self.get_equidist_xs(lora_base, n=3)
-        lora_base_label = Text("Transformer (16 bit)", font_size=FontSize.INFO)
+        lora_base_label = cached_text(
+            boxes["lora"]["weights"].label, font_size=FontSize.INFO
+        )
         lora_base_label.next_to(lora_base, DOWN, buff=0.2)
         arrows = self.add_up_arrows(lora_base, color=GREEN)
         arrows_2 = self.add_up_arrows(lora_base, color=GREEN).next_to(
@@ -1040,9 +840,10 @@ class Main(Slide):
         )
         lora_base = VGroup(lora_base, lora_base_label, arrows, arrows_2)
 
+        # The optimiser state is split between the three adapters drawn.
         lora_optimiser = RoundedRectangle(
-            width=0.5,
-            height=1,
+            width=max(boxes["lora"]["optimiser"].width / 3, MIN_BOX_WIDTH),
+            height=boxes["lora"]["optimiser"].height,
             color=RED,
             fill_color=RED,
             fill_opacity=0.2,
@@ -1054,7 +855,9 @@ class Main(Slide):
                 for x in xs
             ]
         ).move_to((lora_base.get_center()[0], nft_optimiser.get_center()[1], 0))
-        lora_optimiser_label = Text("Optimiser (32 bit)", font_size=FontSize.INFO)
+        lora_optimiser_label = cached_text(
+            boxes["lora"]["optimiser"].label, font_size=FontSize.INFO
+        )
         lora_optimiser_label.next_to(lora_optimisers, UP, buff=0.2)
 
         lora_adapters = VGroup(
@@ -1065,8 +868,10 @@ class Main(Slide):
         lora_adapters.scale(lora_optimisers.width / lora_adapters.width).next_to(
             arrows_2, UP, 0.1
         )
-        lora_adapters_label = Text(
-            "Adapters\n(16 bit)", font_size=FontSize.INFO
+        lora_adapters_label = cached_text(
+            f"Adapters\n({FINE_TUNING_METHODS['lora'].adapter_bits} bit)\n"
+            f"{format_bytes(size=lora_footprint.adapters)}",
+            font_size=FontSize.INFO,
         ).next_to(lora_adapters, RIGHT, buff=0.1)
         xs = self.get_equidist_xs(lora_base, n=3)
         arrows_3 = VGroup(
@@ -1093,8 +898,8 @@ class Main(Slide):
 
         qlora_base = (
             RoundedRectangle(
-                width=1,
-                height=0.5,
+                width=boxes["qlora"]["weights"].width,
+                height=boxes["qlora"]["weights"].height,
                 color=GREY,
                 fill_color=GREY,
                 fill_opacity=0.2,
@@ -1103,7 +908,9 @@ class Main(Slide):
             .center()
             .shift(RIGHT * 4 + DOWN * 2)
         )
-        qlora_base_label = Text("Transformer (4 bit)", font_size=FontSize.INFO)
+        qlora_base_label = cached_text(
+            boxes["qlora"]["weights"].label, font_size=FontSize.INFO
+        )
         qlora_base_label.next_to(qlora_base, DOWN, buff=0.2)
         arrows = self.add_up_arrows(qlora_base, n=1, color=GREEN)
         qlora_base = VGroup(qlora_base, qlora_base_label, arrows)
@@ -1111,7 +918,9 @@ class Main(Slide):
         qlora_optimisers = lora_optimisers.copy().move_to(
             (qlora_base.get_center()[0], nft_optimiser.get_center()[1], 0)
         )
-        qlora_optimiser_label = Text("Optimiser (32 bit)", font_size=FontSize.INFO)
+        qlora_optimiser_label = cached_text(
+            boxes["qlora"]["optimiser"].label, font_size=FontSize.INFO
+        )
         qlora_optimiser_label.next_to(qlora_optimisers, UP, buff=0.2)
         xs = self.get_equidist_xs(qlora_base, n=3)
         arrows_2 = VGroup(
@@ -1147,7 +956,10 @@ class Main(Slide):
             fill_opacity=0.2,
             corner_radius=0.1,
         ).next_to(qlora_optimisers, RIGHT, buff=1)
-        cpu_label = Text("CPU", font_size=FontSize.INFO)
+        cpu_label = cached_text(
+            f"CPU\n{format_bytes(size=qlora_footprint.paged)} paged",
+            font_size=FontSize.INFO,
+        )
         cpu_label.next_to(cpu, UP, buff=0.2)
         arrow = DoubleArrow(
             qlora_optimisers.get_right(), cpu.get_left(), buff=0.2, color=BLUE
@@ -1166,12 +978,6 @@ class Main(Slide):
         )
 
         self.play(
-            Unwrite(caption, run_time=0.5),
-        )
-        self.play(
-            Unwrite(table, run_time=1),
-            transform,
-            ReplacementTransform(old_slide_title, slide_title),
             LaggedStartMap(Write, nft_full, lag_ratio=0.05),
         )
         self.next_slide()
@@ -1185,28 +991,11 @@ class Main(Slide):
             LaggedStartMap(Write, qlora_full, lag_ratio=0.05),
         )
 
-        transform = self.new_slide()
-
-        old_slide_title = slide_title
-        slide_title = (
-            Text(
-                text="QLoRA: Advantages & Disadvantages",
-                color=STYLE.foreground.primary,
-                font_size=FontSize.SUBTITLE,
-                weight=str(FontWeight.SEMIBOLD),
-            )
-            .to_corner(corner=UL)
-            .set_stroke(color=STYLE.foreground.primary)
-        )
-
-        self.play(
-            transform,
-            ReplacementTransform(old_slide_title, slide_title),
-            Unwrite(nft_full),
-            Unwrite(lora_full),
-            Unwrite(qlora_full),
-        )
+        return VGroup(nft_full, lora_full, qlora_full)
 
+    def qlora_trade_offs(
+        self,
+    ) -> VGroup:
         left_points = BulletedList(
             "Same advantaages as LoRA",
             "Requires SIGNIFICANTLY less memory",
@@ -1230,52 +1019,92 @@ class Main(Slide):
             Write(right_points),
         )
 
-        transform = self.new_slide()
+        return columns
 
-        old_slide_title = slide_title
-        slide_title = (
-            Text(
-                text="QLoRA: Performance",
-                color=STYLE.foreground.primary,
-                font_size=FontSize.SUBTITLE,
+    def quantisation_error(
+        self,
+    ) -> Group:
+        rng = np.random.default_rng(seed=0)
+        weights = bfloat16(
+            weights=rng.standard_normal(
+                size=(HEATMAP_SIZE, HEATMAP_SIZE),
+                dtype=np.float32,
+            )
+            * 0.02
+        )
+        quantised = {
+            scheme: dequantise(tensor=quantise(weights=weights, scheme=scheme))
+            for scheme in ("nf4", "fp4", "int8")
+        }
+        errors = {
+            scheme: np.abs(values - weights) for scheme, values in quantised.items()
+        }
+        # Weights share a scale symmetric about zero, and errors share one so
+        # that the schemes can be compared by brightness alone.
+        limit = float(np.abs(weights).max())
+        error_limit = max(float(error.max()) for error in errors.values())
+
+        def label(
+            text: str,
+        ) -> Text:
+            return cached_text(
+                text=text,
+                color=STYLE.foreground.secondary,
                 weight=str(FontWeight.SEMIBOLD),
+            ).next_to(heatmap, DOWN, buff=0.3)
+
+        def error_text(
+            scheme: str,
+        ) -> str:
+            rmse = float(np.sqrt(np.mean(errors[scheme] ** 2)))
+            return f"{scheme.upper()} absolute error, RMSE {rmse:.1e}"
+
+        heatmap = Heatmap(
+            values=weights,
+            low=-limit,
+            high=limit,
+            style=STYLE,
+            height=5,
+        ).shift(UP * 0.3)
+        caption = label(text="BF16 weights")
+
+        self.play(FadeIn(heatmap), Write(caption))
+
+        steps = [
+            (quantised["nf4"], -limit, limit, "NF4 weights"),
+            (errors["nf4"], 0, error_limit, error_text(scheme="nf4")),
+            (errors["fp4"], 0, error_limit, error_text(scheme="fp4")),
+            (errors["int8"], 0, error_limit, error_text(scheme="int8")),
+        ]
+        for values, low, high, text in steps:
+            self.next_slide()
+            new_caption = label(text=text)
+            self.play(
+                HeatmapTransition(heatmap=heatmap, values=values, low=low, high=high),
+                ReplacementTransform(caption, new_caption),
+                run_time=1.5,
             )
-            .to_corner(corner=UL)
-            .set_stroke(color=STYLE.foreground.primary)
-        )
+            caption = new_caption
 
-        # TODO: Performance here
+        return Group(heatmap, caption)
 
-        self.play(
-            transform,
-            Unwrite(columns, run_time=1),
-            ReplacementTransform(old_slide_title, slide_title),
-        )
-
-        table_tex = r"""
-        \begin{tabular}{lrrrrrr}
-        \toprule
-        Dataset & \multicolumn{1}{c}{GLUE (Acc.)} & \multicolumn{5}{c}{Super-NaturalInstructions (RougeL)} \\
-        % \cmidrule{2-7}
-        Model  &  \multicolumn{1}{l}{RoBERTa-large} & \multicolumn{1}{l}{T5-80M} & \multicolumn{1}{l}{T5-250M} & \multicolumn{1}{l}{T5-780M} & \multicolumn{1}{l}{T5-3B} & \multicolumn{1}{l}{T5-11B} \\
-        \midrule
-        BF16 & 88.6 & 40.1                            & 42.1                            & 48.0                               & 54.3                        & 62.0                            \\
-        BF16 replication  & 88.6 & 40.0                              & 42.2                            & 47.3                             & 54.9                        &                     -        \\
-        \midrule
-        LoRA BF16  & 88.8   & 40.5                            & 42.6                            & 47.1                             & 55.4                        & 60.7                          \\
-        QLoRA Int8  & 88.8   & 40.4                            & 42.9                            & 45.4                             & 56.5                        & 60.7                          \\
-        QLoRA FP4  & 88.6  & 40.3                            & 42.4                            & 47.5                             & 55.6                        & 60.9                          \\
-        QLoRA NF4 + DQ & - & 40.4 &	42.7 &	47.7 &	55.3 &	60.9 \\
-        \bottomrule
-        \end{tabular}
-        """
-
-        table = Tex(table_tex, tex_template=tex_template).scale(0.6)
+    def qlora_performance(
+        self,
+    ) -> VGroup:
+        table_tex = quantisation_table(
+            results=load_results(
+                configs=quantisation_experiments(),
+                store=ResultStore(path=EXPERIMENT_STORE),
+            )
+        )
+
+        table = Tex(table_tex, tex_template=self.tex_template).scale(0.6)
         table.move_to(UP * 0.5)  # shift up to leave space for caption
 
         caption_text = (
-            r"Experiments comparing 16-bit BrainFloat (BF16), 8-bit Integer (Int8), 4-bit Float (FP4), and 4-bit NormalFloat (NF4)"
-            r"on GLUE and Super-NaturalInstructions. QLoRA replicates 16-bit LoRA and full-finetuning."
+            r"Full fine-tuning, LoRA and QLoRA with 8-bit Integer (Int8), 4-bit Float "
+            r"(FP4) and 4-bit NormalFloat with double quantisation (NF4 + DQ) "
+            r"pretrained layers of width $d$ on CPU, all adapters of rank 8."
         )
         caption = (
             Tex(caption_text, font_size=24)
@@ -1287,26 +1116,17 @@ class Main(Slide):
         self.play(Write(table))
         self.play(Write(caption, shift=DOWN))
 
-        transform = self.new_slide()
-
-        old_slide_title = slide_title
-        slide_title = (
-            Text(
-                text="Discussion Points",
-                color=STYLE.foreground.primary,
-                font_size=FontSize.SUBTITLE,
-                weight=str(FontWeight.SEMIBOLD),
-            )
-            .to_corner(corner=UL)
-            .set_stroke(color=STYLE.foreground.primary)
-        )
+        return VGroup(table, caption)
 
+    def discussion(
+        self,
+    ) -> VGroup:
         discussion = VGroup(
-            Text(
+            cached_text(
                 text="1. It's surprising that LoRA can perform well even at low ranks.\nIs there truly that low dimensionality needed for the task?\nAnd if so how can LoRA find it effectively amongst the heavily\noverparameterised model?",
                 weight=str(FontWeight.SEMIBOLD),
             ),
-            Text(
+            cached_text(
                 text="2. At what point does QLoRA's quantisation start to significantly\ndegrade performance? Are there certain tasks or datasets\nthat are more sensitive to this?",
                 weight=str(FontWeight.SEMIBOLD),
             ),
@@ -1316,32 +1136,14 @@ class Main(Slide):
             aligned_edge=LEFT,
         ).center().shift(0.5 * UP)
 
-        self.play(
-            Unwrite(caption, run_time=0.5),
-            Unwrite(table, run_time=1),
-            transform,
-            ReplacementTransform(old_slide_title, slide_title),
-        )
         self.play(Write(discussion, run_time=2))
 
-        transform = self.new_slide()
+        return discussion
 
-        old_slide_title = slide_title
-        slide_title = (
-            Text(
-                text="Questions?",
-                color=STYLE.foreground.primary,
-                font_size=FontSize.TITLE,
-                weight=str(FontWeight.SEMIBOLD),
-            )
-            .center()
-            .set_stroke(color=STYLE.foreground.primary)
-        )
+    def setup(
+        self,
+    ) -> None:
+        super().setup()
 
-        self.play(
-            Unwrite(discussion, run_time=1),
-        )
-        self.play(
-            transform,
-            ReplacementTransform(old_slide_title, slide_title),
-        )
+        self.tex_template = TexTemplate()
+        self.tex_template.add_to_preamble(txt=r"\usepackage{booktabs}")
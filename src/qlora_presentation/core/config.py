@@ -0,0 +1,185 @@
+import os
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from qlora_presentation.utilities.selection import SlideSelection
+
+CONSTANTS = tomllib.loads((Path(__file__).parent / "constants.toml").read_text())
+
+SLIDES_DIR = Path("slides")
+MEDIA_DIR = Path("media")
+LOG_DIR = Path("logs")
+BENCHMARK_DIR = Path("benchmarks")
+EXPERIMENT_STORE = Path("experiments") / "results.json"
+OUTPUT_DIR = Path("Outputs")
+SLIDES_OUTPUT_DIR = OUTPUT_DIR / "Slides"
+DOCUMENTS_OUTPUT_DIR = OUTPUT_DIR / "Documents"
+
+ENV_OUTPUT_DIR = "QLORA_OUTPUT_DIR"
+ENV_PLAN_FILE = "QLORA_PLAN_FILE"
+ENV_PRESENT_CACHE = "QLORA_PRESENT_CACHE_MB"
+ENV_PROFILE = "QLORA_PROFILE"
+ENV_REPORT_FILE = "QLORA_REPORT_FILE"
+ENV_SELECTION = "QLORA_SELECTION"
+ENV_TEX_CACHE = "QLORA_TEX_CACHE"
+ENV_TEX_MANIFEST = "QLORA_TEX_MANIFEST"
+ENV_WORKER = "QLORA_WORKER"
+
+EXPERIMENT_VERSION: int = CONSTANTS["experiments"]["version"]
+PRESENT_AHEAD: int = CONSTANTS["present"]["ahead"]
+PRESENT_BEHIND: int = CONSTANTS["present"]["behind"]
+PRESENT_CACHE_SIZE_MB: int = CONSTANTS["present"]["cache_size_mb"]
+QUANTISATION_BLOCK_SIZE: int = CONSTANTS["quantisation"]["block_size"]
+QUANTISATION_CONSTANT_BLOCK_SIZE: int = CONSTANTS["quantisation"]["constant_block_size"]
+QUANTISATION_MEMORY_BUDGET: int = (
+    CONSTANTS["quantisation"]["memory_budget_mb"] * 1024**2
+)
+TEX_CACHE_MAX_SIZE: int = CONSTANTS["tex_cache"]["max_size_mb"] * 1024**2
+TEXT_CACHE_SIZE: int = CONSTANTS["text_cache"]["max_entries"]
+
+
+@dataclass(frozen=True)
+class RenderProfile(object):
+    name: str
+    pixel_width: int
+    pixel_height: int
+    frame_rate: float
+    slides_dir: Path
+    preset: str
+    crf: int
+
+    def apply(
+        self,
+    ) -> None:
+        from manim import config
+
+        # The manim quality folder is derived from these, so partial movie
+        # files of different profiles never share a directory either.
+        config.pixel_width = self.pixel_width
+        config.pixel_height = self.pixel_height
+        config.frame_rate = self.frame_rate
+
+
+PROFILES = {
+    name: RenderProfile(
+        name=name,
+        pixel_width=profile["pixel_width"],
+        pixel_height=profile["pixel_height"],
+        frame_rate=float(profile["frame_rate"]),
+        slides_dir=Path(profile["slides_dir"]),
+        preset=profile["preset"],
+        crf=profile["crf"],
+    )
+    for name, profile in CONSTANTS["render"]["profiles"].items()
+}
+DEFAULT_PROFILE: str = CONSTANTS["render"]["profile"]
+
+
+@dataclass(frozen=True)
+class WebRendition(object):
+    name: str
+    pixel_height: int
+    frame_rate: int
+    crf: int
+
+
+WEB_RENDITIONS = tuple(
+    sorted(
+        (
+            WebRendition(
+                name=name,
+                pixel_height=rendition["pixel_height"],
+                frame_rate=rendition["frame_rate"],
+                crf=rendition["crf"],
+            )
+            for name, rendition in CONSTANTS["web"]["renditions"].items()
+        ),
+        key=lambda rendition: rendition.pixel_height,
+    )
+)
+WEB_PRESET: str = CONSTANTS["web"]["preset"]
+
+
+def get_profile(
+    name: str | None = None,
+) -> RenderProfile:
+    name = name or os.environ.get(ENV_PROFILE) or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown render profile '{name}', expected one of {list(PROFILES)}"
+        )
+
+    return PROFILES[name]
+
+
+def get_tex_cache_dir() -> Path:
+    tex_cache = os.environ.get(ENV_TEX_CACHE)
+    if tex_cache:
+        return Path(tex_cache)
+
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    return (
+        (Path(cache_home) if cache_home else Path.home() / ".cache")
+        / "qlora-presentation"
+        / "tex"
+    )
+
+
+@dataclass(frozen=True)
+class RenderSettings(object):
+    output_dir: Path = SLIDES_DIR
+    profile: RenderProfile = field(default_factory=get_profile)
+    selection: SlideSelection | None = None
+    worker: str | None = None
+    plan_file: Path | None = None
+    tex_manifest: Path | None = None
+    report_file: Path | None = None
+
+    @classmethod
+    def from_env(
+        cls,
+    ) -> "RenderSettings":
+        profile = get_profile()
+        selection = os.environ.get(ENV_SELECTION)
+        output_dir = os.environ.get(ENV_OUTPUT_DIR)
+        plan_file = os.environ.get(ENV_PLAN_FILE)
+        tex_manifest = os.environ.get(ENV_TEX_MANIFEST)
+        report_file = os.environ.get(ENV_REPORT_FILE)
+
+        return cls(
+            output_dir=Path(output_dir) if output_dir else profile.slides_dir,
+            profile=profile,
+            selection=SlideSelection.from_json(text=selection) if selection else None,
+            worker=os.environ.get(ENV_WORKER) or None,
+            plan_file=Path(plan_file) if plan_file else None,
+            tex_manifest=Path(tex_manifest) if tex_manifest else None,
+            report_file=Path(report_file) if report_file else None,
+        )
+
+    @property
+    def fast_forward(
+        self,
+    ) -> bool:
+        # Planning and TeX collection run the whole scene without output.
+        return self.plan_file is not None or self.tex_manifest is not None
+
+    def to_env(
+        self,
+    ) -> dict[str, str]:
+        env = {
+            ENV_OUTPUT_DIR: str(self.output_dir),
+            ENV_PROFILE: self.profile.name,
+        }
+        if self.selection is not None:
+            env[ENV_SELECTION] = self.selection.to_json()
+        if self.worker is not None:
+            env[ENV_WORKER] = self.worker
+        if self.plan_file is not None:
+            env[ENV_PLAN_FILE] = str(self.plan_file)
+        if self.tex_manifest is not None:
+            env[ENV_TEX_MANIFEST] = str(self.tex_manifest)
+        if self.report_file is not None:
+            env[ENV_REPORT_FILE] = str(self.report_file)
+
+        return env
@@ -0,0 +1,175 @@
+from dataclasses import dataclass
+
+from qlora_presentation.core.config import (
+    QUANTISATION_BLOCK_SIZE,
+    QUANTISATION_CONSTANT_BLOCK_SIZE,
+)
+
+
+@dataclass(frozen=True)
+class Architecture(object):
+    # A decoder-only transformer with gated feed-forward blocks, as in LLaMA.
+    name: str
+    layers: int
+    hidden: int
+    intermediate: int
+    heads: int
+    vocabulary: int = 32000
+    sequence_length: int = 512
+    batch_size: int = 1
+
+    @property
+    def linear_shapes(
+        self,
+    ) -> tuple[tuple[int, int], ...]:
+        # Query, key, value and output projections, then gate, up and down.
+        return (
+            *[(self.hidden, self.hidden)] * 4,
+            *[(self.hidden, self.intermediate)] * 3,
+        )
+
+    @property
+    def parameters(
+        self,
+    ) -> int:
+        linear = sum(rows * columns for rows, columns in self.linear_shapes)
+        norms = 2 * self.hidden
+        return (
+            self.layers * (linear + norms)
+            + 2 * self.vocabulary * self.hidden
+            + self.hidden
+        )
+
+    def adapter_parameters(
+        self,
+        rank: int,
+    ) -> int:
+        # Every linear layer gets `A` (d x r) and `B` (r x k).
+        return self.layers * sum(
+            rank * (rows + columns) for rows, columns in self.linear_shapes
+        )
+
+    def activation_bytes(
+        self,
+        checkpointing: bool = False,
+    ) -> int:
+        # 16 bit activations of one layer, following Korthikanti et al. (2022),
+        # "Reducing Activation Recomputation in Large Transformer Models".
+        tokens = self.sequence_length * self.batch_size
+        layer = tokens * self.hidden * 34 + 5 * self.heads * self.sequence_length * (
+            tokens
+        )
+        if not checkpointing:
+            return self.layers * layer
+
+        # Only layer inputs are kept, one layer is recomputed at a time.
+        return self.layers * 2 * tokens * self.hidden + layer
+
+
+ARCHITECTURES = {
+    "7B": Architecture(name="7B", layers=32, hidden=4096, intermediate=11008, heads=32),
+    "13B": Architecture(
+        name="13B", layers=40, hidden=5120, intermediate=13824, heads=40
+    ),
+    "33B": Architecture(
+        name="33B", layers=60, hidden=6656, intermediate=17920, heads=52
+    ),
+    "65B": Architecture(
+        name="65B", layers=80, hidden=8192, intermediate=22016, heads=64
+    ),
+}
+
+
+def constant_bits(
+    block_size: int = QUANTISATION_BLOCK_SIZE,
+    double_quantise: bool = False,
+) -> float:
+    # Bits per parameter spent on blockwise absmax constants, matching
+    # `QuantisedTensor.storage_bits` for large tensors.
+    if not double_quantise:
+        return 32 / block_size
+
+    return 8 / block_size + 32 / (block_size * QUANTISATION_CONSTANT_BLOCK_SIZE)
+
+
+@dataclass(frozen=True)
+class FineTuningMethod(object):
+    name: str
+    weight_bits: int = 16
+    # Without a rank every weight is trained, with one only adapters are.
+    rank: int | None = None
+    adapter_bits: int = 16
+    gradient_bits: int = 16
+    optimiser_bits: int = 32
+    optimiser_states: int = 2
+    double_quantise: bool = False
+    checkpointing: bool = True
+    paged: bool = False
+
+
+FINE_TUNING_METHODS = {
+    "full": FineTuningMethod(name="full"),
+    "lora": FineTuningMethod(name="lora", rank=64),
+    "qlora": FineTuningMethod(
+        name="qlora",
+        weight_bits=4,
+        rank=64,
+        double_quantise=True,
+        paged=True,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class MemoryFootprint(object):
+    weights: int
+    adapters: int
+    gradients: int
+    optimiser: int
+    activations: int
+    # Optimiser state in paged memory, which is evicted to the CPU under
+    # pressure instead of running the GPU out of memory.
+    paged: int
+
+    @property
+    def total(
+        self,
+    ) -> int:
+        return (
+            self.weights
+            + self.adapters
+            + self.gradients
+            + self.optimiser
+            + self.activations
+        )
+
+    @property
+    def device(
+        self,
+    ) -> int:
+        return self.total - self.paged
+
+
+def memory_footprint(
+    architecture: Architecture,
+    method: FineTuningMethod,
+) -> MemoryFootprint:
+    weight_bits = method.weight_bits
+    if weight_bits < 16:
+        weight_bits += constant_bits(double_quantise=method.double_quantise)
+    adapters = (
+        architecture.adapter_parameters(rank=method.rank)
+        if method.rank is not None
+        else 0
+    )
+    trainable = adapters if method.rank is not None else architecture.parameters
+    optimiser = trainable * method.optimiser_states * method.optimiser_bits // 8
+
+    return MemoryFootprint(
+        weights=round(architecture.parameters * weight_bits / 8),
+        adapters=adapters * method.adapter_bits // 8,
+        gradients=trainable * method.gradient_bits // 8,
+        optimiser=optimiser,
+        activations=architecture.activation_bytes(checkpointing=method.checkpointing),
+        paged=optimiser if method.paged else 0,
+    )
@@ -0,0 +1,342 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from statistics import NormalDist
+
+import numpy as np
+from numpy.typing import NDArray
+
+from qlora_presentation.core.config import (
+    QUANTISATION_BLOCK_SIZE,
+    QUANTISATION_CONSTANT_BLOCK_SIZE,
+    QUANTISATION_MEMORY_BUDGET,
+)
+
+# Offset of the outermost NF4 quantile, chosen in the QLoRA paper so that the
+# extreme codes are not pulled out to the infinite tails of the normal.
+NF4_OFFSET = 0.9677083
+# Working arrays per element while a chunk is quantised and measured: the
+# float32 input, normalised and dequantised values and error, and its codes.
+BYTES_PER_ELEMENT = 24
+
+
+def nf4_codebook() -> NDArray:
+    # Quantiles of N(0, 1) with eight positive and seven negative values and an
+    # exact zero, normalised to [-1, 1].
+    quantile = NormalDist().inv_cdf
+    positive = [quantile(p) for p in np.linspace(NF4_OFFSET, 0.5, num=9)[:-1]]
+    negative = [-quantile(p) for p in np.linspace(NF4_OFFSET, 0.5, num=8)[:-1]]
+    values = np.sort(np.array([*positive, 0.0, *negative]))
+
+    return (values / np.abs(values).max()).astype(np.float32)
+
+
+def fp4_codebook() -> NDArray:
+    # Every value of a sign, two exponent bit and one mantissa bit float.
+    magnitudes = np.array([0.0, 0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 6.0])
+    values = np.unique(np.concatenate([-magnitudes, magnitudes]))
+
+    return (values / magnitudes.max()).astype(np.float32)
+
+
+def int8_codebook() -> NDArray:
+    return (np.arange(-127, 128) / 127).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class Scheme(object):
+    name: str
+    bits: int
+    codebook: NDArray = field(repr=False)
+
+    def encode(
+        self,
+        values: NDArray,
+    ) -> NDArray:
+        # The codebook is sorted, so the nearest entry of every value is found
+        # by bisecting the midpoints between neighbouring entries.
+        midpoints = (self.codebook[1:] + self.codebook[:-1]) / 2
+        return np.searchsorted(midpoints, values).astype(np.uint8)
+
+    def decode(
+        self,
+        codes: NDArray,
+    ) -> NDArray:
+        return self.codebook[codes]
+
+
+SCHEMES = {
+    "nf4": Scheme(name="nf4", bits=4, codebook=nf4_codebook()),
+    "fp4": Scheme(name="fp4", bits=4, codebook=fp4_codebook()),
+    "int8": Scheme(name="int8", bits=8, codebook=int8_codebook()),
+}
+
+
+def pack_nibbles(
+    codes: NDArray,
+) -> NDArray:
+    if len(codes) % 2:
+        codes = np.append(codes, np.uint8(0))
+
+    return (codes[0::2] << 4) | codes[1::2]
+
+
+def unpack_nibbles(
+    packed: NDArray,
+    count: int,
+) -> NDArray:
+    codes = np.empty(shape=2 * len(packed), dtype=np.uint8)
+    codes[0::2] = packed >> 4
+    codes[1::2] = packed & 0x0F
+
+    return codes[:count]
+
+
+def blocks(
+    values: NDArray,
+    block_size: int,
+) -> NDArray:
+    values = np.ravel(values)
+    padding = -len(values) % block_size
+    if padding:
+        values = np.concatenate([values, np.zeros(shape=padding, dtype=values.dtype)])
+
+    return values.reshape(-1, block_size)
+
+
+def absmax(
+    rows: NDArray,
+) -> NDArray:
+    scale = np.abs(rows).max(axis=1)
+    # Blocks of zeros keep a unit scale, their codes decode to zero anyway.
+    return np.where(scale > 0, scale, 1).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class QuantisedConstants(object):
+    # Double quantisation: the per-block absmax constants are themselves
+    # quantised to Int8 in blocks after removing their mean, since they are all
+    # positive and would otherwise waste the sign.
+    codes: NDArray
+    absmax: NDArray
+    mean: float
+    count: int
+    block_size: int
+
+    @classmethod
+    def quantise(
+        cls,
+        constants: NDArray,
+        block_size: int = QUANTISATION_CONSTANT_BLOCK_SIZE,
+    ) -> "QuantisedConstants":
+        mean = float(constants.mean()) if len(constants) else 0.0
+        rows = blocks(values=constants - mean, block_size=block_size)
+        scale = absmax(rows=rows)
+
+        return cls(
+            codes=SCHEMES["int8"].encode(values=rows / scale[:, None]).ravel(),
+            absmax=scale,
+            mean=mean,
+            count=len(constants),
+            block_size=block_size,
+        )
+
+    def dequantise(
+        self,
+    ) -> NDArray:
+        rows = SCHEMES["int8"].decode(codes=self.codes).reshape(-1, self.block_size)
+        return (rows * self.absmax[:, None]).ravel()[: self.count] + self.mean
+
+    @property
+    def storage_bits(
+        self,
+    ) -> int:
+        return 8 * self.codes.size + 32 * (self.absmax.size + 1)
+
+
+@dataclass(frozen=True)
+class QuantisedTensor(object):
+    scheme: Scheme
+    codes: NDArray
+    constants: NDArray | QuantisedConstants
+    shape: tuple[int, ...]
+    block_size: int
+
+    @property
+    def size(
+        self,
+    ) -> int:
+        return int(np.prod(self.shape))
+
+    @property
+    def storage_bits(
+        self,
+    ) -> int:
+        constants = (
+            self.constants.storage_bits
+            if isinstance(self.constants, QuantisedConstants)
+            else 32 * self.constants.size
+        )
+        return 8 * self.codes.size + constants
+
+    @property
+    def bits_per_parameter(
+        self,
+    ) -> float:
+        return self.storage_bits / max(self.size, 1)
+
+
+def quantise(
+    weights: NDArray,
+    scheme: str = "nf4",
+    block_size: int = QUANTISATION_BLOCK_SIZE,
+    double_quantise: bool = True,
+) -> QuantisedTensor:
+    if scheme not in SCHEMES:
+        raise ValueError(
+            f"Unknown quantisation scheme '{scheme}', expected one of {list(SCHEMES)}"
+        )
+
+    rows = blocks(values=np.asarray(weights, dtype=np.float32), block_size=block_size)
+    scale = absmax(rows=rows)
+    codes = SCHEMES[scheme].encode(values=rows / scale[:, None]).ravel()
+
+    return QuantisedTensor(
+        scheme=SCHEMES[scheme],
+        codes=pack_nibbles(codes=codes) if SCHEMES[scheme].bits == 4 else codes,
+        constants=(
+            QuantisedConstants.quantise(constants=scale) if double_quantise else scale
+        ),
+        shape=np.shape(weights),
+        block_size=block_size,
+    )
+
+
+def dequantise(
+    tensor: QuantisedTensor,
+) -> NDArray:
+    count = len(tensor.codes) * 8 // tensor.scheme.bits
+    codes = (
+        unpack_nibbles(packed=tensor.codes, count=count)
+        if tensor.scheme.bits == 4
+        else tensor.codes
+    )
+    scale = (
+        tensor.constants.dequantise()
+        if isinstance(tensor.constants, QuantisedConstants)
+        else tensor.constants
+    )
+    rows = tensor.scheme.decode(codes=codes).reshape(-1, tensor.block_size)
+
+    return (
+        (rows * scale[: len(rows), None]).ravel()[: tensor.size].reshape(tensor.shape)
+    )
+
+
+def bfloat16(
+    weights: NDArray,
+) -> NDArray:
+    # Rounds float32 to the nearest bfloat16, ties to even, by dropping the low
+    # half of the bits. NumPy has no bfloat16, so the result stays float32.
+    bits = np.asarray(weights, dtype=np.float32).view(np.uint32)
+    bits = bits + np.uint32(0x7FFF) + ((bits >> 16) & np.uint32(1))
+
+    return (bits & np.uint32(0xFFFF0000)).view(np.float32)
+
+
+@dataclass
+class QuantisationStats(object):
+    parameters: int = 0
+    storage_bits: int = 0
+    squared_error: float = 0.0
+    squared_signal: float = 0.0
+    max_error: float = 0.0
+
+    def update(
+        self,
+        weights: NDArray,
+        tensor: QuantisedTensor,
+    ) -> None:
+        error = dequantise(tensor=tensor) - weights
+        self.parameters += tensor.size
+        self.storage_bits += tensor.storage_bits
+        self.squared_error += float(np.dot(error.ravel(), error.ravel()))
+        self.squared_signal += float(np.dot(weights.ravel(), weights.ravel()))
+        self.max_error = max(self.max_error, float(np.abs(error).max(initial=0)))
+
+    @property
+    def mean_squared_error(
+        self,
+    ) -> float:
+        return self.squared_error / max(self.parameters, 1)
+
+    @property
+    def sqnr(
+        self,
+    ) -> float:
+        # Signal to quantisation noise ratio in dB, unbounded with no noise.
+        if self.squared_error == 0:
+            return float("inf")
+
+        return 10 * np.log10(self.squared_signal / max(self.squared_error, 1e-30))
+
+    @property
+    def bits_per_parameter(
+        self,
+    ) -> float:
+        return self.storage_bits / max(self.parameters, 1)
+
+
+def chunk_size(
+    memory_budget: int = QUANTISATION_MEMORY_BUDGET,
+    block_size: int = QUANTISATION_BLOCK_SIZE,
+    double_quantise: bool = True,
+) -> int:
+    # Chunks hold whole blocks, and whole blocks of constants when those are
+    # quantised too, so chunked results match quantising the tensor at once.
+    multiple = block_size * (QUANTISATION_CONSTANT_BLOCK_SIZE if double_quantise else 1)
+    size = memory_budget // BYTES_PER_ELEMENT // multiple * multiple
+    if size == 0:
+        raise ValueError(
+            f"A memory budget of {memory_budget} bytes cannot hold a single chunk "
+            f"of {multiple} parameters"
+        )
+
+    return size
+
+
+def normal_weights(
+    parameters: int,
+    chunk: int,
+    std: float = 0.02,
+    seed: int = 0,
+) -> Iterator[NDArray]:
+    # Pretrained weights are close to zero-mean normal, which NF4 is built for.
+    rng = np.random.default_rng(seed=seed)
+    for start in range(0, parameters, chunk):
+        yield (
+            rng.standard_normal(size=min(chunk, parameters - start), dtype=np.float32)
+            * std
+        )
+
+
+def measure_quantisation(
+    chunks: Iterable[NDArray],
+    scheme: str = "nf4",
+    block_size: int = QUANTISATION_BLOCK_SIZE,
+    double_quantise: bool = True,
+) -> QuantisationStats:
+    # Chunks are quantised and measured one at a time, so a 7B parameter
+    # stream only ever holds one chunk's working set.
+    measured = QuantisationStats()
+    for weights in chunks:
+        measured.update(
+            weights=weights,
+            tensor=quantise(
+                weights=weights,
+                scheme=scheme,
+                block_size=block_size,
+                double_quantise=double_quantise,
+            ),
+        )
+
+    return measured
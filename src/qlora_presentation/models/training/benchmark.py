@@ -0,0 +1,129 @@
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from qlora_presentation.models.training.lora import (
+    Adam,
+    DenseLayer,
+    LoRALayer,
+    TrainingMemory,
+    train_step,
+)
+
+METHODS = ("full", "lora", "qlora")
+
+
+@dataclass(frozen=True)
+class LoRABenchmark(object):
+    method: str
+    dimension: int
+    rank: int | None
+    step_time: float
+    inference_time: float
+    adapter_time: float | None
+    memory: TrainingMemory
+    loss: float
+
+
+def best_time(
+    function: Callable[[], object],
+    rounds: int,
+) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def build_layer(
+    method: str,
+    weight: NDArray,
+    bias: NDArray,
+    rank: int,
+) -> DenseLayer | LoRALayer:
+    if method == "full":
+        return DenseLayer(weight=weight.copy(), bias=bias.copy())
+    if method == "lora":
+        return LoRALayer(weight=weight, bias=bias, rank=rank)
+    if method == "qlora":
+        return LoRALayer.quantised(weight=weight, bias=bias, rank=rank)
+
+    raise ValueError(f"Unknown method '{method}', expected one of {list(METHODS)}")
+
+
+def benchmark_method(
+    method: str,
+    weight: NDArray,
+    bias: NDArray,
+    x: NDArray,
+    y: NDArray,
+    rank: int,
+    rounds: int,
+) -> LoRABenchmark:
+    layer = build_layer(method=method, weight=weight, bias=bias, rank=rank)
+    optimiser = Adam(parameters=layer.parameters)
+    loss, memory = train_step(layer=layer, optimiser=optimiser, x=x, y=y)
+    step_time = best_time(
+        function=lambda: train_step(layer=layer, optimiser=optimiser, x=x, y=y),
+        rounds=rounds,
+    )
+
+    # Adapters are merged for inference, so LoRA is timed both ways.
+    merged = layer.merge() if isinstance(layer, LoRALayer) else layer
+    return LoRABenchmark(
+        method=method,
+        dimension=len(weight),
+        rank=rank if isinstance(layer, LoRALayer) else None,
+        step_time=step_time,
+        inference_time=best_time(function=lambda: merged.forward(x=x), rounds=rounds),
+        adapter_time=(
+            best_time(function=lambda: layer.forward(x=x), rounds=rounds)
+            if isinstance(layer, LoRALayer)
+            else None
+        ),
+        memory=memory,
+        loss=loss,
+    )
+
+
+def benchmark_lora(
+    dimensions: Sequence[int],
+    ranks: Sequence[int],
+    methods: Sequence[str] = METHODS,
+    batch_size: int = 32,
+    rounds: int = 5,
+    seed: int = 0,
+) -> list[LoRABenchmark]:
+    # Every method fine-tunes the same square pretrained layer towards the same
+    # targets, full fine-tuning once per dimension and the adapters per rank.
+    rng = np.random.default_rng(seed=seed)
+    results = []
+    for dimension in dimensions:
+        weight = (rng.standard_normal(size=(dimension, dimension)) * 0.02).astype(
+            np.float32
+        )
+        bias = np.zeros(shape=dimension, dtype=np.float32)
+        x = rng.standard_normal(size=(batch_size, dimension)).astype(np.float32)
+        y = rng.standard_normal(size=(batch_size, dimension)).astype(np.float32)
+
+        for method in methods:
+            for rank in ranks if method != "full" else ranks[:1]:
+                results.append(
+                    benchmark_method(
+                        method=method,
+                        weight=weight,
+                        bias=bias,
+                        x=x,
+                        y=y,
+                        rank=rank,
+                        rounds=rounds,
+                    )
+                )
+
+    return results
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from qlora_presentation.core.config import EXPERIMENT_VERSION
+from qlora_presentation.models.training.lora import (
+    Adam,
+    DenseLayer,
+    LoRALayer,
+    cross_entropy,
+    mean_squared_error,
+    train_step,
+)
+
+TASKS = ("regression", "classification")
+# Rank of the change that every task makes to the pretrained layer.
+TASK_RANK = 4
+CLASSES = 8
+
+
+@dataclass(frozen=True)
+class ExperimentConfig(object):
+    task: str
+    method: str
+    dimension: int = 128
+    rank: int = 8
+    scheme: str | None = None
+    double_quantise: bool = False
+    samples: int = 2048
+    steps: int = 300
+    learning_rate: float = 1e-2
+    seed: int = 0
+
+    def __post_init__(
+        self,
+    ) -> None:
+        if self.task not in TASKS:
+            raise ValueError(f"Unknown task '{self.task}', expected one of {TASKS}")
+        if self.method == "qlora" and self.scheme is None:
+            raise ValueError("QLoRA experiments need a quantisation scheme")
+
+    @property
+    def key(
+        self,
+    ) -> str:
+        # Salted with the experiment version, so results of older training code
+        # are never served for the same config.
+        return hashlib.sha256(
+            json.dumps(
+                obj={"version": EXPERIMENT_VERSION, "config": asdict(self)},
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class ExperimentResult(object):
+    config: ExperimentConfig
+    # R^2 for regression, accuracy for classification, both on held-out data.
+    score: float
+    trainable: int
+    seconds: float
+
+    def to_json(
+        self,
+    ) -> dict[str, Any]:
+        return {**asdict(self), "config": asdict(self.config)}
+
+    @classmethod
+    def from_json(
+        cls,
+        data: dict[str, Any],
+    ) -> "ExperimentResult":
+        return cls(**{**data, "config": ExperimentConfig(**data["config"])})
+
+
+def make_task(
+    config: ExperimentConfig,
+) -> tuple[NDArray, NDArray, NDArray, NDArray, NDArray]:
+    # The pretrained layer and the task depend on the seed and dimension only,
+    # so every method of a table is fine-tuned on exactly the same data.
+    rng = np.random.default_rng(seed=(config.seed, config.dimension))
+    d = config.dimension
+    weight = (rng.standard_normal(size=(d, d)) / np.sqrt(d)).astype(np.float32)
+    delta = rng.standard_normal(size=(d, TASK_RANK)) @ rng.standard_normal(
+        size=(TASK_RANK, d)
+    )
+    target = weight + (delta / np.sqrt(d * TASK_RANK) * 0.5).astype(np.float32)
+
+    x = rng.standard_normal(size=(2 * config.samples, d)).astype(np.float32)
+    y = x @ target.T
+    if config.task == "regression":
+        y = y + 0.1 * rng.standard_normal(size=y.shape).astype(np.float32)
+    else:
+        y = np.eye(CLASSES, dtype=np.float32)[y[:, :CLASSES].argmax(axis=1)]
+
+    train, test = slice(0, config.samples), slice(config.samples, None)
+    return weight, x[train], y[train], x[test], y[test]
+
+
+def score(
+    task: str,
+    h: NDArray,
+    y: NDArray,
+) -> float:
+    if task == "regression":
+        return float(1 - np.mean((h - y) ** 2) / np.var(y))
+
+    return float(np.mean(h[:, : y.shape[1]].argmax(axis=1) == y.argmax(axis=1)))
+
+
+def run_experiment(
+    config: ExperimentConfig,
+) -> ExperimentResult:
+    weight, x, y, x_test, y_test = make_task(config=config)
+    bias = np.zeros(shape=config.dimension, dtype=np.float32)
+    if config.method == "full":
+        layer: DenseLayer | LoRALayer = DenseLayer(weight=weight.copy(), bias=bias)
+    elif config.method == "lora":
+        layer = LoRALayer(weight=weight, bias=bias, rank=config.rank, seed=config.seed)
+    else:
+        layer = LoRALayer.quantised(
+            weight=weight,
+            bias=bias,
+            rank=config.rank,
+            scheme=config.scheme,
+            double_quantise=config.double_quantise,
+            seed=config.seed,
+        )
+
+    optimiser = Adam(parameters=layer.parameters, learning_rate=config.learning_rate)
+    loss_function = mean_squared_error if config.task == "regression" else cross_entropy
+    start = time.perf_counter()
+    for _ in range(config.steps):
+        train_step(
+            layer=layer,
+            optimiser=optimiser,
+            x=x,
+            y=y,
+            loss_function=loss_function,
+        )
+    seconds = time.perf_counter() - start
+
+    h, _ = layer.forward(x=x_test)
+    return ExperimentResult(
+        config=config,
+        score=score(task=config.task, h=h, y=y_test),
+        trainable=sum(value.size for value in layer.parameters.values()),
+        seconds=seconds,
+    )
+
+
+class ResultStore(object):
+    # Results on disk keyed by the hash of their config, so a config that has
+    # been run once is never run again.
+    def __init__(
+        self,
+        path: Path,
+    ) -> None:
+        self.path = path
+        self.results: dict[str, ExperimentResult] = (
+            {
+                key: ExperimentResult.from_json(data=data)
+                for key, data in json.loads(path.read_text()).items()
+            }
+            if path.exists()
+            else {}
+        )
+
+    def get(
+        self,
+        config: ExperimentConfig,
+    ) -> ExperimentResult | None:
+        return self.results.get(config.key)
+
+    def put(
+        self,
+        result: ExperimentResult,
+    ) -> None:
+        self.results[result.config.key] = result
+
+    def save(
+        self,
+    ) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Every writer gets its own temporary file and publishes it with an
+        # atomic rename, so concurrent saves never interleave.
+        descriptor, temporary = tempfile.mkstemp(
+            dir=self.path.parent,
+            prefix=f".{self.path.name}.",
+            suffix=".tmp",
+        )
+        with os.fdopen(descriptor, mode="w") as file:
+            json.dump(
+                obj={
+                    key: result.to_json()
+                    for key, result in sorted(self.results.items())
+                },
+                fp=file,
+                indent=2,
+            )
+            file.write("\n")
+        os.replace(src=temporary, dst=self.path)
+
+
+def run_experiments(
+    configs: Sequence[ExperimentConfig],
+    store: ResultStore,
+    processes: int | None = None,
+) -> list[ExperimentResult]:
+    missing = list(
+        {config.key: config for config in configs if store.get(config) is None}.values()
+    )
+    if missing:
+        # Results are stored as they finish, so an interrupted run resumes.
+        try:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                futures = [pool.submit(run_experiment, config) for config in missing]
+                for future in as_completed(futures):
+                    store.put(result=future.result())
+                    store.save()
+        finally:
+            store.save()
+
+    return [store.results[config.key] for config in configs]
+
+
+def load_results(
+    configs: Sequence[ExperimentConfig],
+    store: ResultStore,
+) -> list[ExperimentResult]:
+    # Scenes only read results: they render in many processes at once, which
+    # must not all start running the same experiments.
+    missing = [config for config in configs if store.get(config=config) is None]
+    if missing:
+        raise ValueError(
+            f"{len(missing)} experiment result(s) missing from '{store.path}', "
+            "run `make experiments` first"
+        )
+
+    return [store.results[config.key] for config in configs]
+
+
+def rank_experiments(
+    ranks: Sequence[int] = (1, 2, 4, 8, 16),
+    dimension: int = 128,
+) -> list[ExperimentConfig]:
+    return [
+        ExperimentConfig(task=task, method=method, dimension=dimension, rank=rank)
+        for task in TASKS
+        for method, rank in [("full", 0), *[("lora", rank) for rank in ranks]]
+    ]
+
+
+def quantisation_experiments(
+    dimensions: Sequence[int] = (64, 128, 256),
+    rank: int = 8,
+) -> list[ExperimentConfig]:
+    methods = [
+        ("full", None, False),
+        ("lora", None, False),
+        ("qlora", "int8", False),
+        ("qlora", "fp4", False),
+        ("qlora", "nf4", True),
+    ]
+    return [
+        ExperimentConfig(
+            task=task,
+            method=method,
+            dimension=dimension,
+            rank=rank if method != "full" else 0,
+            scheme=scheme,
+            double_quantise=double_quantise,
+        )
+        for method, scheme, double_quantise in methods
+        for task in TASKS
+        for dimension in dimensions
+    ]
+
+
+def all_experiments() -> list[ExperimentConfig]:
+    # Full fine-tuning appears in both tables, so it is only listed once.
+    return list(
+        {
+            config.key: config
+            for config in [*rank_experiments(), *quantisation_experiments()]
+        }.values()
+    )
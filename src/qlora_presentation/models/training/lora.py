@@ -0,0 +1,283 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from qlora_presentation.models.quantisation import (
+    QuantisedTensor,
+    dequantise,
+    quantise,
+)
+
+Parameters = dict[str, NDArray]
+Loss = Callable[[NDArray, NDArray], tuple[float, NDArray]]
+
+
+@dataclass(frozen=True)
+class TrainingMemory(object):
+    # Bytes held by one training step, measured from the arrays themselves.
+    frozen: int
+    trainable: int
+    gradients: int
+    optimiser: int
+    activations: int
+    # The full precision copy of a quantised weight alive during the step.
+    dequantised: int = 0
+
+    @property
+    def total(
+        self,
+    ) -> int:
+        return (
+            self.frozen
+            + self.dequantised
+            + self.trainable
+            + self.gradients
+            + self.optimiser
+            + self.activations
+        )
+
+
+def nbytes(
+    arrays: Parameters,
+) -> int:
+    return sum(array.nbytes for array in arrays.values())
+
+
+class Adam(object):
+    def __init__(
+        self,
+        parameters: Parameters,
+        learning_rate: float = 1e-3,
+        betas: tuple[float, float] = (0.9, 0.999),
+        eps: float = 1e-8,
+    ) -> None:
+        self.parameters = parameters
+        self.learning_rate = learning_rate
+        self.betas = betas
+        self.eps = eps
+        self.steps = 0
+        self.first = {name: np.zeros_like(value) for name, value in parameters.items()}
+        self.second = {name: np.zeros_like(value) for name, value in parameters.items()}
+
+    def step(
+        self,
+        gradients: Parameters,
+    ) -> None:
+        beta_1, beta_2 = self.betas
+        self.steps += 1
+        correction_1 = 1 - beta_1**self.steps
+        correction_2 = 1 - beta_2**self.steps
+
+        # Parameters and moments are updated in place, so the layer sees them.
+        for name, gradient in gradients.items():
+            first, second = self.first[name], self.second[name]
+            first *= beta_1
+            first += (1 - beta_1) * gradient
+            second *= beta_2
+            second += (1 - beta_2) * gradient**2
+            self.parameters[name] -= (
+                self.learning_rate
+                * (first / correction_1)
+                / (np.sqrt(second / correction_2) + self.eps)
+            )
+
+    @property
+    def nbytes(
+        self,
+    ) -> int:
+        return nbytes(arrays=self.first) + nbytes(arrays=self.second)
+
+
+class DenseLayer(object):
+    # `h = W x + b` with every weight trainable, i.e. full fine-tuning.
+    def __init__(
+        self,
+        weight: NDArray,
+        bias: NDArray,
+    ) -> None:
+        self.parameters: Parameters = {"weight": weight, "bias": bias}
+
+    @property
+    def frozen_bytes(
+        self,
+    ) -> int:
+        return 0
+
+    def forward(
+        self,
+        x: NDArray,
+    ) -> tuple[NDArray, Parameters]:
+        return x @ self.parameters["weight"].T + self.parameters["bias"], {"x": x}
+
+    def backward(
+        self,
+        grad: NDArray,
+        cache: Parameters,
+    ) -> tuple[Parameters, NDArray]:
+        return (
+            {"weight": grad.T @ cache["x"], "bias": grad.sum(axis=0)},
+            grad @ self.parameters["weight"],
+        )
+
+
+class LoRALayer(object):
+    # `h = W_0 x + A B x + b` with `W_0` and `b` frozen and only the rank `r`
+    # factors `A` (d x r) and `B` (r x k) trained. As on the slides, `A` starts
+    # Gaussian and `B` at zero, so the layer starts out as the pretrained one.
+    # With a quantised `W_0` this is QLoRA: the weight is stored in 4 bits and
+    # dequantised for each matmul.
+    def __init__(
+        self,
+        weight: NDArray | QuantisedTensor,
+        bias: NDArray,
+        rank: int,
+        alpha: float | None = None,
+        seed: int = 0,
+    ) -> None:
+        d, k = weight.shape
+        rng = np.random.default_rng(seed=seed)
+
+        self.weight = weight
+        self.bias = bias
+        self.scale = (alpha if alpha is not None else rank) / rank
+        self.parameters: Parameters = {
+            "a": (rng.standard_normal(size=(d, rank)) / np.sqrt(rank)).astype(
+                np.float32
+            ),
+            "b": np.zeros(shape=(rank, k), dtype=np.float32),
+        }
+
+    @classmethod
+    def quantised(
+        cls,
+        weight: NDArray,
+        bias: NDArray,
+        rank: int,
+        scheme: str = "nf4",
+        double_quantise: bool = True,
+        **kwargs,
+    ) -> "LoRALayer":
+        return cls(
+            weight=quantise(
+                weights=weight,
+                scheme=scheme,
+                double_quantise=double_quantise,
+            ),
+            bias=bias,
+            rank=rank,
+            **kwargs,
+        )
+
+    @property
+    def base_weight(
+        self,
+    ) -> NDArray:
+        if isinstance(self.weight, QuantisedTensor):
+            return dequantise(tensor=self.weight)
+
+        return self.weight
+
+    @property
+    def frozen_bytes(
+        self,
+    ) -> int:
+        weight = (
+            self.weight.storage_bits // 8
+            if isinstance(self.weight, QuantisedTensor)
+            else self.weight.nbytes
+        )
+        return weight + self.bias.nbytes
+
+    def forward(
+        self,
+        x: NDArray,
+    ) -> tuple[NDArray, Parameters]:
+        # `A B` is never formed: the input goes through `B` to rank `r` first,
+        # which costs `n r (d + k)` rather than `d r k` per step.
+        weight = self.base_weight
+        z = x @ self.parameters["b"].T
+        h = x @ weight.T + self.scale * (z @ self.parameters["a"].T)
+
+        cache = {"x": x, "z": z}
+        if weight is not self.weight:
+            # A quantised weight is dequantised once per step, for backward too.
+            cache["dequantised"] = weight
+
+        return h + self.bias, cache
+
+    def backward(
+        self,
+        grad: NDArray,
+        cache: Parameters,
+    ) -> tuple[Parameters, NDArray]:
+        grad_z = self.scale * (grad @ self.parameters["a"])
+        gradients = {
+            "a": self.scale * (grad.T @ cache["z"]),
+            "b": grad_z.T @ cache["x"],
+        }
+
+        weight = cache.get("dequantised", self.weight)
+
+        return gradients, grad @ weight + grad_z @ self.parameters["b"]
+
+    def merge(
+        self,
+    ) -> DenseLayer:
+        # `W* = W_0 + A B` is a single dense layer again, so inference costs
+        # exactly what the pretrained layer did.
+        return DenseLayer(
+            weight=self.base_weight
+            + self.scale * (self.parameters["a"] @ self.parameters["b"]),
+            bias=self.bias.copy(),
+        )
+
+
+def mean_squared_error(
+    h: NDArray,
+    y: NDArray,
+) -> tuple[float, NDArray]:
+    residual = h - y
+    return float(np.mean(residual**2)), 2 * residual / residual.size
+
+
+def cross_entropy(
+    h: NDArray,
+    y: NDArray,
+) -> tuple[float, NDArray]:
+    # `y` is one-hot, and the layer's first outputs are the logits of its
+    # classes while any further outputs are ignored.
+    logits = h[:, : y.shape[1]]
+    logits = logits - logits.max(axis=1, keepdims=True)
+    probabilities = np.exp(logits)
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    loss = float(-(y * np.log(probabilities + 1e-12)).sum(axis=1).mean())
+
+    grad = np.zeros_like(h)
+    grad[:, : y.shape[1]] = (probabilities - y) / len(y)
+
+    return loss, grad
+
+
+def train_step(
+    layer: DenseLayer | LoRALayer,
+    optimiser: Adam,
+    x: NDArray,
+    y: NDArray,
+    loss_function: Loss = mean_squared_error,
+) -> tuple[float, TrainingMemory]:
+    h, cache = layer.forward(x=x)
+    loss, grad = loss_function(h, y)
+    gradients, _ = layer.backward(grad=grad, cache=cache)
+    optimiser.step(gradients=gradients)
+    dequantised = cache.pop("dequantised", None)
+
+    return loss, TrainingMemory(
+        frozen=layer.frozen_bytes,
+        trainable=nbytes(arrays=layer.parameters),
+        gradients=nbytes(arrays=gradients),
+        optimiser=optimiser.nbytes,
+        activations=h.nbytes + nbytes(arrays=cache),
+        dequantised=dequantised.nbytes if dequantised is not None else 0,
+    )
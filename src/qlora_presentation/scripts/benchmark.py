@@ -0,0 +1,137 @@
+import os
+from pathlib import Path
+from typing import Annotated
+
+import click
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from qlora_presentation.core.config import (
+    BENCHMARK_DIR,
+    CONSTANTS,
+    EXPERIMENT_STORE,
+    PROFILES,
+)
+from qlora_presentation.models.training.experiments import (
+    ResultStore,
+    all_experiments,
+    run_experiments,
+)
+from qlora_presentation.utilities.benchmark import (
+    BENCHMARK_SLICES,
+    benchmark_slice,
+    compare_results,
+    read_baseline,
+    write_baseline,
+)
+from qlora_presentation.utilities.render import precompile_tex
+
+app = typer.Typer()
+
+
+@app.command()
+def benchmark_slides(
+    file: Annotated[Path, typer.Argument()] = Path("main.py"),
+    scene: Annotated[str, typer.Argument()] = "Main",
+    slices: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--slice",
+            "-s",
+            click_type=click.Choice(choices=list(BENCHMARK_SLICES)),
+            help="Only run these slices.",
+        ),
+    ] = None,
+    profile: Annotated[
+        str,
+        typer.Option(
+            "--profile",
+            "-p",
+            click_type=click.Choice(choices=list(PROFILES)),
+        ),
+    ] = CONSTANTS["benchmark"]["profile"],
+    rounds: Annotated[int, typer.Option()] = CONSTANTS["benchmark"]["rounds"],
+    threshold: Annotated[
+        float,
+        typer.Option(help="Allowed slowdown against the baseline, e.g. 0.25."),
+    ] = CONSTANTS["benchmark"]["threshold"],
+    baseline: Annotated[Path | None, typer.Option()] = None,
+    save_baseline: Annotated[
+        bool,
+        typer.Option(help="Record these timings as the new baseline."),
+    ] = False,
+) -> None:
+    # Rendering is headless, but manim-slides may still pull in Qt on import.
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    render_profile = PROFILES[profile]
+    baseline_path = baseline or BENCHMARK_DIR / f"baseline-{profile}.json"
+    output_dir = render_profile.slides_dir
+
+    # Experiments and TeX are done once up front so that the timed rounds
+    # measure rendering.
+    run_experiments(
+        configs=all_experiments(),
+        store=ResultStore(path=EXPERIMENT_STORE),
+    )
+    precompile_tex(
+        file=file,
+        scene=scene,
+        output_dir=output_dir,
+        profile=render_profile,
+    )
+
+    results = [
+        benchmark_slice(
+            file=file,
+            scene=scene,
+            name=name,
+            sections=BENCHMARK_SLICES[name],
+            profile=render_profile,
+            output_dir=output_dir,
+            rounds=rounds,
+        )
+        for name in slices or BENCHMARK_SLICES
+    ]
+    comparisons = compare_results(
+        results=results,
+        baseline=read_baseline(path=baseline_path),
+        threshold=threshold,
+    )
+
+    table = Table(title=f"{scene} benchmark ({profile}, best of {rounds})")
+    table.add_column(header="Slice")
+    for column in ("Best (s)", "Median (s)", "Baseline (s)", "Change"):
+        table.add_column(header=column, justify="right")
+    table.add_column(header="Status")
+    for comparison in comparisons:
+        table.add_row(
+            comparison.result.name,
+            f"{comparison.result.best:.2f}",
+            f"{comparison.result.median:.2f}",
+            f"{comparison.baseline:.2f}" if comparison.baseline is not None else "-",
+            f"{comparison.change:+.1%}" if comparison.change is not None else "-",
+            "[red]regressed" if comparison.regressed else "[green]ok",
+        )
+    Console().print(table)
+
+    if save_baseline:
+        write_baseline(path=baseline_path, results=results)
+        typer.echo(f"Baseline written to '{baseline_path}'")
+        return
+
+    regressions = [
+        comparison.result.name for comparison in comparisons if comparison.regressed
+    ]
+    if regressions:
+        typer.echo(
+            f"Slower than the baseline by more than {threshold:.0%}: "
+            + ", ".join(regressions),
+            err=True,
+        )
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
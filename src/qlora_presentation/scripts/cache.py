@@ -0,0 +1,80 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from qlora_presentation.core.config import MEDIA_DIR, PROFILES
+from qlora_presentation.utilities.cache import (
+    CacheReport,
+    find_partial_orphans,
+    find_slide_orphans,
+    referenced_partial_files,
+    remove_orphans,
+)
+from qlora_presentation.utilities.units import format_bytes
+
+app = typer.Typer()
+
+
+@app.command()
+def clear_cache(
+    dry_run: Annotated[
+        bool,
+        typer.Option("--dry-run", "-n", help="Report orphans without touching them."),
+    ] = False,
+    archive: Annotated[
+        Path | None,
+        typer.Option(help="Move orphans under this directory instead of deleting."),
+    ] = None,
+    media_dir: Annotated[Path, typer.Option()] = MEDIA_DIR,
+) -> None:
+    slides_dirs = [
+        profile.slides_dir
+        for profile in PROFILES.values()
+        if profile.slides_dir.exists()
+    ]
+    reports: list[CacheReport] = [
+        find_slide_orphans(slides_dir=slides_dir) for slides_dir in slides_dirs
+    ]
+    reports.extend(find_partial_orphans(media_dir=media_dir, slides_dirs=slides_dirs))
+    if referenced_partial_files(slides_dirs=slides_dirs) is None:
+        typer.echo("Some slides do not list their partials, so every partial is kept")
+
+    width = max((len(str(report.root)) for report in reports), default=0)
+    for report in reports:
+        typer.echo(
+            f"{str(report.root):<{width}}  "
+            f"kept {len(report.kept):>4} ({format_bytes(size=report.kept_size):>9})  "
+            f"orphaned {len(report.orphaned):>4} "
+            f"({format_bytes(size=report.orphaned_size):>9})"
+        )
+
+    orphaned = sum(len(report.orphaned) for report in reports)
+    reclaimable = sum(report.orphaned_size for report in reports)
+    if dry_run:
+        typer.echo(
+            f"Would reclaim {format_bytes(size=reclaimable)} from {orphaned} file(s)"
+        )
+        return
+
+    archive_dir = (
+        archive / datetime.now().strftime("%Y%m%d-%H%M%S")
+        if archive is not None
+        else None
+    )
+    remove_orphans(reports=reports, archive_dir=archive_dir)
+
+    if archive_dir is not None:
+        typer.echo(
+            f"Archived {orphaned} file(s), {format_bytes(size=reclaimable)}, "
+            f"to '{archive_dir}'"
+        )
+    else:
+        typer.echo(
+            f"Reclaimed {format_bytes(size=reclaimable)} from {orphaned} file(s)"
+        )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,73 @@
+from typing import Annotated
+
+import click
+import typer
+
+from qlora_presentation.core.config import (
+    DEFAULT_PROFILE,
+    DOCUMENTS_OUTPUT_DIR,
+    ENV_PROFILE,
+    OUTPUT_DIR,
+    PROFILES,
+    SLIDES_OUTPUT_DIR,
+)
+from qlora_presentation.utilities.convert import CONVERTERS, convert_presentation
+from qlora_presentation.utilities.presentation import read_presentation
+
+app = typer.Typer()
+
+
+@app.command()
+def convert_slides(
+    scene: Annotated[str, typer.Argument()] = "Main",
+    to: Annotated[
+        list[str] | None,
+        typer.Option(
+            click_type=click.Choice(choices=list(CONVERTERS)),
+            help="Only write these formats.",
+        ),
+    ] = None,
+    profile: Annotated[
+        str,
+        typer.Option(
+            "--profile",
+            "-p",
+            envvar=ENV_PROFILE,
+            click_type=click.Choice(choices=list(PROFILES)),
+        ),
+    ] = DEFAULT_PROFILE,
+    processes: Annotated[
+        int | None,
+        typer.Option("--processes", "-j", help="Concurrent writers."),
+    ] = None,
+    force: Annotated[
+        bool,
+        typer.Option(help="Convert even if the slides have not changed."),
+    ] = False,
+) -> None:
+    outputs = {
+        "bundle": SLIDES_OUTPUT_DIR / f"{scene}.qlsb",
+        "html": SLIDES_OUTPUT_DIR / f"{scene}.html",
+        "pdf": DOCUMENTS_OUTPUT_DIR / f"{scene}.pdf",
+        "pptx": DOCUMENTS_OUTPUT_DIR / f"{scene}.pptx",
+        "web": SLIDES_OUTPUT_DIR / scene / "index.html",
+    }
+    converted = convert_presentation(
+        presentation=read_presentation(
+            path=PROFILES[profile].slides_dir / f"{scene}.json"
+        ),
+        outputs={
+            name: path for name, path in outputs.items() if name in (to or outputs)
+        },
+        cache_file=OUTPUT_DIR / ".convert" / f"{scene}-{profile}.json",
+        processes=processes,
+        force=force,
+    )
+
+    for name in to or outputs:
+        status = "written to" if name in converted else "unchanged at"
+        typer.echo(f"{name.upper()} {status} '{outputs[name]}'")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,35 @@
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from qlora_presentation.core.config import EXPERIMENT_STORE
+from qlora_presentation.models.training.experiments import (
+    ResultStore,
+    all_experiments,
+    run_experiments,
+)
+
+app = typer.Typer()
+
+
+@app.command()
+def run_all_experiments(
+    processes: Annotated[
+        int | None,
+        typer.Option("--processes", "-j", help="Concurrent experiments."),
+    ] = None,
+    store: Annotated[Path, typer.Option()] = EXPERIMENT_STORE,
+) -> None:
+    results = ResultStore(path=store)
+    configs = all_experiments()
+    cached = sum(results.get(config=config) is not None for config in configs)
+
+    run_experiments(configs=configs, store=results, processes=processes)
+    typer.echo(
+        f"Ran {len(configs) - cached} experiment(s), {cached} already in '{store}'"
+    )
+
+
+if __name__ == "__main__":
+    app()
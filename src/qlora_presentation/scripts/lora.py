@@ -0,0 +1,82 @@
+from typing import Annotated
+
+import click
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from qlora_presentation.core.config import CONSTANTS
+from qlora_presentation.models.training.benchmark import METHODS, benchmark_lora
+from qlora_presentation.utilities.units import format_bytes
+
+app = typer.Typer()
+
+
+@app.command()
+def benchmark_adapters(
+    dimensions: Annotated[
+        list[int] | None,
+        typer.Option("--dimension", "-d", help="Layer widths to sweep."),
+    ] = None,
+    ranks: Annotated[
+        list[int] | None,
+        typer.Option("--rank", "-r", help="Adapter ranks to sweep."),
+    ] = None,
+    methods: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--method",
+            "-m",
+            click_type=click.Choice(choices=list(METHODS)),
+        ),
+    ] = None,
+    batch_size: Annotated[int, typer.Option()] = CONSTANTS["lora_benchmark"][
+        "batch_size"
+    ],
+    rounds: Annotated[int, typer.Option()] = CONSTANTS["lora_benchmark"]["rounds"],
+) -> None:
+    results = benchmark_lora(
+        dimensions=dimensions or CONSTANTS["lora_benchmark"]["dimensions"],
+        ranks=ranks or CONSTANTS["lora_benchmark"]["ranks"],
+        methods=methods or METHODS,
+        batch_size=batch_size,
+        rounds=rounds,
+    )
+
+    table = Table(title=f"Fine-tuning one layer (batch {batch_size}, best of {rounds})")
+    for column in ("Method", "d", "r"):
+        table.add_column(header=column)
+    for column in (
+        "Step (ms)",
+        "Inference (ms)",
+        "Unmerged (ms)",
+        "Frozen (MB)",
+        "Dequantised (MB)",
+        "Trainable (MB)",
+        "Gradients (MB)",
+        "Adam (MB)",
+        "Total (MB)",
+    ):
+        table.add_column(header=column, justify="right")
+    for result in results:
+        table.add_row(
+            result.method,
+            str(result.dimension),
+            str(result.rank) if result.rank is not None else "-",
+            f"{result.step_time * 1e3:.2f}",
+            f"{result.inference_time * 1e3:.2f}",
+            f"{result.adapter_time * 1e3:.2f}"
+            if result.adapter_time is not None
+            else "-",
+            format_bytes(size=result.memory.frozen, unit="MB", suffix=False),
+            format_bytes(size=result.memory.dequantised, unit="MB", suffix=False),
+            format_bytes(size=result.memory.trainable, unit="MB", suffix=False),
+            format_bytes(size=result.memory.gradients, unit="MB", suffix=False),
+            format_bytes(size=result.memory.optimiser, unit="MB", suffix=False),
+            format_bytes(size=result.memory.total, unit="MB", suffix=False),
+        )
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    app()
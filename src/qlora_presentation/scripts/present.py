@@ -0,0 +1,94 @@
+import signal
+import sys
+from pathlib import Path
+from typing import Annotated
+
+import click
+import typer
+
+from qlora_presentation.core.config import (
+    DEFAULT_PROFILE,
+    ENV_PRESENT_CACHE,
+    ENV_PROFILE,
+    PRESENT_AHEAD,
+    PRESENT_BEHIND,
+    PRESENT_CACHE_SIZE_MB,
+    PROFILES,
+)
+
+app = typer.Typer()
+
+
+@app.command()
+def present_slides(
+    scene: Annotated[str, typer.Argument()] = "Main",
+    profile: Annotated[
+        str,
+        typer.Option(
+            "--profile",
+            "-p",
+            envvar=ENV_PROFILE,
+            click_type=click.Choice(choices=list(PROFILES)),
+        ),
+    ] = DEFAULT_PROFILE,
+    ahead: Annotated[
+        int,
+        typer.Option(min=0, help="Slides to read ahead of the current one."),
+    ] = PRESENT_AHEAD,
+    behind: Annotated[
+        int,
+        typer.Option(min=0, help="Slides to keep behind the current one."),
+    ] = PRESENT_BEHIND,
+    cache_size: Annotated[
+        int,
+        typer.Option(
+            envvar=ENV_PRESENT_CACHE,
+            min=0,
+            help="Memory for read-ahead clips in MB.",
+        ),
+    ] = PRESENT_CACHE_SIZE_MB,
+    bundle: Annotated[
+        Path | None,
+        typer.Option(help="Present from a slide bundle instead of the scene."),
+    ] = None,
+    full_screen: Annotated[bool, typer.Option("--full-screen", "-F")] = False,
+    start_paused: Annotated[bool, typer.Option()] = False,
+) -> None:
+    from manim_slides.config import Config, PresentationConfig  # type: ignore
+    from manim_slides.qt_utils import qapp  # type: ignore
+
+    from qlora_presentation.utilities.bundle import DeckBundle
+    from qlora_presentation.utilities.player import PrefetchingPlayer, bundle_config
+    from qlora_presentation.utilities.prefetch import ClipCache
+
+    if bundle is not None:
+        deck = DeckBundle(path=bundle)
+        presentation_config = bundle_config(bundle=deck)
+        cache = ClipCache(max_size=cache_size * 1024**2, read=deck.read)
+    else:
+        presentation_config = PresentationConfig.from_file(
+            PROFILES[profile].slides_dir / f"{scene}.json"
+        )
+        cache = ClipCache(max_size=cache_size * 1024**2)
+
+    app = qapp()
+    app.setApplicationName("Manim Slides")
+
+    player = PrefetchingPlayer(
+        Config(),
+        [presentation_config],
+        cache=cache,
+        ahead=ahead,
+        behind=behind,
+        start_paused=start_paused,
+        full_screen=full_screen,
+        hide_info_window=len(app.screens()) == 1,
+    )
+    player.show(app.screens())
+
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,67 @@
+from typing import Annotated
+
+import click
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from qlora_presentation.core.config import CONSTANTS
+from qlora_presentation.models.quantisation import (
+    SCHEMES,
+    chunk_size,
+    measure_quantisation,
+    normal_weights,
+)
+from qlora_presentation.utilities.units import format_bytes
+
+app = typer.Typer()
+
+
+@app.command()
+def benchmark_quantisation(
+    parameters: Annotated[
+        int,
+        typer.Option("--parameters", "-p", help="Parameters in the weight stream."),
+    ] = CONSTANTS["quantisation"]["benchmark_parameters"],
+    schemes: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--scheme",
+            "-s",
+            click_type=click.Choice(choices=list(SCHEMES)),
+        ),
+    ] = None,
+    seed: Annotated[int, typer.Option()] = 0,
+) -> None:
+    table = Table(title=f"Quantising {parameters:,} normal weights")
+    table.add_column(header="Scheme")
+    table.add_column(header="Double quantised")
+    for column in ("Bits/param", "Size", "MSE", "SQNR (dB)", "Max error"):
+        table.add_column(header=column, justify="right")
+
+    for scheme in schemes or SCHEMES:
+        for double_quantise in (False, True):
+            # Every scheme sees the same stream of weights.
+            stats = measure_quantisation(
+                chunks=normal_weights(
+                    parameters=parameters,
+                    chunk=chunk_size(double_quantise=double_quantise),
+                    seed=seed,
+                ),
+                scheme=scheme,
+                double_quantise=double_quantise,
+            )
+            table.add_row(
+                scheme,
+                "yes" if double_quantise else "no",
+                f"{stats.bits_per_parameter:.3f}",
+                format_bytes(size=stats.storage_bits // 8),
+                f"{stats.mean_squared_error:.3e}",
+                f"{stats.sqnr:.2f}",
+                f"{stats.max_error:.3e}",
+            )
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,158 @@
+from pathlib import Path
+from typing import Annotated
+
+import click
+import typer
+
+from qlora_presentation.core.config import (
+    DEFAULT_PROFILE,
+    ENV_PROFILE,
+    EXPERIMENT_STORE,
+    LOG_DIR,
+    PROFILES,
+)
+from qlora_presentation.models.training.experiments import (
+    ResultStore,
+    all_experiments,
+    run_experiments,
+)
+from qlora_presentation.utilities.profiling import RenderReport, print_report
+from qlora_presentation.utilities.render import (
+    load_scene,
+    plan_slides,
+    render_incremental,
+    render_sections,
+    render_selection,
+)
+from qlora_presentation.utilities.selection import SlideSelection, parse_slide_ranges
+
+app = typer.Typer()
+
+
+@app.command()
+def render_slides(
+    file: Annotated[Path, typer.Argument()] = Path("main.py"),
+    scene: Annotated[str, typer.Argument()] = "Main",
+    profile: Annotated[
+        str,
+        typer.Option(
+            "--profile",
+            "-p",
+            envvar=ENV_PROFILE,
+            click_type=click.Choice(choices=list(PROFILES)),
+            help="Render profile, each with its own slides directory.",
+        ),
+    ] = DEFAULT_PROFILE,
+    processes: Annotated[
+        int | None,
+        typer.Option("--processes", "-j", help="Concurrent render processes."),
+    ] = None,
+    disable_caching: Annotated[bool, typer.Option()] = False,
+    incremental: Annotated[
+        bool,
+        typer.Option(help="Only re-render slides whose fingerprint changed."),
+    ] = False,
+    report: Annotated[
+        bool,
+        typer.Option(help="Time every slide and animation and print a report."),
+    ] = False,
+    slides: Annotated[
+        str | None,
+        typer.Option(
+            help="Only re-render these slides, e.g. '12-14', and patch them in."
+        ),
+    ] = None,
+    slide: Annotated[
+        list[str] | None,
+        typer.Option(
+            help="Only re-render slides with this title or section, e.g. "
+            "'LoRA: Performance', and patch them in."
+        ),
+    ] = None,
+) -> None:
+    try:
+        selection = SlideSelection(
+            slides=parse_slide_ranges(text=slides) if slides else frozenset(),
+            names=frozenset(slide or ()),
+        )
+    except ValueError as error:
+        raise typer.BadParameter(str(error), param_hint="--slides") from error
+    if selection and incremental:
+        raise typer.BadParameter(
+            "--incremental re-renders whatever changed, it cannot be combined "
+            "with --slides or --slide"
+        )
+
+    # Slides only read experiment results, so any missing ones are run here
+    # once rather than in every render process.
+    run_experiments(
+        configs=all_experiments(),
+        store=ResultStore(path=EXPERIMENT_STORE),
+        processes=processes,
+    )
+
+    render_profile = PROFILES[profile]
+    manim_args = ("--disable_caching",) if disable_caching else ()
+    report_file = LOG_DIR / f"report-{scene}-{profile}.json" if report else None
+    baseline = (
+        RenderReport.read(path=report_file)
+        if report_file is not None and report_file.exists()
+        else None
+    )
+
+    if selection:
+        # A planning pass lists every slide's section and title, so a
+        # selection that matches nothing fails before anything is rendered.
+        plan = plan_slides(
+            file=file,
+            scene=scene,
+            output_dir=render_profile.slides_dir,
+            profile=render_profile,
+            manim_args=manim_args,
+        )
+        try:
+            selection.validate(names=[slide.names for slide in plan])
+        except ValueError as error:
+            raise typer.BadParameter(str(error)) from error
+
+        presentation_path, rendered = render_selection(
+            file=file,
+            scene=scene,
+            selection=selection,
+            output_dir=render_profile.slides_dir,
+            profile=render_profile,
+            manim_args=manim_args,
+            report_file=report_file,
+        )
+        typer.echo(f"Re-rendered {len(rendered)} slide(s): {rendered}")
+    elif incremental:
+        presentation_path, rendered = render_incremental(
+            file=file,
+            scene=scene,
+            output_dir=render_profile.slides_dir,
+            profile=render_profile,
+            manim_args=manim_args,
+            processes=processes,
+            report_file=report_file,
+        )
+        typer.echo(f"Re-rendered {len(rendered)} slide(s): {rendered}")
+    else:
+        presentation_path = render_sections(
+            file=file,
+            scene=scene,
+            sections=list(load_scene(file=file, scene=scene).sections),
+            output_dir=render_profile.slides_dir,
+            profile=render_profile,
+            manim_args=manim_args,
+            processes=processes,
+            report_file=report_file,
+        )
+
+    typer.echo(f"Slides written to '{presentation_path}'")
+    if report_file is not None and report_file.exists():
+        print_report(report=RenderReport.read(path=report_file), baseline=baseline)
+        typer.echo(f"Report written to '{report_file}'")
+
+
+if __name__ == "__main__":
+    app()
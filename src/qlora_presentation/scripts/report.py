@@ -0,0 +1,31 @@
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from qlora_presentation.utilities.profiling import RenderReport, print_report
+
+app = typer.Typer()
+
+
+@app.command()
+def slide_report(
+    report: Annotated[Path, typer.Argument()],
+    baseline: Annotated[
+        Path | None,
+        typer.Option(help="Earlier report to show deltas against."),
+    ] = None,
+    animations: Annotated[
+        bool,
+        typer.Option(help="Break every slide down per animation."),
+    ] = False,
+) -> None:
+    print_report(
+        report=RenderReport.read(path=report),
+        baseline=RenderReport.read(path=baseline) if baseline is not None else None,
+        animations=animations,
+    )
+
+
+if __name__ == "__main__":
+    app()
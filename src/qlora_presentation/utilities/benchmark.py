@@ -0,0 +1,145 @@
+import json
+import shutil
+import statistics
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from qlora_presentation.core.config import CONSTANTS, RenderProfile, RenderSettings
+from qlora_presentation.utilities.profiling import RenderReport
+from qlora_presentation.utilities.render import RenderJob, run_render_job
+from qlora_presentation.utilities.selection import SlideSelection
+
+BENCHMARK_SLICES: dict[str, tuple[str, ...]] = {
+    name: tuple(sections) for name, sections in CONSTANTS["benchmark"]["slices"].items()
+}
+
+
+@dataclass(frozen=True)
+class BenchmarkResult(object):
+    name: str
+    profile: str
+    times: tuple[float, ...]
+
+    @property
+    def best(
+        self,
+    ) -> float:
+        return min(self.times)
+
+    @property
+    def median(
+        self,
+    ) -> float:
+        return statistics.median(self.times)
+
+
+@dataclass(frozen=True)
+class BenchmarkComparison(object):
+    result: BenchmarkResult
+    baseline: float | None
+    threshold: float
+
+    @property
+    def change(
+        self,
+    ) -> float | None:
+        if self.baseline is None or self.baseline == 0:
+            return None
+
+        return self.result.best / self.baseline - 1
+
+    @property
+    def regressed(
+        self,
+    ) -> bool:
+        return self.change is not None and self.change > self.threshold
+
+
+def benchmark_slice(
+    file: Path,
+    scene: str,
+    name: str,
+    sections: tuple[str, ...],
+    profile: RenderProfile,
+    output_dir: Path,
+    rounds: int,
+) -> BenchmarkResult:
+    staging_dir = output_dir / ".benchmarks" / name
+    times = []
+    for _ in range(rounds):
+        job = RenderJob(
+            name=f"benchmark-{name}",
+            settings=RenderSettings(
+                output_dir=staging_dir,
+                profile=profile,
+                selection=SlideSelection(names=frozenset(sections)),
+                worker=f"benchmark-{name}",
+                report_file=staging_dir / "report.json",
+            ),
+        )
+        # Partial movie caching would turn every round after the first into a
+        # file lookup, so each round renders from scratch.
+        run_render_job(
+            file=file,
+            scene=scene,
+            job=job,
+            manim_args=("--disable_caching",),
+        )
+
+        # Only the selected slides are timed, not fast-forwarding up to them.
+        report = RenderReport.read(path=staging_dir / "report.json")
+        times.append(
+            round(
+                sum(slide.wall_time for slide in report.slides if slide.rendered)
+                + report.save_time,
+                4,
+            )
+        )
+        shutil.rmtree(staging_dir)
+
+    return BenchmarkResult(
+        name=name,
+        profile=profile.name,
+        times=tuple(times),
+    )
+
+
+def read_baseline(
+    path: Path,
+) -> dict[str, float]:
+    if not path.exists():
+        return {}
+
+    return {
+        result["name"]: min(result["times"])
+        for result in json.loads(path.read_text())["results"]
+    }
+
+
+def write_baseline(
+    path: Path,
+    results: list[BenchmarkResult],
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        data=json.dumps(
+            obj={"results": [asdict(result) for result in results]},
+            indent=2,
+        )
+        + "\n"
+    )
+
+
+def compare_results(
+    results: list[BenchmarkResult],
+    baseline: dict[str, float],
+    threshold: float,
+) -> list[BenchmarkComparison]:
+    return [
+        BenchmarkComparison(
+            result=result,
+            baseline=baseline.get(result.name),
+            threshold=threshold,
+        )
+        for result in results
+    ]
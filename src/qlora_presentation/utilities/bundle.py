@@ -0,0 +1,194 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any
+
+from qlora_presentation.utilities.presentation import FILE_KEYS, Presentation
+
+BUNDLE_MAGIC = b"QLSB"
+BUNDLE_VERSION = 1
+# Magic, version, then offset and size of the JSON index.
+HEADER = struct.Struct("<4sIQQ")
+ALIGNMENT = 4096
+# Slide files plus the poster that `prepare_keyframes` adds to the first
+# slide, so that no path of the build machine ends up in the index.
+BUNDLED_KEYS = (*FILE_KEYS, "poster")
+# Superseded segments are only reclaimed once they make up this much of a file.
+COMPACT_RATIO = 0.5
+
+
+def align(
+    offset: int,
+) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class DeckBundle(object):
+    # A bundle is a fixed header, page aligned media segments and a JSON index
+    # naming them. The index is written after the segments and the header is
+    # updated last, so an interrupted update leaves the previous deck readable.
+    def __init__(
+        self,
+        path: Path,
+    ) -> None:
+        self.path = path
+        self.file = path.open(mode="rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), length=0, access=mmap.ACCESS_READ)
+            magic, version, index_offset, index_size = HEADER.unpack_from(self.map)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                raise ValueError(f"'{path}' is not a version {BUNDLE_VERSION} bundle")
+            index = json.loads(self.map[index_offset : index_offset + index_size])
+        except (ValueError, struct.error) as error:
+            self.file.close()
+            raise ValueError(f"Cannot read bundle '{path}': {error}") from error
+
+        self.presentation: Presentation = index["presentation"]
+        self.segments: dict[str, dict[str, Any]] = index["segments"]
+        self.index_offset = index_offset
+
+    def view(
+        self,
+        name: str | Path,
+    ) -> memoryview:
+        segment = self.segments[Path(name).name]
+        return memoryview(self.map)[
+            segment["offset"] : segment["offset"] + segment["size"]
+        ]
+
+    def read(
+        self,
+        name: str | Path,
+    ) -> bytes:
+        return bytes(self.view(name=name))
+
+    def close(
+        self,
+    ) -> None:
+        self.map.close()
+        self.file.close()
+
+    def __enter__(
+        self,
+    ) -> "DeckBundle":
+        return self
+
+    def __exit__(
+        self,
+        *args: Any,
+    ) -> None:
+        self.close()
+
+
+def file_digest(
+    path: Path,
+) -> str:
+    with path.open(mode="rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def bundle_presentation(
+    presentation: Presentation,
+) -> tuple[Presentation, dict[str, Path]]:
+    # Slide files are referred to by name within the bundle, those names are
+    # content hashes or fingerprints already.
+    files: dict[str, Path] = {}
+    slides = []
+    for slide in presentation["slides"]:
+        slide = dict(slide)
+        for key in BUNDLED_KEYS:
+            if key in slide:
+                path = Path(slide[key])
+                files[path.name] = path
+                slide[key] = path.name
+        slides.append(slide)
+
+    return {**presentation, "slides": slides}, files
+
+
+def write_bundle(
+    presentation: Presentation,
+    dest: Path,
+) -> None:
+    bundled, files = bundle_presentation(presentation=presentation)
+    digests = {name: file_digest(path=path) for name, path in files.items()}
+
+    try:
+        previous = DeckBundle(path=dest)
+    except (OSError, ValueError):
+        previous = None
+
+    if previous is not None:
+        with previous:
+            kept = {
+                name: segment
+                for name, segment in previous.segments.items()
+                if digests.get(name) == segment["digest"]
+            }
+            end = align(previous.map.size())
+        live = sum(segment["size"] for segment in kept.values()) + sum(
+            path.stat().st_size for name, path in files.items() if name not in kept
+        )
+        if live < end * COMPACT_RATIO:
+            previous = None
+
+    if previous is None:
+        partial = dest.with_name(f"{dest.name}.partial")
+        with partial.open(mode="wb") as file:
+            file.write(bytes(align(HEADER.size)))
+            write_segments(
+                file=file,
+                bundled=bundled,
+                files=files,
+                digests=digests,
+                segments={},
+                offset=align(HEADER.size),
+            )
+        partial.replace(dest)
+        return
+
+    # Unchanged segments stay where they are, and changed ones are appended.
+    with dest.open(mode="r+b") as file:
+        write_segments(
+            file=file,
+            bundled=bundled,
+            files=files,
+            digests=digests,
+            segments=kept,
+            offset=end,
+        )
+
+
+def write_segments(
+    file: Any,
+    bundled: Presentation,
+    files: dict[str, Path],
+    digests: dict[str, str],
+    segments: dict[str, dict[str, Any]],
+    offset: int,
+) -> None:
+    segments = dict(segments)
+    for name, path in files.items():
+        if name in segments:
+            continue
+
+        data = path.read_bytes()
+        file.seek(offset)
+        file.write(data)
+        segments[name] = {"offset": offset, "size": len(data), "digest": digests[name]}
+        offset = align(offset + len(data))
+
+    index = json.dumps(obj={"presentation": bundled, "segments": segments}).encode()
+    file.seek(offset)
+    file.write(index)
+    file.truncate()
+    file.flush()
+    os.fsync(file.fileno())
+
+    file.seek(0)
+    file.write(HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, offset, len(index)))
+    file.flush()
+    os.fsync(file.fileno())
@@ -0,0 +1,125 @@
+import shutil
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from qlora_presentation.utilities.presentation import FILE_KEYS, read_presentation
+
+PARTIAL_MOVIE_DIR = "partial_movie_files"
+REVERSED_SUFFIX = "_reversed"
+
+
+@dataclass
+class CacheReport(object):
+    root: Path
+    kept: list[Path] = field(default_factory=list)
+    orphaned: list[Path] = field(default_factory=list)
+
+    @property
+    def kept_size(
+        self,
+    ) -> int:
+        return sum(path.stat().st_size for path in self.kept)
+
+    @property
+    def orphaned_size(
+        self,
+    ) -> int:
+        return sum(path.stat().st_size for path in self.orphaned)
+
+
+def referenced_slide_files(
+    slides_dir: Path,
+) -> set[Path]:
+    referenced = set()
+    for presentation_path in slides_dir.glob("*.json"):
+        presentation = read_presentation(path=presentation_path)
+        for slide in presentation["slides"]:
+            for key in FILE_KEYS:
+                # manim-slides resolves slide files against the folder above the
+                # slides directory.
+                if key in slide:
+                    referenced.add((slides_dir.parent / slide[key]).resolve())
+
+    return referenced
+
+
+def find_slide_orphans(
+    slides_dir: Path,
+) -> CacheReport:
+    referenced = referenced_slide_files(slides_dir=slides_dir)
+    report = CacheReport(root=slides_dir / "files")
+    for path in sorted(report.root.rglob("*")):
+        if not path.is_file():
+            continue
+        if path.resolve() in referenced:
+            report.kept.append(path)
+        else:
+            report.orphaned.append(path)
+
+    return report
+
+
+def referenced_partial_files(
+    slides_dirs: Iterable[Path],
+) -> set[str] | None:
+    # Each rendered slide lists the partials behind it, by name since they are
+    # named by animation hash. Decks rendered before slides did so cannot say
+    # which partials they need, which is reported as None.
+    referenced = set()
+    for slides_dir in slides_dirs:
+        for presentation_path in slides_dir.glob("*.json"):
+            for slide in read_presentation(path=presentation_path)["slides"]:
+                if "partials" not in slide:
+                    return None
+                referenced.update(slide["partials"])
+
+    return referenced
+
+
+def reversed_partial_file(
+    path: Path,
+) -> Path:
+    return path.with_stem(f"{path.stem}{REVERSED_SUFFIX}")
+
+
+def find_partial_orphans(
+    media_dir: Path,
+    slides_dirs: Iterable[Path],
+) -> list[CacheReport]:
+    referenced = referenced_partial_files(slides_dirs=slides_dirs)
+    reports = []
+    for directory in sorted(media_dir.glob(f"videos/**/{PARTIAL_MOVIE_DIR}/*")):
+        if not directory.is_dir():
+            continue
+        report = CacheReport(root=directory)
+        for path in sorted(directory.iterdir()):
+            if not path.is_file():
+                continue
+            # Reversed partials live and die with their forward partial.
+            if (
+                referenced is None
+                or path.with_stem(path.stem.removesuffix(REVERSED_SUFFIX)).name
+                in referenced
+            ):
+                report.kept.append(path)
+            else:
+                report.orphaned.append(path)
+        reports.append(report)
+
+    return reports
+
+
+def remove_orphans(
+    reports: list[CacheReport],
+    archive_dir: Path | None = None,
+) -> None:
+    for report in reports:
+        for path in report.orphaned:
+            if archive_dir is None:
+                path.unlink()
+                continue
+
+            destination = archive_dir / path.resolve().relative_to(Path.cwd())
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(src=path, dst=destination)
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import tempfile
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import av
+from PIL import Image
+
+from qlora_presentation.utilities.bundle import file_digest, write_bundle
+from qlora_presentation.utilities.presentation import FILE_KEYS, Presentation
+from qlora_presentation.utilities.web import write_web
+
+EMU_PER_PIXEL = 9525
+
+
+def read_video_frame(
+    path: Path,
+    last: bool = True,
+) -> Image.Image:
+    with av.open(str(path)) as container:
+        frame = None
+        for frame in container.decode(video=0):
+            if not last:
+                break
+
+        if frame is None:
+            raise ValueError(f"No video frames in '{path}'")
+
+        return frame.to_image()
+
+
+def slide_keyframe(
+    slide: dict[str, Any],
+) -> Image.Image:
+    # Slides rendered before keyframes existed fall back to decoding the clip.
+    if "keyframe" in slide and Path(slide["keyframe"]).exists():
+        return Image.open(fp=slide["keyframe"]).convert(mode="RGB")
+
+    return read_video_frame(path=Path(slide["file"])).convert(mode="RGB")
+
+
+def write_pdf(
+    presentation: Presentation,
+    dest: Path,
+    resolution: float = 100.0,
+) -> None:
+    images = [slide_keyframe(slide=slide) for slide in presentation["slides"]]
+    if not images:
+        raise ValueError("Cannot convert a presentation without slides")
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    images[0].save(
+        dest,
+        format="PDF",
+        resolution=resolution,
+        save_all=True,
+        append_images=images[1:],
+    )
+
+
+def auto_play(
+    movie: Any,
+    loop: bool = False,
+) -> None:
+    # python-pptx has no API for media timing, see
+    # https://github.com/scanny/python-pptx/issues/427#issuecomment-856724440
+    namespaces = {"p": "http://schemas.openxmlformats.org/presentationml/2006/main"}
+    shape_id = movie.element.xpath(".//p:cNvPr", namespaces=namespaces)[0].get("id")
+    target = movie.element.getparent().getparent().getparent()
+    (target,) = target.xpath(
+        f'.//p:timing//p:video//p:spTgt[@spid="{shape_id}"]',
+        namespaces=namespaces,
+    )
+    timing = target.getparent().getparent()
+    timing.xpath(".//p:cond", namespaces=namespaces)[0].set("delay", "0")
+    if loop:
+        timing.xpath(".//p:cTn", namespaces=namespaces)[0].set(
+            "repeatCount", "indefinite"
+        )
+
+
+def write_pptx(
+    presentation: Presentation,
+    dest: Path,
+) -> None:
+    import pptx
+
+    width, height = presentation["resolution"]
+    document = pptx.Presentation()
+    document.slide_width = width * EMU_PER_PIXEL
+    document.slide_height = height * EMU_PER_PIXEL
+    layout = document.slide_layouts[6]
+
+    # A slide starts from where the previous one ended, so its poster frame is
+    # the previous keyframe and no clip has to be decoded for it.
+    with tempfile.TemporaryDirectory() as directory:
+        previous: Path | None = None
+        for index, slide in enumerate(presentation["slides"], start=1):
+            keyframe = Path(directory) / f"{index}.png"
+            slide_keyframe(slide=slide).save(keyframe)
+            if previous is None and "poster" in slide:
+                previous = Path(slide["poster"])
+            elif previous is None:
+                previous = Path(directory) / "0.png"
+                read_video_frame(path=Path(slide["file"]), last=False).save(previous)
+
+            page = document.slides.add_slide(layout)
+            if slide.get("static", False):
+                page.shapes.add_picture(
+                    str(keyframe),
+                    0,
+                    0,
+                    document.slide_width,
+                    document.slide_height,
+                )
+            else:
+                auto_play(
+                    movie=page.shapes.add_movie(
+                        slide["file"],
+                        0,
+                        0,
+                        document.slide_width,
+                        document.slide_height,
+                        poster_frame_image=str(previous),
+                        mime_type="video/mp4",
+                    ),
+                    loop=slide.get("loop", False),
+                )
+            if slide.get("notes"):
+                page.notes_slide.notes_text_frame.text = slide["notes"]
+            previous = keyframe
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        document.save(dest)
+
+
+def write_html(
+    presentation: Presentation,
+    dest: Path,
+) -> None:
+    from manim_slides.config import PresentationConfig  # type: ignore
+    from manim_slides.convert import RevealJS  # type: ignore
+
+    RevealJS(
+        presentation_configs=[PresentationConfig.model_validate(presentation)],
+    ).convert_to(dest)
+
+
+CONVERTERS: dict[str, Callable[[Presentation, Path], None]] = {
+    "bundle": write_bundle,
+    "html": write_html,
+    "pdf": write_pdf,
+    "pptx": write_pptx,
+    "web": write_web,
+}
+# Converters that run their own pool of encodes, which has to share the
+# concurrency limit rather than start one encode per CPU in every writer.
+POOLED_CONVERTERS = frozenset({"web"})
+
+
+def presentation_digest(
+    presentation: Presentation,
+) -> str:
+    digest = hashlib.sha256(json.dumps(obj=presentation, sort_keys=True).encode())
+    for slide in presentation["slides"]:
+        for key in FILE_KEYS:
+            if key in slide:
+                digest.update(file_digest(path=Path(slide[key])).encode())
+
+    return digest.hexdigest()
+
+
+def prepare_keyframes(
+    presentation: Presentation,
+    directory: Path,
+    processes: int | None = None,
+) -> Presentation:
+    # Every slide gets a keyframe on disk, decoding the clip only for slides
+    # rendered without one, so the writers never touch video themselves.
+    directory.mkdir(parents=True, exist_ok=True)
+
+    def prepare(
+        slide: dict[str, Any],
+    ) -> dict[str, Any]:
+        if "keyframe" in slide and Path(slide["keyframe"]).exists():
+            return slide
+
+        keyframe = directory / f"{Path(slide['file']).stem}.png"
+        if not keyframe.exists():
+            read_video_frame(path=Path(slide["file"])).save(keyframe)
+
+        return {**slide, "keyframe": str(keyframe)}
+
+    with ThreadPoolExecutor(max_workers=processes) as pool:
+        slides = list(pool.map(prepare, presentation["slides"]))
+
+    if slides:
+        first = slides[0]
+        poster = directory / f"{Path(first['file']).stem}-first.png"
+        if not poster.exists():
+            read_video_frame(path=Path(first["file"]), last=False).save(poster)
+        slides[0] = {**first, "poster": str(poster)}
+
+    return {**presentation, "slides": slides}
+
+
+def convert_presentation(
+    presentation: Presentation,
+    outputs: dict[str, Path],
+    cache_file: Path,
+    processes: int | None = None,
+    force: bool = False,
+) -> list[str]:
+    cache = json.loads(cache_file.read_text()) if cache_file.exists() else {}
+    digest = presentation_digest(presentation=presentation)
+    entries = {
+        to: {"digest": digest, "dest": str(dest)} for to, dest in outputs.items()
+    }
+    stale = [
+        to
+        for to, dest in outputs.items()
+        if force or not dest.exists() or cache.get(to) != entries[to]
+    ]
+    if not stale:
+        return stale
+
+    if {"pdf", "pptx", "web"} & set(stale):
+        presentation = prepare_keyframes(
+            presentation=presentation,
+            directory=cache_file.parent / ".keyframes",
+            processes=processes,
+        )
+
+    # Writers are independent and mostly CPU bound, so each gets a process.
+    # Outputs that did succeed are recorded even if another writer fails.
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = {
+                to: pool.submit(
+                    CONVERTERS[to],
+                    presentation,
+                    outputs[to],
+                    **({"processes": processes} if to in POOLED_CONVERTERS else {}),
+                )
+                for to in stale
+            }
+            for to, future in futures.items():
+                future.result()
+                cache[to] = entries[to]
+    finally:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(data=json.dumps(obj=cache, indent=2) + "\n")
+
+    return stale
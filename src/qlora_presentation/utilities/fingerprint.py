@@ -0,0 +1,127 @@
+import hashlib
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from typing import Any
+
+import numpy as np
+from manim import Animation, ManimColor, Mobject, config
+
+SCALARS = (bool, int, float, str, type(None))
+
+# Per-submobject attributes that fully determine how a mobject is drawn.
+MOBJECT_ATTRIBUTES = (
+    "points",
+    "fill_rgbas",
+    "stroke_rgbas",
+    "background_stroke_rgbas",
+    "stroke_width",
+    "background_stroke_width",
+    "pixel_array",
+    "z_index",
+)
+
+CONFIG_ATTRIBUTES = (
+    "pixel_width",
+    "pixel_height",
+    "frame_rate",
+    "frame_width",
+    "frame_height",
+    "background_color",
+    "background_opacity",
+    "transparent",
+    "movie_file_extension",
+)
+
+
+class Fingerprint(object):
+    def __init__(
+        self,
+    ) -> None:
+        self._hash = hashlib.sha256()
+
+    def hexdigest(
+        self,
+    ) -> str:
+        return self._hash.hexdigest()
+
+    def update(
+        self,
+        *values: Any,
+    ) -> "Fingerprint":
+        for value in values:
+            self._update(value=value)
+
+        return self
+
+    def _tag(
+        self,
+        tag: str,
+    ) -> None:
+        self._hash.update(f"<{tag}>".encode())
+
+    def _update(
+        self,
+        value: Any,
+    ) -> None:
+        if isinstance(value, (Enum, *SCALARS)):
+            self._tag(tag=repr(value))
+        elif isinstance(value, ManimColor):
+            self._tag(tag=value.to_hex(with_alpha=True))
+        elif isinstance(value, np.ndarray):
+            self._tag(tag=f"{value.dtype}{value.shape}")
+            self._hash.update(np.ascontiguousarray(value).tobytes())
+        elif isinstance(value, Mobject):
+            self._update_mobject(mobject=value)
+        elif isinstance(value, Animation):
+            self._update_animation(animation=value)
+        elif isinstance(value, (list, tuple)):
+            self._tag(tag=f"{type(value).__name__}{len(value)}")
+            for item in value:
+                self._update(value=item)
+        elif isinstance(value, dict):
+            self._tag(tag=f"dict{len(value)}")
+            for key in sorted(value, key=str):
+                self._update(value=str(key))
+                self._update(value=value[key])
+        elif is_dataclass(value) and not isinstance(value, type):
+            self._tag(tag=type(value).__qualname__)
+            for item in fields(value):
+                self._update(value=getattr(value, item.name))
+        elif callable(value):
+            module = getattr(value, "__module__", "")
+            name = getattr(value, "__qualname__", type(value).__qualname__)
+            self._tag(tag=f"{module}.{name}")
+        else:
+            # Anything else has no stable representation (e.g. default reprs
+            # embed memory addresses), so only its type contributes.
+            self._tag(tag=type(value).__qualname__)
+
+    def _update_mobject(
+        self,
+        mobject: Mobject,
+    ) -> None:
+        for submobject in mobject.get_family():
+            self._tag(tag=type(submobject).__qualname__)
+            for attribute in MOBJECT_ATTRIBUTES:
+                value = getattr(submobject, attribute, None)
+                if value is not None:
+                    self._update(value=value)
+
+    def _update_animation(
+        self,
+        animation: Animation,
+    ) -> None:
+        self._tag(tag=type(animation).__qualname__)
+        for key, value in sorted(vars(animation).items()):
+            if key.startswith("_") or key == "name":
+                continue
+            self._update(value=key)
+            self._update(value=value)
+
+
+def config_fingerprint(
+    fingerprint: Fingerprint,
+) -> Fingerprint:
+    return fingerprint.update(
+        *[getattr(config, attribute) for attribute in CONFIG_ATTRIBUTES],
+    )
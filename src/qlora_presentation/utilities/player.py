@@ -0,0 +1,140 @@
+from pathlib import Path
+from typing import Any
+
+from manim_slides.config import PresentationConfig  # type: ignore
+from manim_slides.present.player import Player  # type: ignore
+from qtpy.QtCore import QBuffer, QByteArray, QIODevice, QUrl
+from qtpy.QtMultimedia import QMediaPlayer
+
+from qlora_presentation.utilities.bundle import DeckBundle
+from qlora_presentation.utilities.prefetch import ClipCache, prefetch_window
+
+
+def bundle_config(
+    bundle: DeckBundle,
+) -> PresentationConfig:
+    # Slide files only exist inside the bundle, so the config is validated
+    # against the bundle itself and the segment names are put back afterwards.
+    slides = bundle.presentation["slides"]
+    config = PresentationConfig.model_validate(
+        {
+            **bundle.presentation,
+            "slides": [
+                {**slide, "file": bundle.path, "rev_file": bundle.path}
+                for slide in slides
+            ],
+        }
+    )
+    config.slides = [
+        slide_config.model_copy(
+            update={"file": Path(slide["file"]), "rev_file": Path(slide["rev_file"])}
+        )
+        for slide_config, slide in zip(config.slides, slides)
+    ]
+
+    return config
+
+
+class PrefetchingPlayer(Player):
+    # Slides are played from clips that were read ahead into memory, so moving
+    # between slides never waits on the disk. Only a clip the cache cannot read
+    # is left to the base player to open.
+    def __init__(
+        self,
+        *args: Any,
+        cache: ClipCache,
+        ahead: int = 2,
+        behind: int = 1,
+        **kwargs: Any,
+    ) -> None:
+        # The first slide is loaded while the base player is set up.
+        self.cache = cache
+        self.ahead = ahead
+        self.behind = behind
+        self.buffers: dict[int, QBuffer] = {}
+
+        super().__init__(*args, **kwargs)
+
+        self.slide_changed.connect(self.prefetch)
+        self.prefetch()
+
+    def prefetch(
+        self,
+    ) -> None:
+        slides = self.current_presentation_config.slides
+        self.cache.prefetch(
+            paths=prefetch_window(
+                files=[Path(slide.file) for slide in slides],
+                reversed_files=[
+                    Path(slide.rev_file) if slide.rev_file else None for slide in slides
+                ],
+                index=self.current_slide_index,
+                ahead=self.ahead,
+                behind=self.behind,
+            )
+        )
+
+    def set_cached_source(
+        self,
+        media_player: QMediaPlayer,
+        path: Path,
+    ) -> bool:
+        data = self.cache.get(path=path)
+        if data is None:
+            return False
+
+        buffer = QBuffer(self)
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        media_player.setSourceDevice(buffer, QUrl.fromLocalFile(str(path)))
+
+        # A player's previous buffer is released once it has been replaced.
+        previous = self.buffers.pop(id(media_player), None)
+        if previous is not None:
+            previous.close()
+            previous.deleteLater()
+        self.buffers[id(media_player)] = buffer
+
+        return True
+
+    def load_current_media(
+        self,
+        start_paused: bool = False,
+    ) -> None:
+        if not self.set_cached_source(
+            media_player=self.media_player,
+            path=Path(self.current_file),
+        ):
+            return super().load_current_media(start_paused=start_paused)
+
+        slide = self.current_slide_config
+        self.media_player.setPlaybackRate(
+            (
+                slide.reversed_playback_rate
+                if self.playing_reversed_slide
+                else slide.playback_rate
+            )
+            * self.playback_rate
+        )
+        if start_paused:
+            self.media_player.pause()
+        else:
+            self.media_player.play()
+
+    def preview_next_slide(
+        self,
+    ) -> None:
+        slide = self.next_slide_config
+        if slide is None or not self.set_cached_source(
+            media_player=self.info.next_media_player,
+            path=Path(slide.file),
+        ):
+            return super().preview_next_slide()
+
+        self.info.next_media_player.play()
+
+    def close(
+        self,
+    ) -> None:
+        self.cache.close()
+        super().close()
@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+
+
+class ClipCache(object):
+    # Slide clips around the current slide are read into memory ahead of time,
+    # most wanted first, and the least recently used ones outside that window
+    # are dropped to stay under `max_size` bytes. Clips stay encoded, so a
+    # slide costs its file size rather than its decoded frames.
+    def __init__(
+        self,
+        max_size: int,
+        workers: int = 2,
+        read: Callable[[Path], bytes] = Path.read_bytes,
+    ) -> None:
+        self.max_size = max_size
+        self.read = read
+        self.size = 0
+        self._clips: OrderedDict[Path, bytes] = OrderedDict()
+        self._pending: dict[Path, Future[bytes | None]] = {}
+        self._window: tuple[Path, ...] = ()
+        self._lock = Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+
+    def prefetch(
+        self,
+        paths: Sequence[Path],
+    ) -> None:
+        with self._lock:
+            self._window = tuple(paths)
+            for path in self._window:
+                if path not in self._clips and path not in self._pending:
+                    self._pending[path] = self._pool.submit(self._load, path)
+
+    def get(
+        self,
+        path: Path,
+    ) -> bytes | None:
+        with self._lock:
+            if path in self._clips:
+                self._clips.move_to_end(path)
+                return self._clips[path]
+            pending = self._pending.get(path)
+
+        # A clip that is still being read is waited for, one outside the window
+        # is read without being cached.
+        if pending is not None:
+            return pending.result()
+
+        try:
+            return self.read(path)
+        except (OSError, KeyError):
+            return None
+
+    def close(
+        self,
+    ) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._clips.clear()
+            self._pending.clear()
+            self.size = 0
+
+    def _load(
+        self,
+        path: Path,
+    ) -> bytes | None:
+        try:
+            data = self.read(path)
+        except (OSError, KeyError):
+            data = None
+
+        with self._lock:
+            self._pending.pop(path, None)
+            if data is None or not self._reserve(size=len(data)):
+                return data
+            self._clips[path] = data
+            self.size += len(data)
+
+        return data
+
+    def _reserve(
+        self,
+        size: int,
+    ) -> bool:
+        for path in list(self._clips):
+            if self.size + size <= self.max_size:
+                break
+            if path not in self._window:
+                self.size -= len(self._clips.pop(path))
+
+        return self.size + size <= self.max_size
+
+
+def prefetch_window(
+    files: Sequence[Path],
+    reversed_files: Sequence[Path | None],
+    index: int,
+    ahead: int,
+    behind: int,
+) -> list[Path]:
+    # Moving on plays the next slides, going back plays the current slide
+    # reversed and then previous slides forwards, so those are interleaved by
+    # distance from the current slide.
+    window = [files[index]]
+    for step in range(max(ahead, behind) + 1):
+        if step < ahead and index + step + 1 < len(files):
+            window.append(files[index + step + 1])
+        if step < behind and index - step >= 0:
+            reversed_file = reversed_files[index - step]
+            if reversed_file is not None:
+                window.append(reversed_file)
+            if index - step - 1 >= 0:
+                window.append(files[index - step - 1])
+
+    return list(dict.fromkeys(window))
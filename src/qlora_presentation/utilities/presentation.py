@@ -0,0 +1,79 @@
+import json
+import shutil
+from pathlib import Path
+from typing import Any
+
+Presentation = dict[str, Any]
+
+FILE_KEYS = ("file", "rev_file", "keyframe")
+
+
+def read_presentation(
+    path: Path,
+) -> Presentation:
+    with path.open() as file:
+        return json.load(fp=file)
+
+
+def write_presentation(
+    path: Path,
+    presentation: Presentation,
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open(mode="w") as file:
+        json.dump(obj=presentation, fp=file, indent=2)
+
+
+def relocate_slides(
+    presentation: Presentation,
+    folder: Path,
+) -> Presentation:
+    # Slide files are written relative to the working directory, which is also
+    # how manim-slides resolves them for folders one level below it.
+    folder.mkdir(parents=True, exist_ok=True)
+
+    slides = []
+    for slide in presentation["slides"]:
+        slide = dict(slide)
+        for key in FILE_KEYS:
+            if key not in slide:
+                continue
+            source = Path(slide[key])
+            destination = folder / source.name
+            if source != destination and source.exists():
+                shutil.move(src=source, dst=destination)
+            slide[key] = str(destination)
+        slides.append(slide)
+
+    return {**presentation, "slides": slides}
+
+
+def stitch_presentations(
+    presentations: list[Presentation],
+) -> Presentation:
+    if not presentations:
+        raise ValueError("Cannot stitch an empty list of presentations")
+
+    return {
+        **presentations[0],
+        "slides": [
+            slide for presentation in presentations for slide in presentation["slides"]
+        ],
+    }
+
+
+def patch_slides(
+    presentation: Presentation,
+    slides: list[dict[str, Any]],
+) -> Presentation:
+    patched = list(presentation["slides"])
+    for slide in slides:
+        index = slide["index"]
+        if not 1 <= index <= len(patched):
+            raise ValueError(
+                f"Slide {index} is not in the presentation, which has "
+                f"{len(patched)} slides; render the whole deck first"
+            )
+        patched[index - 1] = slide
+
+    return {**presentation, "slides": patched}
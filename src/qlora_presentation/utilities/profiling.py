@@ -0,0 +1,330 @@
+import json
+import resource
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from qlora_presentation.utilities.units import format_bytes
+
+COUNTERS = (
+    "tex_hits",
+    "tex_misses",
+    "tex_time",
+    "text_hits",
+    "text_misses",
+    "text_time",
+)
+
+
+def peak_rss() -> int:
+    # `ru_maxrss` is reported in bytes on macOS and in kilobytes elsewhere. It
+    # is the peak of the whole process so far, never that of a single slide.
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+@dataclass
+class AnimationProfile(object):
+    name: str
+    wall_time: float
+    frames: int
+
+
+@dataclass
+class SlideProfile(object):
+    index: int
+    section: str | None
+    rendered: bool
+    wall_time: float = 0.0
+    frames: int = 0
+    tex_hits: int = 0
+    tex_misses: int = 0
+    tex_time: float = 0.0
+    text_hits: int = 0
+    text_misses: int = 0
+    text_time: float = 0.0
+    peak_rss: int = 0
+    # How far this slide raised the process peak, which is what it can be
+    # blamed for since earlier slides already set the rest.
+    peak_rss_increase: int = 0
+    animations: list[AnimationProfile] = field(default_factory=list)
+
+    @property
+    def build_time(
+        self,
+    ) -> float:
+        # Everything outside `play`: mobject construction, TeX and text.
+        return self.wall_time - sum(
+            animation.wall_time for animation in self.animations
+        )
+
+    @property
+    def fps(
+        self,
+    ) -> float:
+        play_time = self.wall_time - self.build_time
+        return self.frames / play_time if play_time > 0 else 0.0
+
+
+@dataclass
+class RenderReport(object):
+    scene: str
+    profile: str
+    slides: list[SlideProfile] = field(default_factory=list)
+    save_time: float = 0.0
+
+    @classmethod
+    def read(
+        cls,
+        path: Path,
+    ) -> "RenderReport":
+        data = json.loads(path.read_text())
+        slides = [
+            SlideProfile(
+                **{
+                    **slide,
+                    "animations": [
+                        AnimationProfile(**animation)
+                        for animation in slide["animations"]
+                    ],
+                }
+            )
+            for slide in data.pop("slides")
+        ]
+
+        return cls(**data, slides=slides)
+
+    def write(
+        self,
+        path: Path,
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(data=json.dumps(obj=asdict(self), indent=2) + "\n")
+
+    @classmethod
+    def merge(
+        cls,
+        reports: list["RenderReport"],
+    ) -> "RenderReport":
+        if not reports:
+            raise ValueError("Cannot merge an empty list of reports")
+
+        # Every worker fast-forwards the slides it does not own, so each slide is
+        # taken from the report that actually rendered it.
+        slides: dict[int, SlideProfile] = {}
+        for report in reports:
+            for slide in report.slides:
+                if slide.rendered or slide.index not in slides:
+                    slides[slide.index] = slide
+
+        return cls(
+            scene=reports[0].scene,
+            profile=reports[0].profile,
+            slides=[slides[index] for index in sorted(slides)],
+            save_time=sum(report.save_time for report in reports),
+        )
+
+
+class Profiler(object):
+    def __init__(
+        self,
+        report: RenderReport,
+        counters: Callable[[], dict[str, float]],
+    ) -> None:
+        self.report = report
+        self._counters = counters
+        self._baseline = counters()
+        self._peak_rss = peak_rss()
+        self._started = time.perf_counter()
+        self._slide: SlideProfile | None = None
+
+    def start_slide(
+        self,
+        index: int,
+        section: str | None,
+        rendered: bool,
+    ) -> None:
+        self._slide = SlideProfile(
+            index=index,
+            section=section,
+            rendered=rendered,
+        )
+
+    def record_animation(
+        self,
+        name: str,
+        wall_time: float,
+        frames: int,
+    ) -> None:
+        if self._slide is None:
+            return
+
+        self._slide.animations.append(
+            AnimationProfile(
+                name=name,
+                wall_time=round(wall_time, 4),
+                frames=frames,
+            )
+        )
+        self._slide.frames += frames
+
+    def end_slide(
+        self,
+    ) -> None:
+        if self._slide is None:
+            return
+
+        # Slides are timed from the end of the previous one so that building
+        # mobjects before the first `play` is attributed to the right slide.
+        now = time.perf_counter()
+        counters = self._counters()
+        self._slide.wall_time = round(now - self._started, 4)
+        for name in COUNTERS:
+            value = counters[name] - self._baseline[name]
+            setattr(
+                self._slide,
+                name,
+                round(value, 4) if isinstance(value, float) else value,
+            )
+        self._slide.peak_rss = peak_rss()
+        self._slide.peak_rss_increase = self._slide.peak_rss - self._peak_rss
+        self._peak_rss = self._slide.peak_rss
+
+        self.report.slides.append(self._slide)
+        self._slide = None
+        self._started = now
+        self._baseline = counters
+
+
+def format_delta(
+    value: float,
+    baseline: float | None,
+    precision: int = 2,
+) -> str:
+    if baseline is None:
+        return f"{value:.{precision}f}"
+
+    return f"{value:.{precision}f} ({value - baseline:+.{precision}f})"
+
+
+def print_report(
+    report: RenderReport,
+    baseline: RenderReport | None = None,
+    animations: bool = False,
+    console: Console | None = None,
+) -> None:
+    console = console or Console()
+    previous = (
+        {slide.index: slide for slide in baseline.slides}
+        if baseline is not None
+        else {}
+    )
+
+    table = Table(title=f"{report.scene} ({report.profile})")
+    for column in ("Slide", "Section", "Wall (s)", "Build (s)", "Frames", "FPS"):
+        table.add_column(
+            header=column, justify="left" if column == "Section" else "right"
+        )
+    for column in (
+        "TeX hit/miss",
+        "TeX (s)",
+        "Text hit/miss",
+        "Text (s)",
+        "Peak RSS rise (MB)",
+        "Process peak (MB)",
+    ):
+        table.add_column(header=column, justify="right")
+
+    for slide in report.slides:
+        old = previous.get(slide.index)
+        table.add_row(
+            str(slide.index),
+            slide.section or "",
+            format_delta(
+                value=slide.wall_time,
+                baseline=old.wall_time if old is not None else None,
+            ),
+            format_delta(
+                value=slide.build_time,
+                baseline=old.build_time if old is not None else None,
+            ),
+            str(slide.frames),
+            f"{slide.fps:.1f}",
+            f"{slide.tex_hits}/{slide.tex_misses}",
+            f"{slide.tex_time:.2f}",
+            f"{slide.text_hits}/{slide.text_misses}",
+            f"{slide.text_time:.2f}",
+            format_bytes(
+                size=slide.peak_rss_increase,
+                unit="MB",
+                precision=0,
+                suffix=False,
+            ),
+            format_bytes(size=slide.peak_rss, unit="MB", precision=0, suffix=False),
+            style=None if slide.rendered else "dim",
+        )
+        if animations:
+            for position, animation in enumerate(slide.animations):
+                old_animation = (
+                    old.animations[position]
+                    if old is not None and position < len(old.animations)
+                    else None
+                )
+                table.add_row(
+                    "",
+                    f"  {animation.name}",
+                    format_delta(
+                        value=animation.wall_time,
+                        baseline=(
+                            old_animation.wall_time
+                            if old_animation is not None
+                            else None
+                        ),
+                    ),
+                    "",
+                    str(animation.frames),
+                    "",
+                    "",
+                    "",
+                    "",
+                    "",
+                    "",
+                    "",
+                    style="dim",
+                )
+
+    total = sum(slide.wall_time for slide in report.slides)
+    old_total = (
+        sum(slide.wall_time for slide in baseline.slides)
+        if baseline is not None
+        else None
+    )
+    table.add_section()
+    table.add_row(
+        "",
+        "total",
+        format_delta(value=total, baseline=old_total),
+        f"{sum(slide.build_time for slide in report.slides):.2f}",
+        str(sum(slide.frames for slide in report.slides)),
+        "",
+        "",
+        f"{sum(slide.tex_time for slide in report.slides):.2f}",
+        "",
+        f"{sum(slide.text_time for slide in report.slides):.2f}",
+        "",
+        "",
+    )
+    console.print(table)
+    console.print(
+        "Saving and reversing clips: "
+        + format_delta(
+            value=report.save_time,
+            baseline=baseline.save_time if baseline is not None else None,
+        )
+        + " s"
+    )
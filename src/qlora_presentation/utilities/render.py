@@ -0,0 +1,422 @@
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from qlora_presentation.core.config import LOG_DIR, RenderProfile, RenderSettings
+from qlora_presentation.utilities.presentation import (
+    FILE_KEYS,
+    patch_slides,
+    read_presentation,
+    relocate_slides,
+    stitch_presentations,
+    write_presentation,
+)
+from qlora_presentation.utilities.profiling import RenderReport
+from qlora_presentation.utilities.selection import SlideSelection
+from qlora_presentation.utilities.tex import (
+    TexCache,
+    compile_tex_batch,
+    read_tex_requests,
+)
+
+
+@dataclass(frozen=True)
+class RenderJob(object):
+    name: str
+    settings: RenderSettings
+
+
+@dataclass(frozen=True)
+class PlannedSlide(object):
+    fingerprint: str
+    names: frozenset[str]
+
+
+def load_scene(
+    file: Path,
+    scene: str,
+) -> Any:
+    spec = importlib.util.spec_from_file_location(name=file.stem, location=file)
+    if spec is None or spec.loader is None:
+        raise FileNotFoundError(f"Cannot import scenes from '{file}'")
+
+    module = importlib.util.module_from_spec(spec=spec)
+    sys.modules[file.stem] = module
+    sys.path.insert(0, str(file.parent.absolute()))
+    spec.loader.exec_module(module=module)
+
+    return getattr(module, scene)
+
+
+def run_render_job(
+    file: Path,
+    scene: str,
+    job: RenderJob,
+    manim_args: tuple[str, ...] = (),
+) -> Path:
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log_file = LOG_DIR / f"render-{scene}-{job.name}.log"
+
+    with log_file.open(mode="w") as log:
+        completed = subprocess.run(
+            args=[
+                sys.executable,
+                "-m",
+                "manim",
+                "render",
+                str(file),
+                scene,
+                "--progress_bar",
+                "none",
+                *manim_args,
+            ],
+            env={**os.environ, **job.settings.to_env()},
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+    if completed.returncode != 0:
+        raise RuntimeError(f"Rendering '{job.name}' failed, see '{log_file}'")
+
+    return job.settings.output_dir / f"{scene}.json"
+
+
+def run_render_jobs(
+    file: Path,
+    scene: str,
+    jobs: list[RenderJob],
+    manim_args: tuple[str, ...] = (),
+    processes: int | None = None,
+) -> list[Path]:
+    # Each job is its own manim process; the pool only waits on them.
+    with ThreadPoolExecutor(max_workers=processes or os.cpu_count()) as pool:
+        return list(
+            pool.map(
+                lambda job: run_render_job(
+                    file=file,
+                    scene=scene,
+                    job=job,
+                    manim_args=manim_args,
+                ),
+                jobs,
+            )
+        )
+
+
+def merge_reports(
+    jobs: list[RenderJob],
+) -> RenderReport:
+    return RenderReport.merge(
+        reports=[
+            RenderReport.read(path=job.settings.report_file)
+            for job in jobs
+            if job.settings.report_file is not None
+            and job.settings.report_file.exists()
+        ]
+    )
+
+
+def precompile_tex(
+    file: Path,
+    scene: str,
+    output_dir: Path,
+    profile: RenderProfile,
+    manim_args: tuple[str, ...] = (),
+) -> int:
+    manifest = output_dir / ".tex" / f"{scene}.jsonl"
+    manifest.unlink(missing_ok=True)
+    try:
+        run_render_job(
+            file=file,
+            scene=scene,
+            job=RenderJob(
+                name="tex",
+                settings=RenderSettings(
+                    output_dir=manifest.parent,
+                    profile=profile,
+                    worker="tex",
+                    tex_manifest=manifest,
+                ),
+            ),
+            manim_args=manim_args,
+        )
+    except RuntimeError:
+        # Placeholder SVGs can trip layout code further in; everything
+        # requested up to that point is still worth batching.
+        pass
+
+    requests = read_tex_requests(manifest=manifest) if manifest.exists() else []
+    compile_tex_batch(requests=requests, cache=TexCache.default())
+    shutil.rmtree(manifest.parent, ignore_errors=True)
+
+    return len(requests)
+
+
+def render_sections(
+    file: Path,
+    scene: str,
+    sections: list[str],
+    output_dir: Path,
+    profile: RenderProfile,
+    manim_args: tuple[str, ...] = (),
+    processes: int | None = None,
+    report_file: Path | None = None,
+) -> Path:
+    precompile_tex(
+        file=file,
+        scene=scene,
+        output_dir=output_dir,
+        profile=profile,
+        manim_args=manim_args,
+    )
+
+    staging_dir = output_dir / ".sections"
+    jobs = [
+        RenderJob(
+            name=section,
+            settings=RenderSettings(
+                output_dir=staging_dir / section,
+                profile=profile,
+                selection=SlideSelection(names=frozenset({section})),
+                worker=section,
+                report_file=(
+                    staging_dir / section / "report.json"
+                    if report_file is not None
+                    else None
+                ),
+            ),
+        )
+        for section in sections
+    ]
+
+    paths = run_render_jobs(
+        file=file,
+        scene=scene,
+        jobs=jobs,
+        manim_args=manim_args,
+        processes=processes,
+    )
+
+    scene_files_dir = output_dir / "files" / scene
+    presentation = stitch_presentations(
+        presentations=[
+            relocate_slides(
+                presentation=read_presentation(path=path),
+                folder=scene_files_dir,
+            )
+            for path in paths
+        ]
+    )
+    presentation_path = output_dir / f"{scene}.json"
+    write_presentation(path=presentation_path, presentation=presentation)
+    if report_file is not None:
+        merge_reports(jobs=jobs).write(path=report_file)
+    shutil.rmtree(staging_dir)
+
+    return presentation_path
+
+
+def group_slides(
+    slides: list[int],
+) -> list[list[int]]:
+    runs: list[list[int]] = []
+    for slide in sorted(slides):
+        if runs and runs[-1][-1] == slide - 1:
+            runs[-1].append(slide)
+        else:
+            runs.append([slide])
+
+    return runs
+
+
+def plan_slides(
+    file: Path,
+    scene: str,
+    output_dir: Path,
+    profile: RenderProfile,
+    manim_args: tuple[str, ...] = (),
+) -> list[PlannedSlide]:
+    plan_file = output_dir / ".plan" / f"{scene}.json"
+    run_render_job(
+        file=file,
+        scene=scene,
+        job=RenderJob(
+            name="plan",
+            settings=RenderSettings(
+                output_dir=output_dir / ".plan",
+                profile=profile,
+                worker="plan",
+                plan_file=plan_file,
+            ),
+        ),
+        manim_args=manim_args,
+    )
+    plan = [
+        PlannedSlide(fingerprint=slide["fingerprint"], names=frozenset(slide["names"]))
+        for slide in json.loads(plan_file.read_text())
+    ]
+    shutil.rmtree(plan_file.parent)
+
+    return plan
+
+
+def render_incremental(
+    file: Path,
+    scene: str,
+    output_dir: Path,
+    profile: RenderProfile,
+    manim_args: tuple[str, ...] = (),
+    processes: int | None = None,
+    report_file: Path | None = None,
+) -> tuple[Path, list[int]]:
+    precompile_tex(
+        file=file,
+        scene=scene,
+        output_dir=output_dir,
+        profile=profile,
+        manim_args=manim_args,
+    )
+
+    fingerprints = [
+        slide.fingerprint
+        for slide in plan_slides(
+            file=file,
+            scene=scene,
+            output_dir=output_dir,
+            profile=profile,
+            manim_args=manim_args,
+        )
+    ]
+
+    presentation_path = output_dir / f"{scene}.json"
+    presentation = (
+        read_presentation(path=presentation_path)
+        if presentation_path.exists()
+        else None
+    )
+    cached = {
+        slide["fingerprint"]: slide
+        for slide in (presentation["slides"] if presentation is not None else [])
+        if "fingerprint" in slide
+        and all(Path(slide[key]).exists() for key in FILE_KEYS if key in slide)
+    }
+
+    dirty = [
+        index
+        for index, fingerprint in enumerate(fingerprints, start=1)
+        if fingerprint not in cached
+    ]
+    if not dirty:
+        return presentation_path, dirty
+
+    staging_dir = output_dir / ".sections"
+    jobs = [
+        RenderJob(
+            name=f"slides-{run[0]}-{run[-1]}",
+            settings=RenderSettings(
+                output_dir=staging_dir / f"slides-{run[0]}-{run[-1]}",
+                profile=profile,
+                selection=SlideSelection(slides=frozenset(run)),
+                worker=f"slides-{run[0]}-{run[-1]}",
+                report_file=(
+                    staging_dir / f"slides-{run[0]}-{run[-1]}" / "report.json"
+                    if report_file is not None
+                    else None
+                ),
+            ),
+        )
+        for run in group_slides(slides=dirty)
+    ]
+
+    paths = run_render_jobs(
+        file=file,
+        scene=scene,
+        jobs=jobs,
+        manim_args=manim_args,
+        processes=processes,
+    )
+
+    scene_files_dir = output_dir / "files" / scene
+    rendered = stitch_presentations(
+        presentations=[
+            relocate_slides(
+                presentation=read_presentation(path=path),
+                folder=scene_files_dir,
+            )
+            for path in paths
+        ]
+    )
+    cached.update({slide["fingerprint"]: slide for slide in rendered["slides"]})
+
+    write_presentation(
+        path=presentation_path,
+        presentation={
+            **rendered,
+            "slides": [cached[fingerprint] for fingerprint in fingerprints],
+        },
+    )
+    if report_file is not None:
+        merge_reports(jobs=jobs).write(path=report_file)
+    shutil.rmtree(staging_dir)
+
+    return presentation_path, dirty
+
+
+def render_selection(
+    file: Path,
+    scene: str,
+    selection: SlideSelection,
+    output_dir: Path,
+    profile: RenderProfile,
+    manim_args: tuple[str, ...] = (),
+    report_file: Path | None = None,
+) -> tuple[Path, list[int]]:
+    presentation_path = output_dir / f"{scene}.json"
+    if not presentation_path.exists():
+        raise FileNotFoundError(
+            f"No presentation at '{presentation_path}' to patch, render the whole "
+            "deck first"
+        )
+
+    # Slides before the selection are fast-forwarded to rebuild the scene state
+    # and the run stops once the selection is behind it, so only the selected
+    # slides are rasterised and encoded.
+    staging_dir = output_dir / ".sections" / "selection"
+    job = RenderJob(
+        name="selection",
+        settings=RenderSettings(
+            output_dir=staging_dir,
+            profile=profile,
+            selection=selection,
+            worker="selection",
+            report_file=report_file,
+        ),
+    )
+    path = run_render_job(
+        file=file,
+        scene=scene,
+        job=job,
+        manim_args=manim_args,
+    )
+
+    rendered = relocate_slides(
+        presentation=read_presentation(path=path),
+        folder=output_dir / "files" / scene,
+    )
+    write_presentation(
+        path=presentation_path,
+        presentation=patch_slides(
+            presentation=read_presentation(path=presentation_path),
+            slides=rendered["slides"],
+        ),
+    )
+    shutil.rmtree(staging_dir)
+
+    return presentation_path, [slide["index"] for slide in rendered["slides"]]
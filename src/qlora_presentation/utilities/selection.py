@@ -0,0 +1,93 @@
+import json
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+
+
+def parse_slide_ranges(
+    text: str,
+) -> frozenset[int]:
+    # Slides are numbered from 1 as in the presenter, e.g. "3,12-14".
+    slides: set[int] = set()
+    for part in text.split(","):
+        start, separator, stop = part.strip().partition("-")
+        stop = stop if separator else start
+        if not (start.isdigit() and stop.isdigit() and 1 <= int(start) <= int(stop)):
+            raise ValueError(f"Invalid slide range '{part.strip()}'")
+        slides.update(range(int(start), int(stop) + 1))
+
+    return frozenset(slides)
+
+
+@dataclass(frozen=True)
+class SlideSelection(object):
+    slides: frozenset[int] = field(default_factory=frozenset)
+    names: frozenset[str] = field(default_factory=frozenset)
+
+    @classmethod
+    def from_json(
+        cls,
+        text: str,
+    ) -> "SlideSelection":
+        data = json.loads(text)
+
+        return cls(
+            slides=frozenset(data.get("slides", [])),
+            names=frozenset(data.get("names", [])),
+        )
+
+    def to_json(
+        self,
+    ) -> str:
+        return json.dumps(
+            obj={
+                "slides": sorted(self.slides),
+                "names": sorted(self.names),
+            }
+        )
+
+    def __bool__(
+        self,
+    ) -> bool:
+        return bool(self.slides or self.names)
+
+    def includes(
+        self,
+        slide: int,
+        names: Iterable[str],
+    ) -> bool:
+        return slide in self.slides or not self.names.isdisjoint(names)
+
+    def is_exhausted(
+        self,
+        slide: int,
+        visited: Iterable[str],
+        names: Iterable[str],
+    ) -> bool:
+        # Every requested slide lies behind us and every requested name has been
+        # entered and left again, so nothing further needs to run.
+        return (
+            slide > max(self.slides, default=0)
+            and self.names.issubset(visited)
+            and self.names.isdisjoint(names)
+        )
+
+    def validate(
+        self,
+        names: Sequence[Iterable[str]],
+    ) -> None:
+        # `names` holds the section and title of every slide in the deck, as
+        # found by a planning pass, so that a selection matching nothing fails
+        # instead of fast-forwarding through the whole deck.
+        missing = sorted(slide for slide in self.slides if slide > len(names))
+        if missing:
+            raise ValueError(
+                f"Slide(s) {', '.join(map(str, missing))} are past the end of the "
+                f"deck, which has {len(names)} slides"
+            )
+
+        unknown = sorted(self.names.difference(*names))
+        if unknown:
+            raise ValueError(
+                f"No slide has the title or section "
+                f"{', '.join(repr(name) for name in unknown)}"
+            )
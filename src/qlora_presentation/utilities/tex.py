@@ -0,0 +1,421 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from manim import TexTemplate, config, logger
+from manim.mobject.text import tex_mobject
+from manim.utils import tex_file_writing
+
+from qlora_presentation.core.config import TEX_CACHE_MAX_SIZE, get_tex_cache_dir
+
+BEGIN_DOCUMENT = r"\begin{document}"
+END_DOCUMENT = r"\end{document}"
+STANDALONE_PREVIEW = r"\documentclass[preview]{standalone}"
+STANDALONE_MULTI = r"\documentclass[preview,multi]{standalone}"
+
+# Stands in for uncompiled TeX while requests are collected, sized so that
+# layout code scaling or aligning by width and height keeps working.
+PLACEHOLDER_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="16" height="8">'
+    '<path d="M0 0H16V8H0Z"/></svg>'
+)
+
+# What precedes a comment on a line: anything but a backslash or `%`, or an
+# escaped character, so `\%` is text while `\\%` starts a comment.
+CODE_PATTERN = re.compile(pattern=r"(?:[^\\%]|\\.)*")
+# Loading the same package or library twice is a no-op, unlike repeating most
+# other lines, which may be part of a multi-line definition.
+IDEMPOTENT_PATTERN = re.compile(pattern=r"\\(?:usepackage|usetikzlibrary)\b")
+
+# Entries used this recently are never evicted, since another render may be
+# between looking a file up and parsing it.
+EVICTION_GRACE = 60
+
+
+def strip_comments(
+    texcode: str,
+) -> list[str]:
+    # A comment also swallows its line break and the next line's indentation,
+    # so the line it ends is joined to the next one rather than ended.
+    lines: list[str] = []
+    joined = False
+    for line in texcode.split("\n"):
+        code = CODE_PATTERN.match(line).group()
+        comment = line[len(code) : len(code) + 1] == "%"
+        code = code if comment else line
+        if joined:
+            lines[-1] += code.lstrip(" \t")
+        else:
+            lines.append(code)
+        joined = comment
+
+    return lines
+
+
+def normalise_texcode(
+    texcode: str,
+) -> str:
+    # Comments and spacing in the preamble do not change the compiled output,
+    # so they must not change the key either: TeX skips indentation, reads a
+    # run of spaces as one and drops trailing ones. Blank lines are kept, as a
+    # `\par` inside a definition is not the same as none. The body is kept as
+    # written but for trailing whitespace, since spacing in `\verb` is printed.
+    head, marker, body = texcode.partition(BEGIN_DOCUMENT)
+    lines = []
+    seen = set()
+    for line in strip_comments(texcode=head):
+        line = " ".join(line.split())
+        if IDEMPOTENT_PATTERN.match(line):
+            if line in seen:
+                continue
+            seen.add(line)
+        lines.append(line)
+
+    return "\n".join(
+        [*lines, marker + "\n".join(line.rstrip() for line in body.split("\n"))]
+    )
+
+
+def split_texcode(
+    texcode: str,
+) -> tuple[str, str]:
+    head, _, rest = texcode.partition(BEGIN_DOCUMENT)
+    body, _, _ = rest.rpartition(END_DOCUMENT)
+
+    return head, body
+
+
+@dataclass(frozen=True)
+class TexRequest(object):
+    texcode: str
+    tex_compiler: str
+    output_format: str
+
+    @classmethod
+    def from_template(
+        cls,
+        expression: str,
+        environment: str | None,
+        tex_template: TexTemplate,
+    ) -> "TexRequest":
+        if environment is not None:
+            texcode = tex_template.get_texcode_for_expression_in_env(
+                expression, environment
+            )
+        else:
+            texcode = tex_template.get_texcode_for_expression(expression)
+
+        return cls(
+            texcode=texcode,
+            tex_compiler=tex_template.tex_compiler,
+            output_format=tex_template.output_format,
+        )
+
+    @property
+    def key(
+        self,
+    ) -> str:
+        return hashlib.sha256(
+            "\n".join(
+                [
+                    self.tex_compiler,
+                    self.output_format,
+                    normalise_texcode(texcode=self.texcode),
+                ]
+            ).encode()
+        ).hexdigest()
+
+    @property
+    def head(
+        self,
+    ) -> str:
+        return split_texcode(texcode=self.texcode)[0]
+
+
+class TexCache(object):
+    def __init__(
+        self,
+        directory: Path,
+        max_size: int,
+    ) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # Time spent in `tex_to_svg_file`, compiling or looking up.
+        self.seconds = 0.0
+
+    @classmethod
+    def default(
+        cls,
+    ) -> "TexCache":
+        return cls(
+            directory=get_tex_cache_dir(),
+            max_size=TEX_CACHE_MAX_SIZE,
+        )
+
+    def get(
+        self,
+        key: str,
+    ) -> Path | None:
+        path = self.directory / f"{key}.svg"
+        try:
+            # Access times are unreliable (noatime mounts), so reads bump the
+            # modification time that eviction orders by.
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return path
+
+    def put(
+        self,
+        key: str,
+        svg_file: Path,
+        evict: bool = True,
+    ) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{key}.svg"
+
+        # Writers publish with an atomic rename, so concurrent renders of the
+        # same expression race harmlessly and readers never see partial files.
+        descriptor, temporary = tempfile.mkstemp(
+            dir=self.directory,
+            prefix=f".{key}.",
+            suffix=".tmp",
+        )
+        os.close(descriptor)
+        shutil.copyfile(src=svg_file, dst=temporary)
+        os.replace(src=temporary, dst=path)
+
+        # Eviction scans the whole directory, so batches skip it per entry and
+        # evict once when they are done.
+        if evict:
+            self.evict()
+
+        return path
+
+    def evict(
+        self,
+    ) -> None:
+        entries = []
+        for path in self.directory.glob("*.svg"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(entry[1] for entry in entries)
+        for modified, entry_size, path in sorted(entries):
+            if size <= self.max_size or modified > time.time() - EVICTION_GRACE:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+
+
+def compile_texcode(
+    texcode: str,
+    tex_compiler: str,
+    output_format: str,
+    directory: Path,
+) -> list[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    tex_file = directory / "document.tex"
+    tex_file.write_text(data=texcode, encoding="utf-8")
+
+    completed = subprocess.run(
+        args=tex_file_writing.make_tex_compilation_command(
+            tex_compiler,
+            output_format,
+            tex_file,
+            directory,
+        ),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    if completed.returncode != 0:
+        raise ValueError(f"{tex_compiler} failed, see '{tex_file.with_suffix('.log')}'")
+
+    # A single dvisvgm call splits every page into its own SVG.
+    subprocess.run(
+        args=[
+            "dvisvgm",
+            *(["--pdf"] if output_format == ".pdf" else []),
+            "--page=1-",
+            "--no-fonts",
+            "--verbosity=0",
+            f"--output={(directory / 'page-%p.svg').as_posix()}",
+            tex_file.with_suffix(output_format).as_posix(),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    return sorted(
+        directory.glob("page-*.svg"),
+        key=lambda path: int(path.stem.rpartition("-")[2]),
+    )
+
+
+def batch_texcode(
+    requests: list[TexRequest],
+) -> str | None:
+    head = requests[0].head
+    if not head.startswith(STANDALONE_PREVIEW):
+        return None
+
+    # In multi mode every `standalone` environment becomes its own cropped page.
+    return "\n".join(
+        [
+            head.replace(STANDALONE_PREVIEW, STANDALONE_MULTI, 1) + BEGIN_DOCUMENT,
+            *[
+                r"\begin{standalone}"
+                + split_texcode(texcode=request.texcode)[1]
+                + r"\end{standalone}"
+                for request in requests
+            ],
+            END_DOCUMENT,
+        ]
+    )
+
+
+def compile_tex_batch(
+    requests: list[TexRequest],
+    cache: TexCache,
+) -> list[TexRequest]:
+    groups: dict[tuple[str, str, str], list[TexRequest]] = defaultdict(list)
+    for request in {request.key: request for request in requests}.values():
+        if cache.get(key=request.key) is None:
+            groups[(request.tex_compiler, request.output_format, request.head)].append(
+                request
+            )
+
+    failed = []
+    with tempfile.TemporaryDirectory() as directory:
+        for index, ((tex_compiler, output_format, _), group) in enumerate(
+            groups.items()
+        ):
+            texcode = batch_texcode(requests=group)
+            pages: list[Path] = []
+            if texcode is not None and len(group) > 1:
+                try:
+                    pages = compile_texcode(
+                        texcode=texcode,
+                        tex_compiler=tex_compiler,
+                        output_format=output_format,
+                        directory=Path(directory) / f"batch-{index}",
+                    )
+                except ValueError as error:
+                    logger.warning(f"Batched TeX compilation failed: {error}")
+
+            if len(pages) == len(group):
+                for request, page in zip(group, pages):
+                    cache.put(key=request.key, svg_file=page, evict=False)
+                continue
+
+            # A single bad expression fails the whole batch, so everything in it
+            # is retried on its own.
+            for item, request in enumerate(group):
+                try:
+                    pages = compile_texcode(
+                        texcode=request.texcode,
+                        tex_compiler=tex_compiler,
+                        output_format=output_format,
+                        directory=Path(directory) / f"item-{index}-{item}",
+                    )
+                except ValueError:
+                    pages = []
+                if not pages:
+                    failed.append(request)
+                    continue
+                cache.put(key=request.key, svg_file=pages[0], evict=False)
+
+    if groups:
+        cache.evict()
+
+    return failed
+
+
+def read_tex_requests(
+    manifest: Path,
+) -> list[TexRequest]:
+    with manifest.open(encoding="utf-8") as file:
+        return [TexRequest(**json.loads(line)) for line in file if line.strip()]
+
+
+_tex_to_svg_file = tex_file_writing.tex_to_svg_file
+
+
+def install_tex_cache(
+    cache: TexCache | None = None,
+    manifest: Path | None = None,
+) -> TexCache:
+    cache = cache or TexCache.default()
+
+    placeholder = None
+    if manifest is not None:
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        placeholder = manifest.with_suffix(".svg")
+        placeholder.write_text(data=PLACEHOLDER_SVG)
+
+    def find_svg_file(
+        expression: str,
+        environment: str | None = None,
+        tex_template: TexTemplate | None = None,
+    ) -> Path:
+        request = TexRequest.from_template(
+            expression=expression,
+            environment=environment,
+            tex_template=tex_template or config["tex_template"],
+        )
+
+        svg_file = cache.get(key=request.key)
+        if svg_file is not None:
+            return svg_file
+
+        if manifest is not None and placeholder is not None:
+            # Requests are appended as they happen so a collection run that
+            # trips over placeholder geometry still keeps what it found.
+            with manifest.open(mode="a", encoding="utf-8") as file:
+                file.write(json.dumps(obj=asdict(request)) + "\n")
+            return placeholder
+
+        return cache.put(
+            key=request.key,
+            svg_file=_tex_to_svg_file(
+                expression,
+                environment,
+                tex_template or config["tex_template"],
+            ),
+        )
+
+    def tex_to_svg_file(
+        expression: str,
+        environment: str | None = None,
+        tex_template: TexTemplate | None = None,
+    ) -> Path:
+        start = time.perf_counter()
+        try:
+            return find_svg_file(
+                expression=expression,
+                environment=environment,
+                tex_template=tex_template,
+            )
+        finally:
+            cache.seconds += time.perf_counter() - start
+
+    # `tex_mobject` binds the function at import time, so it is patched there.
+    tex_mobject.tex_to_svg_file = tex_to_svg_file
+
+    return cache
@@ -0,0 +1,22 @@
+# One convention for every byte count shown, matching the `_mb` settings in
+# constants.toml: units are powers of 1024.
+BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
+UNIT_SIZE = 1024
+
+
+def format_bytes(
+    size: float,
+    unit: str | None = None,
+    precision: int = 1,
+    suffix: bool = True,
+) -> str:
+    # Without a `unit` the largest one that keeps the number at least 1 is used.
+    if unit is None:
+        for unit in BYTE_UNITS:
+            if abs(size) < UNIT_SIZE ** (BYTE_UNITS.index(unit) + 1):
+                break
+    elif unit not in BYTE_UNITS:
+        raise ValueError(f"Unknown unit '{unit}', expected one of {BYTE_UNITS}")
+
+    value = size / UNIT_SIZE ** BYTE_UNITS.index(unit)
+    return f"{value:.{precision}f} {unit}" if suffix else f"{value:.{precision}f}"
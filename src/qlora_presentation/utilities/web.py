@@ -0,0 +1,182 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from pathlib import Path
+from string import Template
+from typing import Any
+
+import av
+from PIL import Image
+
+from qlora_presentation.assets import ASSET_DIR
+from qlora_presentation.core.config import WEB_PRESET, WEB_RENDITIONS, WebRendition
+from qlora_presentation.utilities.presentation import Presentation
+
+PLAYER_TEMPLATE = ASSET_DIR / "templates" / "web.html"
+POSTER_QUALITY = 80
+
+
+def even(
+    value: float,
+) -> int:
+    return max(2, round(value / 2) * 2)
+
+
+def transcode_rendition(
+    src: Path,
+    dest: Path,
+    rendition: WebRendition,
+    preset: str = WEB_PRESET,
+) -> None:
+    # Source frames are mapped onto the rendition's frame grid by timestamp, so
+    # held frames in the variable frame rate source stay a single frame here.
+    partial = dest.with_suffix(".partial.mp4")
+    with av.open(str(src)) as source:
+        video = source.streams.video[0]
+        width = even(video.width * rendition.pixel_height / video.height)
+        time_base = Fraction(1, rendition.frame_rate)
+
+        with av.open(
+            str(partial),
+            mode="w",
+            container_options={"movflags": "+faststart"},
+        ) as container:
+            stream = container.add_stream(
+                "libx264",
+                rate=rendition.frame_rate,
+                options={"crf": str(rendition.crf), "preset": preset},
+            )
+            stream.pix_fmt = "yuv420p"
+            stream.width = width
+            stream.height = rendition.pixel_height
+            stream.codec_context.time_base = time_base
+
+            position = -1
+            for frame in source.decode(video):
+                index = int((frame.time or 0) * rendition.frame_rate)
+                if index <= position:
+                    continue
+
+                scaled = frame.reformat(
+                    width=width,
+                    height=rendition.pixel_height,
+                    format="yuv420p",
+                )
+                scaled.pts = index
+                scaled.time_base = time_base
+                for packet in stream.encode(scaled):
+                    container.mux(packet)
+                position = index
+
+            for packet in stream.encode():
+                container.mux(packet)
+
+    partial.replace(dest)
+
+
+def write_poster(
+    src: Path,
+    dest: Path,
+    height: int,
+) -> None:
+    image = Image.open(fp=src).convert(mode="RGB")
+    image.resize(size=(even(image.width * height / image.height), height)).save(
+        dest,
+        format="JPEG",
+        quality=POSTER_QUALITY,
+    )
+
+
+def slide_renditions(
+    height: int,
+) -> tuple[WebRendition, ...]:
+    # Renditions are never upscaled, so a draft deck only gets its smallest one.
+    return (
+        tuple(
+            rendition
+            for rendition in WEB_RENDITIONS
+            if rendition.pixel_height <= height
+        )
+        or WEB_RENDITIONS[:1]
+    )
+
+
+def write_web(
+    presentation: Presentation,
+    dest: Path,
+    processes: int | None = None,
+) -> None:
+    _, height = presentation["resolution"]
+    renditions = slide_renditions(height=height)
+    assets = dest.parent / "assets"
+    assets.mkdir(parents=True, exist_ok=True)
+
+    # Media are named after the source clip, whose name is its content hash,
+    # so only slides that were re-rendered since the last export are encoded.
+    jobs: list[tuple[Any, ...]] = []
+    slides = []
+    previous: Path | None = None
+    for slide in presentation["slides"]:
+        clip = Path(slide["file"])
+        keyframe = Path(slide["keyframe"])
+        start = previous or Path(slide.get("poster", keyframe))
+        poster = assets / f"{start.stem}.jpg"
+        still = assets / f"{keyframe.stem}.jpg"
+        sources = {
+            rendition.name: assets / f"{clip.stem}_{rendition.name}.mp4"
+            for rendition in renditions
+        }
+
+        for image, target in ((start, poster), (keyframe, still)):
+            if not target.exists():
+                jobs.append((write_poster, image, target, renditions[0].pixel_height))
+        for rendition in renditions:
+            if not sources[rendition.name].exists():
+                jobs.append(
+                    (transcode_rendition, clip, sources[rendition.name], rendition)
+                )
+
+        slides.append(
+            {
+                "sources": {
+                    name: path.relative_to(dest.parent).as_posix()
+                    for name, path in sources.items()
+                },
+                "poster": poster.relative_to(dest.parent).as_posix(),
+                "still": still.relative_to(dest.parent).as_posix(),
+                "loop": slide.get("loop", False),
+                "auto_next": slide.get("auto_next", False),
+                "notes": slide.get("notes", ""),
+            }
+        )
+        previous = keyframe
+
+    with ThreadPoolExecutor(max_workers=processes) as pool:
+        for future in [pool.submit(*job) for job in dict.fromkeys(jobs)]:
+            future.result()
+
+    # Media of slides that no longer exist are dropped from the export.
+    used = {
+        dest.parent / path
+        for slide in slides
+        for path in (slide["poster"], slide["still"], *slide["sources"].values())
+    }
+    for path in assets.iterdir():
+        if path not in used:
+            path.unlink()
+
+    dest.write_text(
+        data=Template(PLAYER_TEMPLATE.read_text()).substitute(
+            title=dest.parent.name,
+            background_color=presentation.get("background_color", "black"),
+            deck=json.dumps(
+                obj={
+                    "renditions": [
+                        {"name": rendition.name, "height": rendition.pixel_height}
+                        for rendition in renditions
+                    ],
+                    "slides": slides,
+                }
+            ).replace("</", "<\\/"),
+        )
+    )
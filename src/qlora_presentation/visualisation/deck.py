@@ -0,0 +1,51 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from manim import Animation, FadeOut, Mobject, Unwrite
+
+EXITS: dict[str, Callable[[Mobject], Animation]] = {
+    "unwrite": Unwrite,
+    "fade_out": FadeOut,
+}
+
+
+@dataclass(frozen=True)
+class SlideSpec(object):
+    # `build` names the scene method that creates and animates the slide body and
+    # returns whatever is left on screen for `exit` to clear on the next slide.
+    build: str | None = None
+    title: str | None = None
+    section: str | None = None
+    centred: bool = False
+    exit: str = "unwrite"
+
+    def __post_init__(
+        self,
+    ) -> None:
+        if self.exit not in EXITS:
+            raise ValueError(
+                f"Unknown exit '{self.exit}', expected one of {', '.join(EXITS)}"
+            )
+
+    def exit_animation(
+        self,
+        content: Mobject,
+    ) -> Animation:
+        return EXITS[self.exit](content)
+
+
+@dataclass(frozen=True)
+class Deck(object):
+    slides: tuple[SlideSpec, ...]
+
+    @property
+    def sections(
+        self,
+    ) -> tuple[str, ...]:
+        return tuple(slide.section for slide in self.slides if slide.section)
+
+    @property
+    def titles(
+        self,
+    ) -> tuple[str, ...]:
+        return tuple(slide.title for slide in self.slides if slide.title)
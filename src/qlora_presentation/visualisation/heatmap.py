@@ -0,0 +1,177 @@
+from collections.abc import Sequence
+
+import numpy as np
+from manim import (
+    RESAMPLING_ALGORITHMS,
+    Animation,
+    ImageMobject,
+    ManimColor,
+    Mobject,
+    smooth,
+)
+from numpy.typing import ArrayLike, NDArray
+
+from qlora_presentation.visualisation.styles import Style
+
+LEVELS = 256
+
+
+def colour_ramp(
+    colours: Sequence[ManimColor],
+    levels: int = LEVELS,
+) -> NDArray:
+    # RGBA lookup table running linearly through `colours`, evenly spaced.
+    stops = np.array([ManimColor(colour).to_rgba() for colour in colours])
+    positions = np.linspace(0, 1, num=len(stops))
+    samples = np.linspace(0, 1, num=levels)
+    ramp = np.stack(
+        [np.interp(samples, positions, stops[:, channel]) for channel in range(4)],
+        axis=1,
+    )
+
+    return np.round(ramp * 255).astype(np.uint8)
+
+
+def style_ramp(
+    style: Style,
+    levels: int = LEVELS,
+) -> NDArray:
+    # From the background up through the foreground shades, so empty cells
+    # disappear into the slide and the largest values stand out the most.
+    return colour_ramp(
+        colours=[
+            style.background.primary,
+            style.foreground.tertiary,
+            style.foreground.secondary,
+            style.foreground.primary,
+        ],
+        levels=levels,
+    )
+
+
+def normalise(
+    values: ArrayLike,
+    low: float | None = None,
+    high: float | None = None,
+) -> NDArray:
+    values = np.asarray(values, dtype=np.float32)
+    if values.ndim != 2:
+        raise ValueError(f"Heatmaps need a matrix, got shape {values.shape}")
+
+    low = float(values.min()) if low is None else low
+    high = float(values.max()) if high is None else high
+    levels = (values - low) / (high - low if high > low else 1)
+
+    return np.clip(levels, a_min=0, a_max=1, out=levels)
+
+
+class Heatmap(ImageMobject):
+    # One raster image with a pixel per matrix cell rather than a mobject per
+    # cell, so a 512 x 512 matrix costs one image resize per frame. Cells are
+    # stored as levels in [0, 1] and coloured through a lookup table into one
+    # of two pixel buffers, the other being the one currently on screen.
+    def __init__(
+        self,
+        values: ArrayLike,
+        low: float | None = None,
+        high: float | None = None,
+        style: Style | None = None,
+        height: float = 4,
+        **kwargs,
+    ) -> None:
+        self.levels = normalise(values=values, low=low, high=high)
+        self.ramp = style_ramp(style=style if style is not None else Style())
+        self.buffers = [
+            np.zeros(shape=(*self.levels.shape, 4), dtype=np.uint8) for _ in range(2)
+        ]
+        self.indices = np.zeros(shape=self.levels.shape, dtype=np.intp)
+
+        super().__init__(
+            self.colour(levels=self.levels),
+            resampling_algorithm=RESAMPLING_ALGORITHMS["nearest"],
+            **kwargs,
+        )
+        self.set_levels(levels=self.levels)
+        self.scale_to_fit_height(height)
+
+    def colour(
+        self,
+        levels: NDArray,
+    ) -> NDArray:
+        # Written into the buffer not on screen, which is then swapped in.
+        buffer = self.buffers.pop(0)
+        np.multiply(levels, len(self.ramp) - 1, out=self.indices, casting="unsafe")
+        np.clip(self.indices, a_min=0, a_max=len(self.ramp) - 1, out=self.indices)
+        np.take(self.ramp, self.indices, axis=0, out=buffer)
+        self.buffers.append(buffer)
+
+        return buffer
+
+    def set_levels(
+        self,
+        levels: NDArray,
+    ) -> "Heatmap":
+        if levels.shape != self.levels.shape:
+            raise ValueError(
+                f"Heatmap of shape {self.levels.shape} cannot show {levels.shape}"
+            )
+
+        self.levels = levels
+        self.pixel_array = self.colour(levels=levels)
+
+        return self
+
+    def set_values(
+        self,
+        values: ArrayLike,
+        low: float | None = None,
+        high: float | None = None,
+    ) -> "Heatmap":
+        return self.set_levels(levels=normalise(values=values, low=low, high=high))
+
+
+class HeatmapTransition(Animation):
+    # Blends the levels of every cell and recolours them each frame, so the
+    # in-between frames stay on the palette instead of fading through RGB.
+    def __init__(
+        self,
+        heatmap: Heatmap,
+        values: ArrayLike,
+        low: float | None = None,
+        high: float | None = None,
+        rate_func=smooth,
+        **kwargs,
+    ) -> None:
+        self.end = normalise(values=values, low=low, high=high)
+        if self.end.shape != heatmap.levels.shape:
+            raise ValueError(
+                f"Heatmap of shape {heatmap.levels.shape} cannot show {self.end.shape}"
+            )
+
+        super().__init__(
+            heatmap,
+            rate_func=rate_func,
+            **kwargs,
+        )
+
+    def create_starting_mobject(
+        self,
+    ) -> Mobject:
+        # Only the levels are needed to start from, not a copy of the buffers.
+        return self.mobject
+
+    def begin(
+        self,
+    ) -> None:
+        self.start = self.mobject.levels
+        self.delta = self.end - self.start
+        self.frame = np.empty_like(self.start)
+        super().begin()
+
+    def interpolate_mobject(
+        self,
+        alpha: float,
+    ) -> None:
+        np.multiply(self.delta, self.rate_func(alpha), out=self.frame)
+        self.frame += self.start
+        self.mobject.set_levels(levels=self.frame)
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+
+from qlora_presentation.models.memory import (
+    FINE_TUNING_METHODS,
+    Architecture,
+    memory_footprint,
+)
+from qlora_presentation.utilities.units import format_bytes
+
+# Rows of the memory diagram, with the height every box in that row is drawn
+# at. Box areas are proportional to bytes, so widths follow from heights.
+ROW_HEIGHTS = {"weights": 0.5, "optimiser": 1.0}
+
+
+@dataclass(frozen=True)
+class MemoryBox(object):
+    label: str
+    size: int
+    width: float
+    height: float
+
+
+def memory_boxes(
+    architecture: Architecture,
+    max_width: float = 2.5,
+) -> dict[str, dict[str, MemoryBox]]:
+    footprints = {
+        name: memory_footprint(architecture=architecture, method=method)
+        for name, method in FINE_TUNING_METHODS.items()
+    }
+    sizes = {
+        name: {"weights": footprint.weights, "optimiser": footprint.optimiser}
+        for name, footprint in footprints.items()
+    }
+    # The widest box of any method is drawn at `max_width`, so all three
+    # methods share one scale and stay comparable.
+    area = max(
+        size / ROW_HEIGHTS[row] for rows in sizes.values() for row, size in rows.items()
+    )
+
+    boxes = {}
+    for name, method in FINE_TUNING_METHODS.items():
+        labels = {
+            "weights": f"Transformer ({method.weight_bits} bit)",
+            "optimiser": f"Optimiser ({method.optimiser_bits} bit)",
+        }
+        boxes[name] = {
+            row: MemoryBox(
+                label=f"{labels[row]}\n{format_bytes(size=size)}",
+                size=size,
+                width=max_width * size / ROW_HEIGHTS[row] / area,
+                height=ROW_HEIGHTS[row],
+            )
+            for row, size in sizes[name].items()
+        }
+
+    return boxes
@@ -0,0 +1,182 @@
+from collections.abc import Sequence
+
+import numpy as np
+from manim import GREY, RIGHT, UP, WHITE, Circle, ManimColor, VGroup, VMobject
+from numpy.typing import NDArray
+
+
+def vertical_positions(
+    n: int,
+    height: float,
+) -> NDArray:
+    if n == 1:
+        return np.zeros(shape=1)
+
+    return np.linspace(start=height / 2, stop=-height / 2, num=n)
+
+
+class EdgeBatch(VMobject):
+    # Every edge is one straight cubic segment, so a single VMobject holds them
+    # all and endpoints stay addressable by index as `points[4 * i]` and
+    # `points[4 * i + 3]` through any later transform.
+    def __init__(
+        self,
+        starts: NDArray,
+        ends: NDArray,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        thirds = np.linspace(start=0, stop=1, num=4)[None, :, None]
+        self.set_points(
+            (starts[:, None] + thirds * (ends - starts)[:, None]).reshape(-1, 3)
+        )
+
+    @classmethod
+    def between(
+        cls,
+        sources: NDArray,
+        targets: NDArray,
+        **kwargs,
+    ) -> "EdgeBatch":
+        # Edges are ordered source-major: edge `i * len(targets) + j` joins
+        # source `i` to target `j`.
+        return cls(
+            starts=np.repeat(sources, repeats=len(targets), axis=0),
+            ends=np.tile(targets, reps=(len(sources), 1)),
+            **kwargs,
+        )
+
+    @property
+    def starts(
+        self,
+    ) -> NDArray:
+        return self.points[0::4]
+
+    @property
+    def ends(
+        self,
+    ) -> NDArray:
+        return self.points[3::4]
+
+    @property
+    def edge_count(
+        self,
+    ) -> int:
+        return len(self.points) // 4
+
+    def subset(
+        self,
+        indices: NDArray,
+        **kwargs,
+    ) -> "EdgeBatch":
+        return EdgeBatch(
+            starts=self.starts[indices],
+            ends=self.ends[indices],
+            **{
+                "stroke_color": self.get_stroke_color(),
+                "stroke_width": self.get_stroke_width(),
+                **kwargs,
+            },
+        )
+
+
+class NetworkDiagram(VGroup):
+    def __init__(
+        self,
+        layer_sizes: Sequence[int] = (3, 5, 3),
+        layer_heights: Sequence[float] | None = None,
+        layer_spacing: float = 3,
+        node_radius: float = 0.3,
+        node_color: ManimColor = WHITE,
+        edge_color: ManimColor = WHITE,
+        backward_edge_color: ManimColor = GREY,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        self.layer_sizes = tuple(layer_sizes)
+        self.node_radius = node_radius
+        heights = (
+            layer_heights if layer_heights is not None else [2] * len(self.layer_sizes)
+        )
+        xs = (np.arange(len(self.layer_sizes)) - (len(self.layer_sizes) - 1) / 2) * (
+            layer_spacing
+        )
+
+        centres = [
+            x * RIGHT + vertical_positions(n=size, height=height)[:, None] * UP
+            for x, size, height in zip(xs, self.layer_sizes, heights)
+        ]
+
+        self.nodes = [
+            VGroup(
+                *[
+                    Circle(
+                        radius=node_radius,
+                        color=node_color,
+                        fill_opacity=0.3,
+                    ).move_to(point_or_mobject=centre)
+                    for centre in layer
+                ]
+            )
+            for layer in centres
+        ]
+        self.forward_edges = [
+            EdgeBatch.between(
+                sources=source + node_radius * RIGHT,
+                targets=target - node_radius * RIGHT,
+                stroke_color=edge_color,
+            )
+            for source, target in zip(centres[:-1], centres[1:])
+        ]
+        self.backward_edges = [
+            EdgeBatch.between(
+                sources=target - node_radius * RIGHT,
+                targets=source + node_radius * RIGHT,
+                stroke_color=backward_edge_color,
+            )
+            for source, target in zip(centres[:-1], centres[1:])
+        ]
+
+        self.add(*self.nodes, *self.forward_edges, *self.backward_edges)
+
+    def node_centres(
+        self,
+        layer: int,
+    ) -> NDArray:
+        return np.array([node.get_center() for node in self.nodes[layer]])
+
+    def incoming(
+        self,
+        layer: int,
+        node: int,
+        backward: bool = False,
+    ) -> NDArray:
+        # Forward edges into `layer` live in `forward_edges[layer - 1]`, backward
+        # edges into it in `backward_edges[layer]`.
+        if backward:
+            return (
+                np.arange(self.layer_sizes[layer + 1]) * self.layer_sizes[layer] + node
+            )
+
+        return np.arange(self.layer_sizes[layer - 1]) * self.layer_sizes[layer] + node
+
+    def outgoing(
+        self,
+        layer: int,
+        node: int,
+        backward: bool = False,
+    ) -> NDArray:
+        # Forward edges out of `layer` live in `forward_edges[layer]`, backward
+        # edges out of it in `backward_edges[layer - 1]`.
+        if backward:
+            return node * self.layer_sizes[layer - 1] + np.arange(
+                self.layer_sizes[layer - 1]
+            )
+
+        return node * self.layer_sizes[layer + 1] + np.arange(
+            self.layer_sizes[layer + 1]
+        )
@@ -0,0 +1,131 @@
+from collections.abc import Sequence
+
+import numpy as np
+from manim import (
+    DEFAULT_DOT_RADIUS,
+    WHITE,
+    Animation,
+    Circle,
+    ManimColor,
+    VGroup,
+    VMobject,
+    linear,
+)
+from numpy.typing import ArrayLike, NDArray
+
+from qlora_presentation.visualisation.network import EdgeBatch
+
+
+class ParticleBatch(VMobject):
+    # All particles of one colour share a single VMobject whose points are a
+    # circle template offset by every particle position, so moving them all is
+    # one broadcast instead of a `move_to` per dot.
+    def __init__(
+        self,
+        starts: NDArray,
+        ends: NDArray,
+        lags: NDArray,
+        radius: float,
+        color: ManimColor,
+        **kwargs,
+    ) -> None:
+        super().__init__(
+            fill_color=color,
+            fill_opacity=1,
+            stroke_width=0,
+            **kwargs,
+        )
+
+        self.starts = starts
+        self.ends = ends
+        self.lags = lags
+        self.template = Circle(radius=radius).points
+        self.set_progress(alpha=0)
+
+    def set_progress(
+        self,
+        alpha: float,
+    ) -> "ParticleBatch":
+        progress = np.clip((alpha - self.lags) / (1 - self.lags), a_min=0, a_max=1)
+        positions = self.starts + (self.ends - self.starts) * progress[:, None]
+        self.points = (self.template[None] + positions[:, None]).reshape(-1, 3)
+
+        return self
+
+
+class ParticleFlow(Animation):
+    def __init__(
+        self,
+        starts: ArrayLike,
+        ends: ArrayLike,
+        colors: ManimColor | Sequence[ManimColor] = WHITE,
+        lags: float | ArrayLike = 0.0,
+        reverse: bool | ArrayLike = False,
+        radius: float = DEFAULT_DOT_RADIUS,
+        rate_func=linear,
+        **kwargs,
+    ) -> None:
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        count = len(starts)
+
+        # Reversed particles travel from their end back to their start.
+        reverse = np.broadcast_to(np.asarray(reverse, dtype=bool), (count,))[:, None]
+        starts, ends = np.where(reverse, ends, starts), np.where(reverse, starts, ends)
+
+        # A lag delays a particle's departure to that fraction of the run time,
+        # it still arrives at the end.
+        lags = np.clip(
+            np.broadcast_to(np.asarray(lags, dtype=float), (count,)),
+            a_min=0,
+            a_max=1 - 1e-6,
+        )
+        colors = np.array(
+            [
+                ManimColor(color).to_hex(with_alpha=True)
+                for color in (
+                    [colors] * count
+                    if isinstance(colors, (ManimColor, str))
+                    else colors
+                )
+            ]
+        )
+
+        # Particles are batched per colour, since a VMobject has one fill.
+        batches = [
+            ParticleBatch(
+                starts=starts[colors == color],
+                ends=ends[colors == color],
+                lags=lags[colors == color],
+                radius=radius,
+                color=ManimColor(color),
+            )
+            for color in dict.fromkeys(colors)
+        ]
+
+        super().__init__(
+            VGroup(*batches),
+            rate_func=rate_func,
+            **kwargs,
+        )
+
+    @classmethod
+    def along(
+        cls,
+        edges: EdgeBatch,
+        indices: NDArray | None = None,
+        **kwargs,
+    ) -> "ParticleFlow":
+        return cls(
+            starts=edges.starts if indices is None else edges.starts[indices],
+            ends=edges.ends if indices is None else edges.ends[indices],
+            **kwargs,
+        )
+
+    def interpolate_mobject(
+        self,
+        alpha: float,
+    ) -> None:
+        alpha = self.rate_func(alpha)
+        for batch in self.mobject.submobjects:
+            batch.set_progress(alpha=alpha)
@@ -0,0 +1,379 @@
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from queue import Queue
+from threading import Thread
+from typing import Any
+
+import av
+import manim_slides.slide.base  # type: ignore
+import numpy as np
+from manim import Mobject, Scene, Wait, config, logger
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter, to_av_frame_rate
+from manim_slides.utils import (  # type: ignore
+    concatenate_video_files,
+    reverse_video_file,
+)
+from numpy.typing import NDArray
+
+from qlora_presentation.core.config import RenderProfile
+from qlora_presentation.utilities.cache import reversed_partial_file
+from qlora_presentation.utilities.fingerprint import Fingerprint
+
+# Slide movies that manim-slides concatenated in this process, by file name, so
+# their reversed clip can be stitched from reversed partials instead.
+SLIDE_PARTIALS: dict[str, list[Path]] = {}
+
+
+class FrameSpool(object):
+    # Frames are appended to an anonymous temporary file and read back through a
+    # memory map, so a long animation costs page cache rather than resident
+    # memory. Held frames are stored once with their repeat count.
+    def __init__(
+        self,
+        shape: tuple[int, ...],
+    ) -> None:
+        self.shape = shape
+        self.file = tempfile.TemporaryFile()
+        self.counts: list[int] = []
+        self._last: NDArray | None = None
+
+    def append(
+        self,
+        frame: NDArray,
+        count: int,
+    ) -> None:
+        if frame is self._last:
+            self.counts[-1] += count
+            return
+
+        self.file.write(np.ascontiguousarray(frame, dtype=np.uint8).data)
+        self.counts.append(count)
+        self._last = frame
+
+    def reversed(
+        self,
+    ) -> Iterator[tuple[NDArray, int]]:
+        if not self.counts:
+            return
+
+        self.file.flush()
+        frames = np.memmap(
+            self.file,
+            dtype=np.uint8,
+            mode="r",
+            shape=(len(self.counts), *self.shape),
+        )
+        for index in range(len(self.counts) - 1, -1, -1):
+            yield frames[index], self.counts[index]
+
+    def close(
+        self,
+    ) -> None:
+        self.file.close()
+
+
+class HeldFrameEncoder(object):
+    # A frame repeated `count` times is encoded once and the next frame's
+    # timestamp skips ahead, so static holds cost a single frame. The last frame
+    # is encoded again at the end of a hold to keep the clip's full duration.
+    def __init__(
+        self,
+        container: Any,
+        stream: Any,
+        path: Path | None = None,
+        temporary: Path | None = None,
+    ) -> None:
+        self.container = container
+        self.stream = stream
+        self.path = path
+        self.temporary = temporary
+        self.position = 0
+        self._last: NDArray | None = None
+        self._last_position = 0
+
+    def write(
+        self,
+        frame: NDArray,
+        count: int = 1,
+    ) -> None:
+        if frame is not self._last:
+            self._encode(frame=frame, position=self.position)
+            self._last, self._last_position = frame, self.position
+        self.position += count
+
+    def close(
+        self,
+    ) -> None:
+        if self._last is not None and self.position - 1 > self._last_position:
+            self._encode(frame=self._last, position=self.position - 1)
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+        if self.path is not None and self.temporary is not None:
+            os.replace(src=self.temporary, dst=self.path)
+
+    def _encode(
+        self,
+        frame: NDArray,
+        position: int,
+    ) -> None:
+        av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+        av_frame.pts = position
+        av_frame.time_base = self.stream.codec_context.time_base
+        for packet in self.stream.encode(av_frame):
+            self.container.mux(packet)
+
+
+class DeckFileWriter(SceneFileWriter):
+    def __init__(
+        self,
+        renderer: "DeckRenderer",
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(renderer, *args, **kwargs)
+
+        self.profile = renderer.profile
+        self.encoder: HeldFrameEncoder | None = None
+        self.spool: FrameSpool | None = None
+
+    def open_encoder(
+        self,
+        file_path: Path,
+    ) -> HeldFrameEncoder:
+        # Partial movies are shared by concurrent workers, so they are encoded
+        # under a name of this process and only renamed into place once whole.
+        temporary = file_path.with_name(f".{os.getpid()}.{file_path.name}")
+        container = av.open(str(temporary), mode="w")
+        stream = container.add_stream(
+            "libx264",
+            rate=to_av_frame_rate(config.frame_rate),
+            options={
+                "an": "1",
+                "crf": str(self.profile.crf),
+                "preset": self.profile.preset,
+            },
+        )
+        stream.pix_fmt = "yuv420p"
+        stream.width = config.pixel_width
+        stream.height = config.pixel_height
+        stream.codec_context.time_base = 1 / to_av_frame_rate(config.frame_rate)
+
+        return HeldFrameEncoder(
+            container=container,
+            stream=stream,
+            path=file_path,
+            temporary=temporary,
+        )
+
+    def combine_files(
+        self,
+        input_files: list[str],
+        output_file: Path,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        # manim writes its concat list next to the partials under a fixed name,
+        # which concurrent workers sharing the directory would overwrite, so it
+        # goes into a private directory instead.
+        directory = self.partial_movie_directory
+        with tempfile.TemporaryDirectory(dir=directory) as private:
+            self.partial_movie_directory = Path(private)
+            try:
+                super().combine_files(input_files, output_file, *args, **kwargs)
+            finally:
+                self.partial_movie_directory = directory
+
+    def clean_cache(
+        self,
+    ) -> None:
+        # manim drops the oldest partials past `max_files_cached`, which could
+        # delete ones another worker is about to reuse. Each slide records its
+        # partials instead, and `clear_cache` removes those no slide refers to.
+        pass
+
+    def open_partial_movie_stream(
+        self,
+        file_path: Any = None,
+    ) -> None:
+        # Transparent and WebM output keep manim's own encoder settings.
+        if config.transparent or config.movie_file_extension != ".mp4":
+            self.encoder, self.spool = None, None
+            return super().open_partial_movie_stream(file_path=file_path)
+
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+        self.encoder = self.open_encoder(file_path=Path(file_path))
+        self.spool = (
+            FrameSpool(shape=(config.pixel_height, config.pixel_width, 4))
+            if self.renderer.reverse
+            else None
+        )
+
+        self.queue: Queue[tuple[int, Any]] = Queue()
+        self.writer_thread = Thread(target=self.listen_and_write, args=())
+        self.writer_thread.start()
+
+    def encode_and_write_frame(
+        self,
+        frame: NDArray,
+        num_frames: int,
+    ) -> None:
+        if self.encoder is None:
+            return super().encode_and_write_frame(frame, num_frames)
+
+        self.encoder.write(frame=frame, count=num_frames)
+        if self.spool is not None:
+            self.spool.append(frame=frame, count=num_frames)
+
+    def close_partial_movie_stream(
+        self,
+    ) -> None:
+        if self.encoder is None:
+            return super().close_partial_movie_stream()
+
+        self.queue.put((-1, None))
+        self.writer_thread.join()
+        self.encoder.close()
+        self.encoder = None
+        logger.info(
+            f"Animation {self.renderer.num_plays} : Partial movie file written in %(path)s",
+            {"path": f"'{self.partial_movie_file_path}'"},
+        )
+
+        if self.spool is None:
+            return
+
+        # The reversed partial is encoded from the frames just written, so no
+        # slide ever has to be decoded again to be played backwards.
+        encoder = self.open_encoder(
+            file_path=reversed_partial_file(path=Path(self.partial_movie_file_path))
+        )
+        for frame, count in self.spool.reversed():
+            encoder.write(frame=frame, count=count)
+        encoder.close()
+
+        self.spool.close()
+        self.spool = None
+
+
+class DeckRenderer(CairoRenderer):
+    def __init__(
+        self,
+        profile: RenderProfile,
+        reverse: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(file_writer_class=DeckFileWriter, **kwargs)
+
+        self.profile = profile
+        self.reverse = reverse
+        self.moved = False
+        self.still_frames = 0
+        self._frame: NDArray | None = None
+        self._frame_state: str | None = None
+        self._progress: tuple[tuple[int, float], ...] = ()
+
+    def reset_motion(
+        self,
+    ) -> None:
+        # Tracks whether anything has moved since, and for how many frames at
+        # the end nothing has, so slides can be tagged as static.
+        self.moved = False
+        self.still_frames = 0
+
+    # Skipped plays only need the scene state to be advanced, so the static
+    # background and the single fast-forward frame are never rasterised.
+    def save_static_frame_data(
+        self,
+        scene: Scene,
+        static_mobjects: Iterable[Mobject],
+    ) -> Iterable[Mobject] | None:
+        self._frame, self._frame_state, self._progress = None, None, ()
+        if self.skip_animations:
+            self.static_image = None
+            return None
+
+        return super().save_static_frame_data(scene, static_mobjects)
+
+    def render(
+        self,
+        scene: Scene,
+        time: float,
+        moving_mobjects: Iterable[Mobject],
+    ) -> None:
+        if self.skip_animations:
+            return
+
+        # While an animation is still progressing its mobjects change every
+        # frame, so they are not hashed: on large ones such as heatmaps that
+        # costs more than it could ever save.
+        progress = tuple(
+            (id(animation), animation.rate_func(min(time / animation.run_time, 1)))
+            for animation in scene.animations or ()
+            if not isinstance(animation, Wait) and animation.run_time > 0
+        )
+        progressing = progress != self._progress
+        self._progress = progress
+
+        # Once every rate function has settled, or only updaters and waits
+        # run, the moving mobjects are hashed. While none has changed the
+        # previous frame is passed on again without rasterising, and the file
+        # writer holds it.
+        state = (
+            None if progressing else Fingerprint().update(*moving_mobjects).hexdigest()
+        )
+        if self._frame is None or state is None or state != self._frame_state:
+            if self._frame is not None:
+                self.moved = True
+                self.still_frames = 0
+            self.update_frame(scene, moving_mobjects)
+            self._frame, self._frame_state = self.get_frame(), state
+        else:
+            self.still_frames += 1
+
+        self.add_frame(self._frame)
+
+    def freeze_current_frame(
+        self,
+        duration: float,
+    ) -> None:
+        super().freeze_current_frame(duration)
+
+        if not self.skip_animations:
+            self.still_frames += int(duration * config.frame_rate)
+
+
+def concatenate_slide_files(
+    files: list[Path],
+    dest: Path,
+) -> None:
+    SLIDE_PARTIALS[Path(dest).name] = [Path(file) for file in files]
+    concatenate_video_files(files, dest)
+
+
+def reverse_slide_file(
+    src: Path,
+    dest: Path,
+    **kwargs: Any,
+) -> None:
+    # A slide is played backwards by playing its animations backwards in reverse
+    # order, which only needs their reversed partials to be concatenated.
+    reversed_files = [
+        reversed_partial_file(path=file)
+        for file in reversed(SLIDE_PARTIALS.get(Path(src).name, []))
+    ]
+    if reversed_files and all(file.exists() for file in reversed_files):
+        concatenate_video_files(reversed_files, dest)
+        return
+
+    reverse_video_file(src, dest, **kwargs)
+
+
+def install_reversed_partials() -> None:
+    manim_slides.slide.base.concatenate_video_files = concatenate_slide_files
+    manim_slides.slide.base.reverse_video_file = reverse_slide_file
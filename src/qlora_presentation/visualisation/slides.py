@@ -0,0 +1,414 @@
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+from manim import (
+    DR,
+    UL,
+    FadeIn,
+    Mobject,
+    ReplacementTransform,
+    Scene,
+    Text,
+    config,
+)
+from manim.constants import RendererType
+from manim.utils.exceptions import EndSceneEarlyException
+from manim_slides import Slide  # type: ignore
+from PIL import Image
+
+from qlora_presentation.core.config import RenderSettings
+from qlora_presentation.utilities.fingerprint import Fingerprint, config_fingerprint
+from qlora_presentation.utilities.presentation import (
+    read_presentation,
+    write_presentation,
+)
+from qlora_presentation.utilities.profiling import Profiler, RenderReport
+from qlora_presentation.utilities.tex import install_tex_cache
+from qlora_presentation.visualisation.deck import Deck, SlideSpec
+from qlora_presentation.visualisation.rendering import (
+    DeckRenderer,
+    install_reversed_partials,
+)
+from qlora_presentation.visualisation.styles import FontSize, FontWeight, Style
+from qlora_presentation.visualisation.text import TEXT_FACTORY, cached_text
+
+
+class DeckSlide(Slide):
+    sections: tuple[str, ...] = ()
+    style: Style = Style()
+    deck: Deck | None = None
+
+    def __init__(
+        self,
+        *args,
+        **kwargs,
+    ) -> None:
+        self.settings = RenderSettings.from_env()
+        self.settings.profile.apply()
+        self.tex_cache = install_tex_cache(manifest=self.settings.tex_manifest)
+        install_reversed_partials()
+
+        if self.settings.worker is not None:
+            # Workers share the TeX/text caches and the partial movie directory,
+            # whose files are named by animation hash, so manim reuses them
+            # whichever slides a run renders. Only the combined movie is kept
+            # per worker so concurrent renders never collide.
+            config.output_file = f"{type(self).__name__}_{self.settings.worker}"
+
+        if config.renderer == RendererType.CAIRO:
+            kwargs.setdefault(
+                "renderer",
+                DeckRenderer(
+                    profile=self.settings.profile,
+                    reverse=not self.skip_reversing,
+                ),
+            )
+
+        super().__init__(
+            *args,
+            output_folder=self.settings.output_dir,
+            **kwargs,
+        )
+
+        self.current_section: str | None = None
+        self.current_title: str | None = None
+        self.fingerprints: list[str] = []
+        self.names: list[list[str]] = []
+        self._fingerprint: Fingerprint | None = None
+        self._rendered: list[int] = []
+        self._keyframes: dict[int, dict[str, Any]] = {}
+        self._visited: set[str] = set()
+        self._slide_index = 0
+        self.page = 0
+        self.slide_title: Text | None = None
+        self._slide_number: Text | None = None
+        self.profiler = (
+            Profiler(
+                report=RenderReport(
+                    scene=type(self).__name__,
+                    profile=self.settings.profile.name,
+                ),
+                counters=self._profile_counters,
+            )
+            if self.settings.report_file is not None
+            else None
+        )
+
+    @property
+    def slide_names(
+        self,
+    ) -> set[str]:
+        return {
+            name
+            for name in (self.current_section, self.current_title)
+            if name is not None
+        }
+
+    def start_section(
+        self,
+        name: str,
+    ) -> None:
+        self.current_section = name
+
+    def play(
+        self,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        if self._fingerprint is None:
+            self._open_slide()
+
+        # Building the animations up front lets `.animate` targets be hashed
+        # before they are applied.
+        animations = self.compile_animations(*args, **kwargs)
+        self._fingerprint.update(self.mobjects, animations, kwargs)
+
+        started, scene_time = time.perf_counter(), self.renderer.time
+        super().play(*animations, **kwargs)
+
+        if self.profiler is not None:
+            self.profiler.record_animation(
+                name=", ".join(str(animation) for animation in animations),
+                wall_time=time.perf_counter() - started,
+                frames=(
+                    0
+                    if self.renderer.skip_animations
+                    else round((self.renderer.time - scene_time) * config.frame_rate)
+                ),
+            )
+
+    def next_slide(
+        self,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        if self._fingerprint is not None:
+            self._close_slide()
+
+        super().next_slide(*args, **kwargs)
+
+    def construct(
+        self,
+    ) -> None:
+        if self.deck is None:
+            raise NotImplementedError(
+                f"{type(self).__name__} must define a deck or override construct"
+            )
+
+        # Each slide is only built once the previous one has played, and what it
+        # left on screen is released as soon as its exit animation has run, so
+        # at most one slide's mobjects are alive at a time.
+        previous: SlideSpec | None = None
+        content: Mobject | None = None
+        for spec in self.deck.slides:
+            content = self.build_slide(
+                spec=spec,
+                previous=previous,
+                content=content,
+            )
+            previous = spec
+
+    def build_slide(
+        self,
+        spec: SlideSpec,
+        previous: SlideSpec | None = None,
+        content: Mobject | None = None,
+    ) -> Mobject | None:
+        if spec.section is not None:
+            self.start_section(name=spec.section)
+        if spec.title is not None:
+            self.current_title = spec.title
+
+        exits = (
+            [previous.exit_animation(content=content)]
+            if previous is not None and content is not None
+            else []
+        )
+        if spec.title is not None:
+            heading = self.heading(spec=spec)
+            if self.slide_title is None:
+                self.page = 1
+                self._slide_number = self.page_number().to_corner(corner=DR)
+                self.play(
+                    *exits,
+                    FadeIn(heading),
+                    FadeIn(self._slide_number),
+                )
+            else:
+                self.play(
+                    self.new_slide(),
+                    ReplacementTransform(self.slide_title, heading),
+                    *exits,
+                )
+            self.slide_title = heading
+        elif exits:
+            self.next_slide()
+            self.play(*exits)
+
+        if spec.build is None:
+            return None
+
+        return getattr(self, spec.build)()
+
+    def heading(
+        self,
+        spec: SlideSpec,
+    ) -> Text:
+        heading = cached_text(
+            text=spec.title,
+            color=self.style.foreground.primary,
+            font_size=FontSize.TITLE if spec.centred else FontSize.SUBTITLE,
+            weight=str(FontWeight.SEMIBOLD),
+        ).set_stroke(color=self.style.foreground.primary)
+
+        return heading.center() if spec.centred else heading.to_corner(corner=UL)
+
+    def page_number(
+        self,
+    ) -> Text:
+        return cached_text(
+            text=str(self.page),
+            font_size=FontSize.CONTENT,
+            weight=str(FontWeight.SEMIBOLD),
+            color=self.style.foreground.secondary,
+        ).scale(scale_factor=0.8)
+
+    def new_slide(
+        self,
+        **kwargs,
+    ) -> ReplacementTransform:
+        self.next_slide(**kwargs)
+        old_slide_number = self._slide_number
+        self.page += 1
+        self._slide_number = self.page_number().move_to(
+            point_or_mobject=old_slide_number
+        )
+
+        return ReplacementTransform(
+            mobject=old_slide_number,
+            target_mobject=self._slide_number,
+        )
+
+    def _profile_counters(
+        self,
+    ) -> dict[str, float]:
+        return {
+            "tex_hits": self.tex_cache.hits,
+            "tex_misses": self.tex_cache.misses,
+            "tex_time": self.tex_cache.seconds,
+            "text_hits": TEXT_FACTORY.hits,
+            "text_misses": TEXT_FACTORY.misses,
+            "text_time": TEXT_FACTORY.seconds,
+        }
+
+    def _open_slide(
+        self,
+    ) -> None:
+        index = self._slide_index + 1
+        skip = self._select_slide(index=index)
+
+        self._slide_index = index
+        self.names.append(sorted(self.slide_names))
+        self._fingerprint = config_fingerprint(fingerprint=Fingerprint()).update(
+            self.style,
+            self.settings.profile.preset,
+            self.settings.profile.crf,
+        )
+        if not skip:
+            self._rendered.append(index)
+            if isinstance(self.renderer, DeckRenderer):
+                self.renderer.reset_motion()
+        if self.profiler is not None:
+            self.profiler.start_slide(
+                index=index,
+                section=self.current_section,
+                rendered=not skip,
+            )
+
+    def _close_slide(
+        self,
+    ) -> None:
+        # Slide options such as `loop=True` were set by the `next_slide` call
+        # that opened this slide and are part of what gets exported.
+        self.fingerprints.append(
+            self._fingerprint.update(
+                self._base_slide_config.model_dump(exclude={"skip_animations"}),
+            ).hexdigest()
+        )
+        self._fingerprint = None
+        if self._rendered and self._rendered[-1] == self._slide_index:
+            self._write_keyframe(index=self._slide_index)
+        if self.profiler is not None:
+            self.profiler.end_slide()
+
+    def _write_keyframe(
+        self,
+        index: int,
+    ) -> None:
+        if not isinstance(self.renderer, DeckRenderer):
+            return
+
+        # The last frame is what a paused slide shows, so converters and
+        # players can use it instead of decoding the clip. Keyframes are moved
+        # next to the clips once manim-slides has (re)created their folder.
+        keyframe = self._output_folder / ".keyframes" / f"{self.fingerprints[-1]}.png"
+        keyframe.parent.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(self.renderer.get_frame()).save(keyframe)
+        self._keyframes[index] = {
+            "keyframe": str(keyframe),
+            "static": not self.renderer.moved,
+            "hold": round(self.renderer.still_frames / config.frame_rate, 4),
+        }
+
+    def _select_slide(
+        self,
+        index: int,
+    ) -> bool:
+        selection = self.settings.selection
+        if self.settings.fast_forward:
+            skip = True
+        elif not selection:
+            return False
+        else:
+            names = self.slide_names
+            if selection.is_exhausted(
+                slide=index,
+                visited=self._visited,
+                names=names,
+            ):
+                raise EndSceneEarlyException()
+
+            self._visited.update(names)
+            skip = not selection.includes(
+                slide=index,
+                names=names,
+            )
+
+        # Unselected slides are fast-forwarded: their animations run to
+        # completion to rebuild the scene state, but nothing is rasterised,
+        # encoded or recorded in the slide configuration.
+        self._base_slide_config.skip_animations = skip
+        if self.renderer.file_writer.sections[-1].skip_animations != skip:
+            Scene.next_section(
+                self,
+                skip_animations=skip,
+            )
+
+        return skip
+
+    def _save_slides(
+        self,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        if self._fingerprint is not None:
+            self._close_slide()
+
+        if self.settings.plan_file is not None:
+            self.settings.plan_file.parent.mkdir(parents=True, exist_ok=True)
+            self.settings.plan_file.write_text(
+                data=json.dumps(
+                    obj=[
+                        {"fingerprint": fingerprint, "names": names}
+                        for fingerprint, names in zip(self.fingerprints, self.names)
+                    ]
+                )
+            )
+        if self.settings.fast_forward:
+            return
+
+        started = time.perf_counter()
+        super()._save_slides(*args, **kwargs)
+
+        if self.profiler is not None and self.settings.report_file is not None:
+            self.profiler.report.save_time = round(time.perf_counter() - started, 4)
+            self.profiler.report.write(path=self.settings.report_file)
+
+        presentation_path = self._output_folder / f"{self}.json"
+        presentation = read_presentation(path=presentation_path)
+        for keyframe in self._keyframes.values():
+            source = Path(keyframe["keyframe"])
+            destination = self._output_folder / "files" / str(self) / source.name
+            keyframe["keyframe"] = str(shutil.move(src=source, dst=destination))
+        shutil.rmtree(self._output_folder / ".keyframes", ignore_errors=True)
+        # The partials behind each slide are listed the way manim-slides picked
+        # them, so `clear_cache` keeps exactly those the current deck uses.
+        files = self._partial_movie_files
+        partials = [
+            [Path(slide_config.src)]
+            if slide_config.src
+            else files[slide_config.slides_slice]
+            for slide_config in self._slides
+            if not slide_config.skip_animations
+        ]
+        for slide, index, slide_partials in zip(
+            presentation["slides"], self._rendered, partials
+        ):
+            slide["index"] = index
+            slide["fingerprint"] = self.fingerprints[index - 1]
+            slide["partials"] = [file.name for file in slide_partials]
+            slide.update(self._keyframes.get(index, {}))
+        write_presentation(path=presentation_path, presentation=presentation)
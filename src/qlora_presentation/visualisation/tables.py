@@ -0,0 +1,159 @@
+from collections.abc import Callable, Sequence
+
+from qlora_presentation.models.training.experiments import (
+    TASKS,
+    ExperimentConfig,
+    ExperimentResult,
+)
+
+TASK_HEADERS = {
+    "regression": r"Regression ($R^2$)",
+    "classification": r"Classification (Acc.)",
+}
+
+
+def booktabs_table(
+    columns: str,
+    header: Sequence[str],
+    groups: Sequence[Sequence[Sequence[str]]],
+) -> str:
+    # `header` rows are LaTeX as they are, since they may span columns, body
+    # rows are cells that have to fill every column.
+    count = len(columns.replace(" ", ""))
+    for row in (row for group in groups for row in group):
+        if len(row) != count:
+            raise ValueError(f"Table row {list(row)} does not have {count} cells")
+
+    lines = [rf"\begin{{tabular}}{{{columns}}}", r"\toprule"]
+    lines.extend(rf"{row} \\" for row in header)
+    for group in groups:
+        lines.append(r"\midrule")
+        lines.extend(" & ".join(row) + r" \\" for row in group)
+    lines.extend([r"\bottomrule", r"\end{tabular}"])
+
+    return "\n".join(lines)
+
+
+def score_cell(
+    result: ExperimentResult,
+) -> str:
+    if result.config.task == "regression":
+        return f"{result.score:.3f}"
+
+    return f"{100 * result.score:.1f}"
+
+
+def format_score(
+    result: ExperimentResult,
+    best: str,
+) -> str:
+    # Compared as displayed, so every cell showing the best value is bold.
+    cell = score_cell(result=result)
+    return rf"\textbf{{{cell}}}" if float(cell) >= float(best) else cell
+
+
+def method_name(
+    config: ExperimentConfig,
+) -> str:
+    if config.method == "full":
+        return "Full FT (32 bit)"
+    if config.method == "lora":
+        return f"LoRA ($r={config.rank}$)"
+
+    scheme = {"int8": "Int8", "fp4": "FP4", "nf4": "NF4"}[str(config.scheme)]
+    return f"QLoRA {scheme}" + (" + DQ" if config.double_quantise else "")
+
+
+def row_key(
+    config: ExperimentConfig,
+) -> tuple:
+    return (config.method, config.rank, config.scheme, config.double_quantise)
+
+
+def score_columns(
+    results: Sequence[ExperimentResult],
+    column: Callable[[ExperimentResult], str],
+) -> dict[tuple, dict[str, str]]:
+    # Cells by row, then column, with the best score of every column in bold.
+    best: dict[str, str] = {}
+    for result in results:
+        cell = score_cell(result=result)
+        if column(result) not in best or float(cell) > float(best[column(result)]):
+            best[column(result)] = cell
+
+    rows: dict[tuple, dict[str, str]] = {}
+    for result in results:
+        rows.setdefault(row_key(config=result.config), {})[column(result)] = (
+            format_score(
+                result=result,
+                best=best[column(result)],
+            )
+        )
+
+    return rows
+
+
+def rank_table(
+    results: Sequence[ExperimentResult],
+) -> str:
+    names = {
+        row_key(config=result.config): method_name(config=result.config)
+        for result in results
+    }
+    trainable = {
+        row_key(config=result.config): f"{result.trainable:,}" for result in results
+    }
+    cells = score_columns(results=results, column=lambda result: result.config.task)
+
+    rows = [
+        [names[row], trainable[row], *[cells[row][task] for task in TASKS]]
+        for row in cells
+    ]
+    return booktabs_table(
+        columns="l r cc",
+        header=[
+            r"\textbf{Method} & \# Trainable & "
+            + " & ".join(TASK_HEADERS[task] for task in TASKS)
+        ],
+        groups=[rows[:1], rows[1:]],
+    )
+
+
+def quantisation_table(
+    results: Sequence[ExperimentResult],
+) -> str:
+    dimensions = sorted({result.config.dimension for result in results})
+    names = {
+        row_key(config=result.config): method_name(config=result.config)
+        for result in results
+    }
+    cells = score_columns(
+        results=results,
+        column=lambda result: f"{result.config.task}-{result.config.dimension}",
+    )
+
+    rows = [
+        [
+            names[row],
+            *[
+                cells[row][f"{task}-{dimension}"]
+                for task in TASKS
+                for dimension in dimensions
+            ],
+        ]
+        for row in cells
+    ]
+    count = len(dimensions)
+    return booktabs_table(
+        columns="l" + "r" * count * len(TASKS),
+        header=[
+            "Task & "
+            + " & ".join(
+                rf"\multicolumn{{{count}}}{{c}}{{{TASK_HEADERS[task]}}}"
+                for task in TASKS
+            ),
+            r"Width $d$ & "
+            + " & ".join(str(dimension) for _ in TASKS for dimension in dimensions),
+        ],
+        groups=[rows[:2], rows[2:]],
+    )
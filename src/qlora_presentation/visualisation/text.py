@@ -0,0 +1,111 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from enum import Enum
+from typing import Any, TypeVar
+
+from manim import ManimColor, MarkupText, Text
+
+from qlora_presentation.core.config import TEXT_CACHE_SIZE
+
+TextMobject = TypeVar("TextMobject", Text, MarkupText)
+
+
+def freeze(
+    value: Any,
+) -> Hashable:
+    if isinstance(value, ManimColor):
+        return value.to_hex(with_alpha=True)
+    if isinstance(value, Enum):
+        return (type(value).__qualname__, value.value)
+    if isinstance(value, dict):
+        return tuple(
+            sorted((str(key), freeze(value=item)) for key, item in value.items())
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(value=item) for item in value)
+    if isinstance(value, Hashable):
+        return value
+
+    raise TypeError(f"Cannot build a text cache key from {type(value).__name__}")
+
+
+def class_defaults(
+    cls: type,
+) -> dict[str, Any]:
+    # `set_default` wraps `__init__` in a partialmethod holding the overrides.
+    return getattr(vars(cls).get("__init__"), "keywords", {})
+
+
+class TextFactory(object):
+    def __init__(
+        self,
+        maxsize: int = TEXT_CACHE_SIZE,
+    ) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # Time spent building text, mostly Pango on misses.
+        self.seconds = 0.0
+        self._mobjects: OrderedDict[Hashable, Text | MarkupText] = OrderedDict()
+
+    def __call__(
+        self,
+        cls: type[TextMobject],
+        *args: Any,
+        **kwargs: Any,
+    ) -> TextMobject:
+        start = time.perf_counter()
+        try:
+            return self.create(cls, *args, **kwargs)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def create(
+        self,
+        cls: type[TextMobject],
+        *args: Any,
+        **kwargs: Any,
+    ) -> TextMobject:
+        try:
+            key = freeze(value=(cls, args, kwargs, class_defaults(cls=cls)))
+        except TypeError:
+            self.misses += 1
+            return cls(*args, **kwargs)
+
+        mobject = self._mobjects.get(key)
+        if mobject is not None:
+            self.hits += 1
+            self._mobjects.move_to_end(key=key)
+            return mobject.copy()
+
+        # Misses still go through manim, which reuses the SVGs in media/texts.
+        self.misses += 1
+        mobject = cls(*args, **kwargs)
+        self._mobjects[key] = mobject
+        if len(self._mobjects) > self.maxsize:
+            self._mobjects.popitem(last=False)
+
+        return mobject.copy()
+
+    def clear(
+        self,
+    ) -> None:
+        self._mobjects.clear()
+
+
+TEXT_FACTORY = TextFactory()
+
+
+def cached_text(
+    *args: Any,
+    **kwargs: Any,
+) -> Text:
+    return TEXT_FACTORY(Text, *args, **kwargs)
+
+
+def cached_markup_text(
+    *args: Any,
+    **kwargs: Any,
+) -> MarkupText:
+    return TEXT_FACTORY(MarkupText, *args, **kwargs)
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+from qlora_presentation.utilities.cache import (
+    PARTIAL_MOVIE_DIR,
+    find_partial_orphans,
+)
+from qlora_presentation.utilities.presentation import write_presentation
+
+
+def write_partials(
+    directory: Path,
+    names: list[str],
+) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (directory / name).write_bytes(b"\0")
+
+
+def test_superseded_partials_are_orphans(
+    tmp_path: Path,
+) -> None:
+    partial_dir = tmp_path / "media" / "videos" / "main" / "1080p60"
+    partial_dir = partial_dir / PARTIAL_MOVIE_DIR / "Main"
+    # `old` was combined by an earlier render of the first slide and has since
+    # been superseded by `new`.
+    write_partials(
+        directory=partial_dir,
+        names=[
+            "old.mp4",
+            "old_reversed.mp4",
+            "new.mp4",
+            "new_reversed.mp4",
+            "kept.mp4",
+        ],
+    )
+    slides_dir = tmp_path / "slides"
+    write_presentation(
+        path=slides_dir / "Main.json",
+        presentation={
+            "slides": [
+                {"file": "slides/files/Main/a.mp4", "partials": ["new.mp4"]},
+                {"file": "slides/files/Main/b.mp4", "partials": ["kept.mp4"]},
+            ]
+        },
+    )
+
+    (report,) = find_partial_orphans(
+        media_dir=tmp_path / "media",
+        slides_dirs=[slides_dir],
+    )
+
+    assert report.root == partial_dir
+    assert [path.name for path in report.orphaned] == ["old.mp4", "old_reversed.mp4"]
+    assert [path.name for path in report.kept] == [
+        "kept.mp4",
+        "new.mp4",
+        "new_reversed.mp4",
+    ]
+
+
+def test_partials_are_kept_for_untracked_slides(
+    tmp_path: Path,
+) -> None:
+    partial_dir = tmp_path / "media" / "videos" / PARTIAL_MOVIE_DIR / "Main"
+    write_partials(directory=partial_dir, names=["a.mp4", "b.mp4"])
+    slides_dir = tmp_path / "slides"
+    write_presentation(
+        path=slides_dir / "Main.json",
+        presentation={"slides": [{"file": "slides/files/Main/a.mp4"}]},
+    )
+
+    (report,) = find_partial_orphans(
+        media_dir=tmp_path / "media",
+        slides_dirs=[slides_dir],
+    )
+
+    assert not report.orphaned
+    assert len(report.kept) == 2
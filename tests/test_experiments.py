@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from qlora_presentation.models.training import experiments
+from qlora_presentation.models.training.experiments import (
+    ExperimentConfig,
+    ExperimentResult,
+    ResultStore,
+    load_results,
+)
+
+
+def test_key_is_salted_with_the_experiment_version(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config = ExperimentConfig(task="regression", method="lora")
+    key = config.key
+
+    monkeypatch.setattr(
+        experiments, "EXPERIMENT_VERSION", experiments.EXPERIMENT_VERSION + 1
+    )
+
+    assert config.key != key
+    assert ExperimentConfig(task="regression", method="lora").key == config.key
+
+
+def test_results_of_another_version_are_missing(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config = ExperimentConfig(task="regression", method="full", rank=0)
+    store = ResultStore(path=tmp_path / "results.json")
+    store.put(
+        result=ExperimentResult(
+            config=config,
+            score=1.0,
+            trainable=0,
+            seconds=0.0,
+        )
+    )
+    store.save()
+
+    monkeypatch.setattr(
+        experiments, "EXPERIMENT_VERSION", experiments.EXPERIMENT_VERSION + 1
+    )
+
+    with pytest.raises(ValueError, match="1 experiment result"):
+        load_results(configs=[config], store=ResultStore(path=store.path))
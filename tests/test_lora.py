@@ -0,0 +1,139 @@
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+
+from qlora_presentation.models.training.lora import (
+    Adam,
+    LoRALayer,
+    Loss,
+    cross_entropy,
+    mean_squared_error,
+    train_step,
+)
+
+D, K, RANK, BATCH, CLASSES = 6, 5, 2, 4, 3
+
+
+def make_layer(
+    quantised: bool = False,
+    seed: int = 0,
+) -> LoRALayer:
+    rng = np.random.default_rng(seed=seed)
+    weight = rng.standard_normal(size=(D, K))
+    bias = rng.standard_normal(size=D)
+    layer = (
+        LoRALayer.quantised(weight=weight, bias=bias, rank=RANK, alpha=4, seed=seed)
+        if quantised
+        else LoRALayer(weight=weight, bias=bias, rank=RANK, alpha=4, seed=seed)
+    )
+    # Gradients are checked in double precision, with `B` moved off zero so
+    # that every term of the backward pass contributes.
+    layer.parameters = {
+        "a": layer.parameters["a"].astype(np.float64),
+        "b": rng.standard_normal(size=(RANK, K)),
+    }
+
+    return layer
+
+
+def make_batch(
+    loss_function: Loss,
+    seed: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed=seed)
+    x = rng.standard_normal(size=(BATCH, K))
+    if loss_function is cross_entropy:
+        y = np.eye(CLASSES)[rng.integers(CLASSES, size=BATCH)]
+    else:
+        y = rng.standard_normal(size=(BATCH, D))
+
+    return x, y
+
+
+def numerical_gradient(
+    loss: Callable[[], float],
+    array: np.ndarray,
+    eps: float = 1e-6,
+) -> np.ndarray:
+    gradient = np.zeros_like(array)
+    for index in np.ndindex(array.shape):
+        original = array[index]
+        array[index] = original + eps
+        upper = loss()
+        array[index] = original - eps
+        lower = loss()
+        array[index] = original
+        gradient[index] = (upper - lower) / (2 * eps)
+
+    return gradient
+
+
+@pytest.mark.parametrize("loss_function", [mean_squared_error, cross_entropy])
+@pytest.mark.parametrize("quantised", [False, True])
+def test_gradients_match_finite_differences(
+    loss_function: Loss,
+    quantised: bool,
+) -> None:
+    layer = make_layer(quantised=quantised)
+    x, y = make_batch(loss_function=loss_function)
+
+    h, cache = layer.forward(x=x)
+    _, grad = loss_function(h, y)
+    gradients, grad_x = layer.backward(grad=grad, cache=cache)
+
+    def loss() -> float:
+        return loss_function(layer.forward(x=x)[0], y)[0]
+
+    for name, parameter in layer.parameters.items():
+        assert gradients[name] == pytest.approx(
+            numerical_gradient(loss=loss, array=parameter), rel=1e-5, abs=1e-8
+        )
+    assert grad_x == pytest.approx(
+        numerical_gradient(loss=loss, array=x), rel=1e-5, abs=1e-8
+    )
+
+
+@pytest.mark.parametrize("quantised", [False, True])
+def test_fresh_layer_is_the_pretrained_layer(
+    quantised: bool,
+) -> None:
+    rng = np.random.default_rng(seed=0)
+    weight = rng.standard_normal(size=(D, K)).astype(np.float32)
+    bias = rng.standard_normal(size=D).astype(np.float32)
+    x = rng.standard_normal(size=(BATCH, K)).astype(np.float32)
+
+    layer = (
+        LoRALayer.quantised(weight=weight, bias=bias, rank=RANK)
+        if quantised
+        else LoRALayer(weight=weight, bias=bias, rank=RANK)
+    )
+
+    assert not np.any(layer.parameters["b"])
+    assert np.any(layer.parameters["a"])
+    assert np.array_equal(layer.forward(x=x)[0], x @ layer.base_weight.T + bias)
+
+
+@pytest.mark.parametrize("quantised", [False, True])
+def test_merge_matches_unmerged_forward(
+    quantised: bool,
+) -> None:
+    layer = make_layer(quantised=quantised)
+    x, y = make_batch(loss_function=mean_squared_error)
+    train_step(layer=layer, optimiser=Adam(parameters=layer.parameters), x=x, y=y)
+
+    merged = layer.merge()
+
+    assert merged.forward(x=x)[0] == pytest.approx(layer.forward(x=x)[0])
+
+
+def test_quantised_step_reports_dequantised_weight() -> None:
+    layer = make_layer(quantised=True)
+    x, y = make_batch(loss_function=mean_squared_error)
+
+    _, memory = train_step(
+        layer=layer, optimiser=Adam(parameters=layer.parameters), x=x, y=y
+    )
+
+    assert memory.dequantised == layer.base_weight.nbytes
+    assert memory.total > memory.frozen + memory.dequantised
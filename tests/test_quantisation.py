@@ -0,0 +1,214 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from qlora_presentation.models.memory import constant_bits
+from qlora_presentation.models.quantisation import (
+    BYTES_PER_ELEMENT,
+    SCHEMES,
+    bfloat16,
+    blocks,
+    chunk_size,
+    dequantise,
+    fp4_codebook,
+    int8_codebook,
+    measure_quantisation,
+    nf4_codebook,
+    normal_weights,
+    pack_nibbles,
+    quantise,
+    QuantisationStats,
+    unpack_nibbles,
+)
+
+
+def normal_matrix(
+    shape: tuple[int, ...],
+    seed: int = 0,
+) -> np.ndarray:
+    rng = np.random.default_rng(seed=seed)
+    return (rng.standard_normal(size=shape) * 0.02).astype(np.float32)
+
+
+def test_nf4_codebook() -> None:
+    codebook = nf4_codebook()
+
+    assert len(codebook) == 16
+    assert np.all(np.diff(codebook) > 0)
+    assert codebook[0] == -1 and codebook[-1] == 1
+    assert 0 in codebook
+    assert (codebook > 0).sum() == 8 and (codebook < 0).sum() == 7
+    # Values of the NF4 data type listed in the QLoRA paper's appendix.
+    assert codebook[[1, 8, 14]] == pytest.approx([-0.6962, 0.0796, 0.7230], abs=1e-4)
+
+
+def test_fp4_codebook() -> None:
+    codebook = fp4_codebook()
+
+    # Positive and negative zero are the same value, so 16 codes give 15.
+    assert len(codebook) == 15
+    assert np.array_equal(codebook, -codebook[::-1])
+    assert codebook[-1] == 1
+    assert codebook[codebook > 0] * 6 == pytest.approx(
+        [0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 6.0]
+    )
+
+
+def test_int8_codebook() -> None:
+    codebook = int8_codebook()
+
+    assert len(codebook) == 255
+    assert codebook[0] == -1 and codebook[-1] == 1
+    assert np.diff(codebook) == pytest.approx(1 / 127, rel=1e-5)
+
+
+@pytest.mark.parametrize("scheme", list(SCHEMES))
+def test_encode_finds_nearest_entry(
+    scheme: str,
+) -> None:
+    codebook = SCHEMES[scheme].codebook
+    values = np.linspace(-1, 1, num=1001, dtype=np.float32)
+
+    codes = SCHEMES[scheme].encode(values=values)
+    nearest = np.abs(values[:, None] - codebook[None]).argmin(axis=1)
+
+    assert np.allclose(codebook[codes], codebook[nearest])
+    assert np.array_equal(
+        SCHEMES[scheme].encode(values=codebook), np.arange(len(codebook))
+    )
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 7, 64, 65])
+def test_pack_nibbles_round_trip(
+    count: int,
+) -> None:
+    codes = np.random.default_rng(seed=count).integers(16, size=count).astype(np.uint8)
+
+    packed = pack_nibbles(codes=codes)
+
+    assert len(packed) == (count + 1) // 2
+    assert np.array_equal(unpack_nibbles(packed=packed, count=count), codes)
+
+
+def test_blocks_pad_with_zeros() -> None:
+    rows = blocks(values=np.arange(1, 6, dtype=np.float32), block_size=4)
+
+    assert rows.shape == (2, 4)
+    assert np.array_equal(rows.ravel(), [1, 2, 3, 4, 5, 0, 0, 0])
+
+
+@pytest.mark.parametrize("scheme", list(SCHEMES))
+@pytest.mark.parametrize("shape", [(64, 64), (7, 13), (1001,)])
+def test_dequantise_restores_shape(
+    scheme: str,
+    shape: tuple[int, ...],
+) -> None:
+    weights = normal_matrix(shape=shape)
+
+    restored = dequantise(tensor=quantise(weights=weights, scheme=scheme))
+
+    assert restored.shape == weights.shape
+    # Every value is within half the widest codebook gap of its block absmax.
+    gap = np.diff(SCHEMES[scheme].codebook).max()
+    assert np.abs(restored - weights).max() <= gap / 2 * np.abs(weights).max() * 1.01
+
+
+def test_int8_is_more_accurate_than_4_bit() -> None:
+    weights = normal_matrix(shape=(256, 256))
+
+    errors = {
+        scheme: np.mean(
+            (dequantise(tensor=quantise(weights=weights, scheme=scheme)) - weights) ** 2
+        )
+        for scheme in SCHEMES
+    }
+
+    assert errors["int8"] < errors["nf4"] < errors["fp4"]
+
+
+def test_double_quantisation_bits_per_parameter() -> None:
+    weights = normal_matrix(shape=(1024, 1024))
+
+    single = quantise(weights=weights, scheme="nf4", double_quantise=False)
+    double = quantise(weights=weights, scheme="nf4", double_quantise=True)
+
+    assert single.bits_per_parameter == pytest.approx(4.5)
+    assert double.bits_per_parameter == pytest.approx(4.127, abs=1e-3)
+    assert double.bits_per_parameter == pytest.approx(
+        4 + constant_bits(double_quantise=True),
+        abs=1e-4,
+    )
+
+
+def test_bfloat16_rounds_to_nearest_even() -> None:
+    values = np.array([1.0, 1 + 2**-8, 1 + 3 * 2**-8, 1 + 2**-8 + 2**-20], np.float32)
+
+    rounded = bfloat16(weights=values)
+
+    assert np.array_equal(rounded, [1.0, 1.0, 1 + 2**-6, 1 + 2**-7])
+    assert np.all(rounded.view(np.uint32) & 0xFFFF == 0)
+
+
+@pytest.mark.parametrize("double_quantise", [False, True])
+def test_chunked_measurement_matches_whole_tensor(
+    double_quantise: bool,
+) -> None:
+    # Four whole chunks and a ragged one, small enough to also quantise whole.
+    chunk = chunk_size(
+        memory_budget=BYTES_PER_ELEMENT * 64 * 256,
+        block_size=64,
+        double_quantise=double_quantise,
+    )
+    parameters = 4 * chunk + 100
+    weights = np.concatenate(list(normal_weights(parameters=parameters, chunk=chunk)))
+
+    chunked = measure_quantisation(
+        chunks=normal_weights(parameters=parameters, chunk=chunk),
+        double_quantise=double_quantise,
+    )
+    whole = QuantisationStats()
+    whole.update(
+        weights=weights,
+        tensor=quantise(weights=weights, double_quantise=double_quantise),
+    )
+
+    assert chunked.parameters == whole.parameters == parameters
+    assert chunked.squared_signal == pytest.approx(whole.squared_signal)
+    if double_quantise:
+        # Each chunk removes the mean of its own constants, which moves the
+        # error slightly and stores one more mean per chunk.
+        assert chunked.mean_squared_error == pytest.approx(
+            whole.mean_squared_error, rel=1e-2
+        )
+        assert chunked.storage_bits - whole.storage_bits == 4 * 32
+    else:
+        assert chunked.mean_squared_error == pytest.approx(whole.mean_squared_error)
+        assert chunked.max_error == whole.max_error
+        assert chunked.storage_bits == whole.storage_bits
+
+
+def test_chunk_size_holds_whole_constant_blocks() -> None:
+    size = chunk_size(memory_budget=2**20, block_size=64, double_quantise=True)
+
+    assert size > 0 and size % (64 * 256) == 0
+    with pytest.raises(ValueError):
+        chunk_size(memory_budget=1024, block_size=64, double_quantise=True)
+
+
+@pytest.mark.parametrize("double_quantise", [False, True])
+def test_empty_weights(
+    double_quantise: bool,
+) -> None:
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        tensor = quantise(
+            weights=np.zeros(shape=(0, 8), dtype=np.float32),
+            double_quantise=double_quantise,
+        )
+        stats = measure_quantisation(chunks=[np.zeros(shape=0, dtype=np.float32)])
+
+    assert dequantise(tensor=tensor).shape == (0, 8)
+    assert stats.parameters == 0
+    assert stats.mean_squared_error == 0
+    assert stats.sqnr == float("inf")
@@ -0,0 +1,32 @@
+import pytest
+
+from qlora_presentation.utilities.selection import SlideSelection, parse_slide_ranges
+
+DECK = [
+    {"Introduction"},
+    {"Introduction", "Motivation"},
+    {"LoRA", "LoRA: Method"},
+    {"LoRA", "LoRA: Performance"},
+]
+
+
+def test_parse_slide_ranges() -> None:
+    assert parse_slide_ranges(text="3, 1-2,2") == {1, 2, 3}
+    with pytest.raises(ValueError):
+        parse_slide_ranges(text="4-2")
+
+
+def test_selection_within_the_deck_is_valid() -> None:
+    SlideSelection(slides=frozenset({1, 4}), names=frozenset({"LoRA"})).validate(
+        names=DECK
+    )
+
+
+def test_range_past_the_end_is_rejected() -> None:
+    with pytest.raises(ValueError, match="5, 6 are past the end of the deck"):
+        SlideSelection(slides=parse_slide_ranges(text="3-6")).validate(names=DECK)
+
+
+def test_unknown_name_is_rejected() -> None:
+    with pytest.raises(ValueError, match="'QLoRA'"):
+        SlideSelection(names=frozenset({"LoRA", "QLoRA"})).validate(names=DECK)
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from qlora_presentation.utilities.tex import BEGIN_DOCUMENT, normalise_texcode  # noqa: E402
+
+BODY = BEGIN_DOCUMENT + "\n$x$\n\\end{document}\n"
+
+
+def key(
+    preamble: str,
+) -> str:
+    return normalise_texcode(texcode=preamble + BODY)
+
+
+def test_comments_and_spacing_are_ignored() -> None:
+    assert key("% maths\n  \\usepackage{amsmath}   \n\\usepackage{bm}\n") == key(
+        "\\usepackage{amsmath}\n\\usepackage{bm}\n"
+    )
+
+
+def test_comment_joins_lines() -> None:
+    assert key("\\def\\x{a%\nb}\n") == key("\\def\\x{ab}\n")
+    assert key("\\def\\x{a%\nb}\n") != key("\\def\\x{a\nb}\n")
+
+
+def test_escaped_percent_is_not_a_comment() -> None:
+    assert key("\\def\\x{50\\% off}\n") != key("\\def\\x{50\\\n")
+    assert key("\\def\\x{a\\\\% b\n}\n") == key("\\def\\x{a\\\\}\n")
+
+
+def test_only_package_lines_are_deduplicated() -> None:
+    assert key("\\usepackage{bm}\n\\usepackage{bm}\n") == key("\\usepackage{bm}\n")
+    assert key("\\def\\x{\n\\fi\n}\n\\def\\y{\n\\fi\n}\n") != key(
+        "\\def\\x{\n\\fi\n}\n\\def\\y{\n}\n"
+    )
+
+
+def test_body_is_kept_as_written() -> None:
+    assert normalise_texcode(texcode=BEGIN_DOCUMENT + "a\n\nb") != normalise_texcode(
+        texcode=BEGIN_DOCUMENT + "a\nb"
+    )
+    assert normalise_texcode(texcode=BEGIN_DOCUMENT + "\\verb|a  b|") != (
+        normalise_texcode(texcode=BEGIN_DOCUMENT + "\\verb|a b|")
+    )